@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark de contention de ConcurrentInMemoryRepository.
+
+Plusieurs threads mettent à jour des utilisateurs tirés au hasard (et lisent par
+email) sur un repository verrouillé par un seul verrou global (1 stripe) puis
+par 64 stripes. Le paramètre `hold_us` simule un travail fait en tenant le
+verrou qui libère le GIL (I/O, journal sur disque...) : c'est là que le verrou
+global sérialise tous les threads alors que les stripes les laissent avancer.
+Sans ce travail, le GIL de CPython sérialise de toute façon le code Python et
+les deux variantes plafonnent au même débit.
+
+Exécuter depuis le dossier part2 avec : python3 Script_test/bench_concurrent_repository.py [hold_us]
+"""
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.user import User
+from app.persistence.repository import ConcurrentInMemoryRepository
+
+NB_USERS = 10_000
+OPS_PER_THREAD = 2_000
+
+
+class HoldingRepository(ConcurrentInMemoryRepository):
+    """Repository qui garde le verrou hold_s secondes (sans le GIL) à chaque écriture"""
+    def __init__(self, hold_s, **kwargs):
+        self.hold_s = hold_s
+        super().__init__(**kwargs)
+
+    def _index(self, obj):
+        super()._index(obj)
+        if self.hold_s:
+            time.sleep(self.hold_s)
+
+
+def worker(repo, users, ops):
+    rng = random.Random()
+    for i in range(ops):
+        user = rng.choice(users)
+        if i % 4:
+            repo.update(user.id, {'last_name': str(rng.randrange(1000))})
+        else:
+            repo.get_by_attribute('email', user.email)
+
+
+def run(stripes, threads, hold_s, users):
+    repo = HoldingRepository(hold_s, unique_indexes=('email',), stripes=stripes)
+    saved, repo.hold_s = repo.hold_s, 0
+    for user in users:
+        repo.add(user)
+    repo.hold_s = saved
+    ops = OPS_PER_THREAD if hold_s == 0 else OPS_PER_THREAD // 10
+    pool = [threading.Thread(target=worker, args=(repo, users, ops)) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return threads * ops / (time.perf_counter() - start)
+
+
+def main():
+    hold_us = float(sys.argv[1]) if len(sys.argv) > 1 else 50
+    users = [User(first_name="Bench", last_name=str(i), email=f"concurrent{i}@example.com")
+             for i in range(NB_USERS)]
+    for hold_s in (0, hold_us / 1e6):
+        print(f"Travail sous verrou : {hold_s * 1e6:.0f} µs")
+        for threads in (1, 2, 4, 8, 16):
+            global_lock = run(1, threads, hold_s, users)
+            striped = run(64, threads, hold_s, users)
+            print(f"  {threads:2d} threads | verrou global: {global_lock:9.0f} ops/s"
+                  f" | 64 stripes: {striped:9.0f} ops/s | x{striped / global_lock:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark du stockage durable (DurableStore) derrière les repositories en mémoire.
+
+Remplit une facade avec nb_objets (utilisateurs, lieux, avis, amenities) en
+journalisant chaque écriture, puis mesure le redémarrage à froid d'une nouvelle
+facade : depuis le seul journal, puis depuis un snapshot compacté.
+
+Exécuter depuis le dossier part2 avec : python3 Script_test/bench_durable_store.py [nb_objets]
+Les fichiers sont écrits dans un dossier temporaire, supprimé à la fin.
+"""
+import gc
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.user import User
+from app.services.facade import HBnBFacade
+
+
+def dir_size(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def fill(facade, count):
+    nb_users = count // 10
+    nb_places = count * 3 // 10
+    nb_reviews = count - nb_users - nb_places - 100
+    users = [facade.create_user({'first_name': 'Bench', 'last_name': str(i),
+                                 'email': f'durable{i}@example.com'}) for i in range(nb_users)]
+    amenities = [facade.create_amenity({'name': f'Amenity {i}'}) for i in range(100)]
+    places = [facade.create_place({'title': f'Place {i}', 'price': 10 + i % 500,
+                                   'latitude': 45.0, 'longitude': 4.0,
+                                   'owner_id': users[i % nb_users].id,
+                                   'amenities': [{'id': amenities[i % 100].id}]})
+              for i in range(nb_places)]
+    for i in range(nb_reviews):
+        facade.create_review({'text': 'Great', 'rating': 2 + i % 4,
+                              'user_id': users[i % nb_users].id, 'place_id': places[i % nb_places].id})
+
+
+def cold_start(path):
+    # Mesure dans un processus « propre » : les objets de l'étape précédente sont libérés
+    gc.collect()
+    User.emails.clear()
+    facade = HBnBFacade()
+    start = time.perf_counter()
+    facade.enable_persistence(path, snapshot_every=0)
+    elapsed = time.perf_counter() - start
+    total = (len(facade.get_users()) + len(facade.get_all_amenities())
+             + len(facade.get_all_places()) + len(facade.get_all_reviews()))
+    return facade, elapsed, total
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as path:
+        facade = HBnBFacade()
+        facade.enable_persistence(path, snapshot_every=0)
+        start = time.perf_counter()
+        fill(facade, count)
+        facade.store.close()
+        facade = None
+        print(f"{count} objets écrits et journalisés : {time.perf_counter() - start:.1f}s"
+              f" (journal : {dir_size(path) / 1e6:.0f} Mo)")
+
+        facade, elapsed, total = cold_start(path)
+        print(f"Démarrage depuis le journal seul : {elapsed:.2f}s ({total} objets)")
+
+        start = time.perf_counter()
+        facade.store.snapshot()
+        facade.store.close()
+        facade = None
+        print(f"Écriture du snapshot             : {time.perf_counter() - start:.2f}s"
+              f" (snapshot : {dir_size(path) / 1e6:.0f} Mo)")
+
+        facade, elapsed, total = cold_start(path)
+        facade.store.close()
+        print(f"Démarrage depuis le snapshot     : {elapsed:.2f}s ({total} objets)")
+
+
+if __name__ == '__main__':
+    main()
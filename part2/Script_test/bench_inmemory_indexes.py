@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark des index secondaires de InMemoryRepository.
+
+Compare `get_by_attribute('email', ...)` sur un repository sans index (parcours
+linéaire) et sur un repository avec un index unique sur `email`.
+Exécuter depuis le dossier part2 avec : python3 Script_test/bench_inmemory_indexes.py [nb_objets]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.user import User
+from app.persistence.repository import InMemoryRepository
+
+
+def build(repo, users):
+    start = time.perf_counter()
+    for user in users:
+        repo.add(user)
+    return time.perf_counter() - start
+
+
+def lookups(repo, emails):
+    start = time.perf_counter()
+    for email in emails:
+        assert repo.get_by_attribute('email', email) is not None
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    nb_lookups = 1_000
+
+    users = [User(first_name="Bench", last_name=str(i), email=f"bench{i}@example.com")
+             for i in range(count)]
+    emails = [random.choice(users).email for _ in range(nb_lookups)]
+
+    scan_repo = InMemoryRepository()
+    indexed_repo = InMemoryRepository(unique_indexes=('email',))
+
+    print(f"{count} objets, {nb_lookups} recherches par email")
+    print(f"  add (sans index)   : {build(scan_repo, users):.3f}s")
+    print(f"  add (avec index)   : {build(indexed_repo, users):.3f}s")
+
+    scan = lookups(scan_repo, emails)
+    indexed = lookups(indexed_repo, emails)
+    print(f"  lookup (parcours)  : {scan / nb_lookups * 1e6:10.1f} µs/appel")
+    print(f"  lookup (index)     : {indexed / nb_lookups * 1e6:10.1f} µs/appel")
+    print(f"  accélération       : x{scan / indexed:.0f}")
+
+
+if __name__ == '__main__':
+    main()
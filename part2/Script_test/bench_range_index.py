@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'index trié (range index) de InMemoryRepository.
+
+Compare, sur NB_PLACES lieux, la requête « prix entre X et Y, triés par prix,
+les LIMIT premiers » faite par un parcours complet suivi d'un tri (repository
+sans index) et par range_query sur un index trié maintenu avec bisect.
+Mesure aussi le surcoût de l'index sur les ajouts et les mises à jour de prix.
+
+Exécuter depuis le dossier part2 avec : python3 Script_test/bench_range_index.py [nb_places]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.place import Place
+from app.models.user import User
+from app.persistence.repository import InMemoryRepository
+
+NB_PLACES = 100_000
+NB_QUERIES = 200
+LIMIT = 20
+
+
+def timed(label, func, per=1):
+    """Exécute func et affiche sa durée, divisée par per (durée par opération)"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<45} {elapsed * 1000 / per:10.3f} ms")
+
+
+def main():
+    nb_places = int(sys.argv[1]) if len(sys.argv) > 1 else NB_PLACES
+    rng = random.Random(42)
+    owner = User("Bench", "Owner", "bench@example.com")
+    places = [Place(f"Place {i}", float(rng.randrange(10, 1000)), 10.0, 20.0, owner)
+              for i in range(nb_places)]
+    bounds = [(lo, lo + 50.0) for lo in (float(rng.randrange(10, 950)) for _ in range(NB_QUERIES))]
+
+    plain = InMemoryRepository()
+    indexed = InMemoryRepository(range_indexes=('price',))
+    print(f"{nb_places} lieux, {NB_QUERIES} requêtes de prix, limit={LIMIT}")
+    timed("ajout sans index", lambda: [plain.add(place) for place in places])
+    timed("ajout avec index trié", lambda: [indexed.add(place) for place in places])
+
+    def scan(repo):
+        for lo, hi in bounds:
+            repo.range_query('price', lo, hi, LIMIT)
+
+    timed("requête par parcours + tri", lambda: scan(plain), NB_QUERIES)
+    timed("requête par index trié", lambda: scan(indexed), NB_QUERIES)
+
+    targets = rng.sample(places, min(10_000, nb_places))
+    timed("10k mises à jour de prix avec index",
+          lambda: [indexed.update(place.id, {'price': float(rng.randrange(10, 1000))}) for place in targets])
+
+    expected = sorted((p for p in places if 100.0 <= p.price <= 150.0), key=lambda p: (p.price, p.id))[:LIMIT]
+    assert indexed.range_query('price', 100.0, 150.0, LIMIT) == expected
+
+
+if __name__ == '__main__':
+    main()
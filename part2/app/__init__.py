@@ -4,9 +4,15 @@ from app.api.v1.users import api as users_ns
 from app.api.v1.amenities import api as amenities_ns
 from app.api.v1.places import api as places_ns
 from app.api.v1.reviews import api as reviews_ns
+from app.services import facade
 
-def create_app():
+def create_app(config_class="config.DevelopmentConfig"):
     app = Flask(__name__)
+    app.config.from_object(config_class)
+    if app.config.get('PERSISTENCE_PATH'):
+        facade.enable_persistence(app.config['PERSISTENCE_PATH'],
+                                  fsync_interval=app.config['PERSISTENCE_FSYNC_INTERVAL'],
+                                  snapshot_every=app.config['PERSISTENCE_SNAPSHOT_EVERY'])
     api = Api(app, version='1.0', title='HBnB API', description='HBnB Application API')
 
     api.add_namespace(users_ns, path='/api/v1/users')
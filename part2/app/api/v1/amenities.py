@@ -18,8 +18,7 @@ class AmenityList(Resource):
         """Register a new amenity"""
         amenity_data = api.payload
         
-        existing_amenity = facade.amenity_repo.get_by_attribute('name', amenity_data.get('name'))
-        if existing_amenity:
+        if facade.amenity_name_exists(amenity_data.get('name')):
             return {'error': 'Invalid input data'}, 400
         try:
             new_amenity = facade.create_amenity(amenity_data)
@@ -1,4 +1,4 @@
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, inputs, reqparse
 from app.services import facade
 
 api = Namespace('places', description='Place operations')
@@ -28,6 +28,13 @@ place_model = api.model('Place', {
     'amenities': fields.List(fields.String, required=True, description="List of amenities ID's")
 })
 
+# Optional filters of the place list, answered by the sorted price index
+list_parser = reqparse.RequestParser()
+list_parser.add_argument('min_price', type=float, location='args', help='Minimum price per night')
+list_parser.add_argument('max_price', type=float, location='args', help='Maximum price per night')
+list_parser.add_argument('limit', type=inputs.positive, location='args', help='Maximum number of places')
+list_parser.add_argument('order', choices=('asc', 'desc'), location='args', help='Sort by price, asc or desc')
+
 @api.route('/')
 class PlaceList(Resource):
     @api.expect(place_model)
@@ -50,10 +57,16 @@ class PlaceList(Resource):
         except Exception as e:
             return {'error': str(e)}, 400
 
+    @api.expect(list_parser)
     @api.response(200, 'List of places retrieved successfully')
     def get(self):
-        """Retrieve a list of all places"""
-        places = facade.get_all_places()
+        """Retrieve a list of all places, optionally filtered and sorted by price"""
+        args = list_parser.parse_args()
+        if any(value is not None for value in args.values()):
+            places = facade.get_places_by_price(args['min_price'], args['max_price'],
+                                                args['limit'], args['order'] == 'desc')
+        else:
+            places = facade.get_all_places()
         return [place.to_dict() for place in places], 200
 
 @api.route('/<place_id>')
@@ -103,8 +116,7 @@ class PlaceAmenities(Resource):
             if not a:
                 return {'error': 'Invalid input data'}, 400
         
-        for amenity in amenities_data:
-            place.add_amenity(amenity)
+        facade.add_place_amenities(place_id, amenities_data)
         return {'message': 'Amenities added successfully'}, 200
 
 @api.route('/<place_id>/reviews/')
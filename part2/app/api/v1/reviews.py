@@ -1,4 +1,4 @@
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, inputs, reqparse
 from app.services import facade
 
 api = Namespace('reviews', description='Review operations')
@@ -11,6 +11,13 @@ review_model = api.model('Review', {
     'place_id': fields.String(required=True, description='ID of the place')
 })
 
+# Optional filters of the review list, answered by the sorted rating index
+list_parser = reqparse.RequestParser()
+list_parser.add_argument('min_rating', type=int, location='args', help='Minimum rating')
+list_parser.add_argument('max_rating', type=int, location='args', help='Maximum rating')
+list_parser.add_argument('limit', type=inputs.positive, location='args', help='Maximum number of reviews')
+list_parser.add_argument('order', choices=('asc', 'desc'), location='args', help='Sort by rating, asc or desc')
+
 @api.route('/')
 class ReviewList(Resource):
     @api.expect(review_model)
@@ -33,10 +40,17 @@ class ReviewList(Resource):
         except Exception as e:
             return {'error': str(e)}, 400
 
+    @api.expect(list_parser)
     @api.response(200, 'List of reviews retrieved successfully')
     def get(self):
-        """Retrieve a list of all reviews"""
-        return [review.to_dict() for review in facade.get_all_reviews()], 200
+        """Retrieve a list of all reviews, optionally filtered and sorted by rating"""
+        args = list_parser.parse_args()
+        if any(value is not None for value in args.values()):
+            reviews = facade.get_reviews_by_rating(args['min_rating'], args['max_rating'],
+                                                   args['limit'], args['order'] == 'desc')
+        else:
+            reviews = facade.get_all_reviews()
+        return [review.to_dict() for review in reviews], 200
 
 @api.route('/<review_id>')
 class ReviewResource(Resource):
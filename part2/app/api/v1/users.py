@@ -21,8 +21,7 @@ class UserList(Resource):
         user_data = api.payload
 
         # Simulate email uniqueness check (to be replaced by real validation with persistence)
-        existing_user = facade.get_user_by_email(user_data['email'])
-        if existing_user:
+        if facade.email_exists(user_data['email']):
             return {'error': 'Email already registered'}, 409
 
         try:
@@ -21,6 +21,15 @@ class Amenity(BaseModel):
 	def update(self, data):
 		return super().update(data)
 	
+	def to_record(self):
+		"""Tuple of plain values saved by the persistence store"""
+		return self._base_record() + (self.name,)
+
+	@classmethod
+	def from_record(cls, record):
+		"""Rebuild an amenity from to_record() output"""
+		return cls._from_record(record, {'_Amenity__name': record[3]})
+
 	def to_dict(self):
 		return {
 			'id': self.id,
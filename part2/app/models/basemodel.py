@@ -18,6 +18,25 @@ class BaseModel:
                 setattr(self, key, value)
         self.save()  # Update the updated_at timestamp
         
+    def _base_record(self):
+        """id and timestamps, the first fields of every persistence record"""
+        return (self.id, self.created_at.timestamp(), self.updated_at.timestamp())
+
+    @classmethod
+    def _from_record(cls, record, attributes):
+        """Create an instance from a persistence record without running __init__ or the setters.
+
+        attributes maps the instance attribute names (the mangled `_Class__name`
+        of private attributes) to their values; the base fields are added from
+        the first fields of the record.
+        """
+        obj = cls.__new__(cls)
+        attributes['id'] = record[0]
+        attributes['created_at'] = datetime.fromtimestamp(record[1])
+        attributes['updated_at'] = datetime.fromtimestamp(record[2])
+        obj.__dict__ = attributes
+        return obj
+
     def is_max_length(self, name, value, max_length):
         if len(value) > max_length:
             raise ValueError(f"{name} must be {max_length} characters max.") 
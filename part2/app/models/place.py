@@ -82,6 +82,30 @@ class Place(BaseModel):
         """Add an amenity to the place."""
         self.amenities.append(amenity)
 
+    def to_record(self):
+        """Tuple of plain values saved by the persistence store (the owner is saved by id)"""
+        return self._base_record() + (self.title, self.description, self.price, self.latitude,
+                                      self.longitude, self.owner.id, list(self.amenities))
+
+    @classmethod
+    def from_record(cls, record, users):
+        """Rebuild a place from to_record() output and attach it to its owner, found in users"""
+        owner = users.get(record[8])
+        if owner is None:
+            return None
+        place = cls._from_record(record, {
+            '_Place__title': record[3],
+            'description': record[4],
+            '_Place__price': record[5],
+            '_Place__latitude': record[6],
+            '_Place__longitude': record[7],
+            '_Place__owner': owner,
+            'reviews': [],
+            'amenities': list(record[9]),
+        })
+        owner.places.append(place)
+        return place
+
     def to_dict(self):
         return {
             'id': self.id,
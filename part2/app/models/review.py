@@ -53,6 +53,27 @@ class Review(BaseModel):
 			raise TypeError("User must be a user instance")
 		self.__user = value
 
+	def to_record(self):
+		"""Tuple of plain values saved by the persistence store (place and user are saved by id)"""
+		return self._base_record() + (self.text, self.rating, self.place.id, self.user.id)
+
+	@classmethod
+	def from_record(cls, record, places, users):
+		"""Rebuild a review from to_record() output and attach it to its place and author"""
+		place = places.get(record[5])
+		user = users.get(record[6])
+		if place is None or user is None:
+			return None
+		review = cls._from_record(record, {
+			'_Review__text': record[3],
+			'_Review__rating': record[4],
+			'_Review__place': place,
+			'_Review__user': user,
+		})
+		place.reviews.append(review)
+		user.reviews.append(review)
+		return review
+
 	def to_dict(self):
 		return {
 			'id': self.id,
@@ -74,6 +74,23 @@ class User(BaseModel):
         """Add an amenity to the place."""
         self.reviews.remove(review)
 
+    def to_record(self):
+        """Tuple of plain values saved by the persistence store"""
+        return self._base_record() + (self.first_name, self.last_name, self.email, self.is_admin)
+
+    @classmethod
+    def from_record(cls, record):
+        """Rebuild a user from to_record() output (the values were validated when first saved)"""
+        User.emails.add(record[5])
+        return cls._from_record(record, {
+            '_User__first_name': record[3],
+            '_User__last_name': record[4],
+            '_User__email': record[5],
+            '_User__is_admin': record[6],
+            'places': [],
+            'reviews': [],
+        })
+
     def to_dict(self):
         return {
             'id': self.id,
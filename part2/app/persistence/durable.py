@@ -0,0 +1,241 @@
+"""Optional on-disk persistence for the in-memory repositories.
+
+The store keeps two kinds of files in its directory:
+
+- ``log.<generation>``: an append-only log of mutations. Each record is
+  framed as ``<length:uint32><crc32:uint32><payload>``, the payload being
+  a marshalled ``(op, collection, obj_id, record)`` tuple. Writes are
+  buffered and flushed then fsynced in batches by a background thread
+  every ``fsync_interval`` seconds (group commit), so a crash loses at
+  most that window of writes; ``fsync_interval=0`` fsyncs every write.
+- ``snapshot.bin``: a compacted copy of every collection, written every
+  ``snapshot_every`` logged mutations. It starts a new log generation,
+  after which the older logs are deleted.
+
+Records are plain tuples of str/float/int/bool/list/dict values built by
+the models' ``to_record`` methods, so marshal can encode them. Loading
+memory-maps the snapshot and the logs, reads the snapshot, replays the
+logs on top of it, and stops at the first torn or corrupted log record
+(the tail of an interrupted write), which is then truncated.
+"""
+import marshal
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+_FRAME = struct.Struct('<II')
+_SNAPSHOT_HEADER = struct.Struct('<8sQ')
+SNAPSHOT_MAGIC = b'HBNBSNP1'
+SNAPSHOT_FILE = 'snapshot.bin'
+LOG_PREFIX = 'log.'
+
+PUT = 'put'
+DELETE = 'del'
+
+
+def _map(path):
+    """Read-only memory map of path, or None for an empty file"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _fsync_dir(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class DurableStore:
+    def __init__(self, path, fsync_interval=0.05, snapshot_every=100_000):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self._sources = {}
+        self._lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._log = None
+        self._generation = 0
+        self._dirty = False
+        self._since_snapshot = 0
+        self._stop = threading.Event()
+        self._flusher = None
+        os.makedirs(path, exist_ok=True)
+
+    def register(self, collection, repository):
+        """Declare a repository whose objects are saved as collection in snapshots"""
+        self._sources[collection] = repository
+
+    # Loading
+
+    def load(self):
+        """Return {collection: {obj_id: record}} rebuilt from disk and open the log for writing"""
+        state = {collection: {} for collection in self._sources}
+        snapshot_path = os.path.join(self.path, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            self._generation = self._read_snapshot(snapshot_path, state)
+
+        logs = sorted(gen for gen in self._log_generations() if gen >= self._generation)
+        for gen in logs:
+            if not self._replay(self._log_path(gen), state):
+                # A torn record can only be the tail of the last log written before a crash
+                break
+        if logs:
+            self._generation = max(self._generation, logs[-1])
+        self._open_log()
+        return state
+
+    def _read_snapshot(self, path, state):
+        data = _map(path)
+        if data is None:
+            raise ValueError(f"{path} is empty")
+        view = memoryview(data)
+        try:
+            magic, generation = _SNAPSHOT_HEADER.unpack_from(view, 0)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} is not a snapshot file")
+            body = view[_SNAPSHOT_HEADER.size:]
+            try:
+                # marshal decodes straight from the mapped pages, without reading the file into a bytes copy
+                collections = marshal.loads(body)
+            finally:
+                body.release()
+        finally:
+            view.release()
+            data.close()
+        for collection, records in collections.items():
+            state.setdefault(collection, {}).update((record[0], record) for record in records)
+        return generation
+
+    def _replay(self, path, state):
+        """Apply the records of one log to state; return False if it ends with a torn record"""
+        data = _map(path)
+        if data is None:
+            return True
+        offset = 0
+        size = len(data)
+        try:
+            while offset + _FRAME.size <= size:
+                length, crc = _FRAME.unpack_from(data, offset)
+                start = offset + _FRAME.size
+                payload = data[start:start + length]
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    break
+                op, collection, obj_id, record = marshal.loads(payload)
+                if op == PUT:
+                    state.setdefault(collection, {})[obj_id] = record
+                else:
+                    state.get(collection, {}).pop(obj_id, None)
+                offset = start + length
+        finally:
+            data.close()
+        if offset == size:
+            return True
+        with open(path, 'r+b') as f:
+            f.truncate(offset)
+        return False
+
+    def _log_generations(self):
+        for name in os.listdir(self.path):
+            if name.startswith(LOG_PREFIX) and name[len(LOG_PREFIX):].isdigit():
+                yield int(name[len(LOG_PREFIX):])
+
+    def _log_path(self, generation):
+        return os.path.join(self.path, f"{LOG_PREFIX}{generation:08d}")
+
+    def _open_log(self):
+        self._log = open(self._log_path(self._generation), 'ab', buffering=1024 * 1024)
+        _fsync_dir(self.path)
+        if self.fsync_interval and self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, name='hbnb-durable-flush', daemon=True)
+            self._flusher.start()
+
+    # Writing
+
+    def put(self, collection, obj_id, record):
+        self._append((PUT, collection, obj_id, record))
+
+    def delete(self, collection, obj_id):
+        self._append((DELETE, collection, obj_id, None))
+
+    def _append(self, entry):
+        payload = marshal.dumps(entry)
+        frame = _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._lock:
+            self._log.write(frame)
+            self._dirty = True
+            self._since_snapshot += 1
+            if not self.fsync_interval:
+                self._log.flush()
+                os.fsync(self._log.fileno())
+                self._dirty = False
+
+    def flush(self):
+        """Write buffered log records and fsync them"""
+        with self._snapshot_lock:
+            with self._lock:
+                if not self._dirty or self._log is None:
+                    return
+                self._log.flush()
+                self._dirty = False
+                fd = self._log.fileno()
+            # fsync outside the write lock: writers keep appending while the disk catches up,
+            # and the snapshot lock keeps the log from being rotated and closed meanwhile
+            os.fsync(fd)
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.fsync_interval):
+            self.flush()
+            if self.snapshot_every and self._since_snapshot >= self.snapshot_every:
+                self.snapshot()
+
+    # Compaction
+
+    def snapshot(self):
+        """Write every collection to a new snapshot and drop the logs it replaces"""
+        with self._snapshot_lock:
+            with self._lock:
+                # Switch to a new log generation and take the object lists at the same point:
+                # the snapshot may contain changes also found in the new log, replaying them
+                # again on load is harmless since every record holds the full object state.
+                self._log.flush()
+                os.fsync(self._log.fileno())
+                self._log.close()
+                self._generation += 1
+                generation = self._generation
+                self._log = open(self._log_path(generation), 'ab', buffering=1024 * 1024)
+                self._dirty = False
+                self._since_snapshot = 0
+                objects = {collection: repository.get_all()
+                           for collection, repository in self._sources.items()}
+
+            collections = {collection: [obj.to_record() for obj in objs]
+                           for collection, objs in objects.items()}
+            tmp_path = os.path.join(self.path, SNAPSHOT_FILE + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, generation))
+                marshal.dump(collections, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, os.path.join(self.path, SNAPSHOT_FILE))
+            _fsync_dir(self.path)
+            for old in self._log_generations():
+                if old < generation:
+                    os.remove(self._log_path(old))
+
+    def close(self):
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        with self._lock:
+            if self._log is not None:
+                self._log.flush()
+                os.fsync(self._log.fileno())
+                self._log.close()
+                self._log = None
@@ -0,0 +1,97 @@
+import threading
+from contextlib import contextmanager
+
+
+class ReadWriteLock:
+    """Reader-writer lock: many concurrent readers or a single writer.
+
+    Writers are preferred: once a writer is waiting, new readers wait
+    too, so a steady stream of reads cannot starve writes.
+    Not reentrant.
+    """
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self):
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class StripedLock:
+    """A fixed pool of locks, each key being mapped to one stripe by its hash.
+
+    Operations on keys that fall in different stripes run in parallel,
+    instead of all serialising on one global lock. Several keys are locked
+    by taking their stripes in index order, so two callers can never
+    deadlock by locking the same stripes in opposite orders.
+    """
+    def __init__(self, stripes=64):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def __len__(self):
+        return len(self._locks)
+
+    def stripes_for(self, keys):
+        """Sorted, de-duplicated stripe numbers covering keys"""
+        return sorted({hash(key) % len(self._locks) for key in keys})
+
+    @contextmanager
+    def locked(self, *keys):
+        stripes = self.stripes_for(keys)
+        for stripe in stripes:
+            self._locks[stripe].acquire()
+        try:
+            yield
+        finally:
+            for stripe in reversed(stripes):
+                self._locks[stripe].release()
+
+    @contextmanager
+    def locked_all(self):
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
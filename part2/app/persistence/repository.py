@@ -1,4 +1,11 @@
 from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort
+from itertools import chain, count
+from operator import attrgetter, itemgetter
+import threading
+from app.persistence.locks import StripedLock
+
+_RANGE_VALUE = itemgetter(0)
 
 class Repository(ABC):
     @abstractmethod
@@ -25,28 +32,382 @@ class Repository(ABC):
     def get_by_attribute(self, attr_name, attr_value):
         pass
 
+    @abstractmethod
+    def exists(self, **filters):
+        pass
+
+    @abstractmethod
+    def count(self, **filters):
+        pass
+
 
 class InMemoryRepository(Repository):
-    def __init__(self):
+    """In-memory repository with optional secondary hash indexes.
+
+    Indexes are declared with `unique_indexes` / `indexes` (or later with
+    `register_index`) and kept in sync by `add`, `update` and `delete`, so
+    `get_by_attribute` on an indexed attribute is a dict lookup instead of
+    a scan. Indexed attribute values must be hashable.
+
+    `get_all` returns an immutable tuple shared by every reader and only
+    rebuilt, on the next read, after an object was added or deleted.
+
+    Sorted range indexes (`range_indexes` / `register_range_index`) keep
+    (value, id) pairs ordered with bisect, so `range_query` answers
+    "price between X and Y" in O(log n + k). Their values must be mutually
+    comparable; objects whose value is None are left out of the index.
+    """
+    def __init__(self, unique_indexes=(), indexes=(), range_indexes=()):
         self._storage = {}
+        # Version of the set of stored objects, taken from a counter so that
+        # concurrent writers never publish the same value twice
+        self._versions = count(1)
+        self._version = 0
+        # (version, tuple of objects) returned by get_all
+        self._snapshot = (0, ())
+        # attr_name -> {value: obj_id}
+        self._unique_indexes = {}
+        # attr_name -> {value: {obj_id: None}} (dict used as an ordered set)
+        self._indexes = {}
+        # attr_name -> sorted list of (value, obj_id)
+        self._range_indexes = {}
+        # Optional DurableStore receiving every mutation (see attach_store)
+        self._store = None
+        self._collection = None
+        for attr_name in unique_indexes:
+            self.register_index(attr_name, unique=True)
+        for attr_name in indexes:
+            self.register_index(attr_name)
+        for attr_name in range_indexes:
+            self.register_range_index(attr_name)
+
+    def register_index(self, attr_name, unique=False):
+        """Declare an index on attr_name and build it from the stored objects"""
+        if attr_name == 'id' or attr_name in self._unique_indexes or attr_name in self._indexes:
+            return
+        if unique:
+            index = {}
+            for obj in self._storage.values():
+                value = getattr(obj, attr_name)
+                if value in index:
+                    raise ValueError(f"{attr_name} already exists")
+                index[value] = obj.id
+            self._unique_indexes[attr_name] = index
+        else:
+            index = {}
+            for obj in self._storage.values():
+                index.setdefault(getattr(obj, attr_name), {})[obj.id] = None
+            self._indexes[attr_name] = index
+
+    def register_range_index(self, attr_name):
+        """Declare a sorted range index on attr_name and build it from the stored objects"""
+        if attr_name in self._range_indexes:
+            return
+        keys = ((getattr(obj, attr_name), obj.id) for obj in self._storage.values())
+        self._range_indexes[attr_name] = sorted(key for key in keys if key[0] is not None)
+
+    def _range_insert(self, attr_name, key):
+        insort(self._range_indexes[attr_name], key)
+
+    def _range_remove(self, attr_name, key):
+        index = self._range_indexes[attr_name]
+        position = bisect_left(index, key)
+        if position < len(index) and index[position] == key:
+            del index[position]
+
+    def range_query(self, attr_name, lo=None, hi=None, limit=None, reverse=False):
+        """Objects whose attr_name is between lo and hi (inclusive, None = unbounded),
+        sorted by that attribute (descending if reverse), at most limit of them.
+
+        Uses the range index of attr_name, or a full scan plus sort if none was declared.
+        """
+        if attr_name not in self._range_indexes:
+            objs = [obj for obj in self._scan()
+                    if getattr(obj, attr_name) is not None
+                    and (lo is None or getattr(obj, attr_name) >= lo)
+                    and (hi is None or getattr(obj, attr_name) <= hi)]
+            objs.sort(key=lambda obj: (getattr(obj, attr_name), obj.id), reverse=reverse)
+            return objs[:limit]
+        keys = self._range_slice(attr_name, lo, hi, limit, reverse)
+        return [obj for obj in map(self._storage.get, (obj_id for _, obj_id in keys)) if obj is not None]
+
+    def _range_slice(self, attr_name, lo, hi, limit, reverse):
+        index = self._range_indexes[attr_name]
+        start = 0 if lo is None else bisect_left(index, lo, key=_RANGE_VALUE)
+        end = len(index) if hi is None else bisect_right(index, hi, key=_RANGE_VALUE)
+        if limit is not None:
+            if reverse:
+                start = max(start, end - limit)
+            else:
+                end = min(end, start + limit)
+        keys = index[start:end]
+        if reverse:
+            keys.reverse()
+        return keys
+
+    def attach_store(self, store, collection):
+        """Log every later add/update/delete to a DurableStore, under the given collection name"""
+        self._store = store
+        self._collection = collection
+        store.register(collection, self)
+
+    def load(self, objs):
+        """Insert objects restored from a DurableStore, without logging them again"""
+        objs = list(objs)
+        self._storage.update((obj.id, obj) for obj in objs)
+        # Indexes are filled one attribute at a time, which is much faster than _index() per object
+        for attr_name, index in self._unique_indexes.items():
+            get_value = attrgetter(attr_name)
+            index.update((get_value(obj), obj.id) for obj in objs)
+        for attr_name, index in self._indexes.items():
+            get_value = attrgetter(attr_name)
+            for obj in objs:
+                index.setdefault(get_value(obj), {})[obj.id] = None
+        for attr_name, index in self._range_indexes.items():
+            get_value = attrgetter(attr_name)
+            index.extend((get_value(obj), obj.id) for obj in objs)
+            index[:] = [key for key in index if key[0] is not None]
+            index.sort()
+        self._changed()
+
+    def persist(self, obj_id):
+        """Log the current state of an object changed in place (e.g. its relationship lists)"""
+        obj = self.get(obj_id)
+        if obj is not None:
+            self._log_put(obj)
+
+    def _changed(self):
+        """Invalidate the get_all snapshot; called after the storage was modified"""
+        self._version = next(self._versions)
+
+    def _log_put(self, obj):
+        if self._store is not None:
+            self._store.put(self._collection, obj.id, obj.to_record())
+
+    def _log_delete(self, obj_id):
+        if self._store is not None:
+            self._store.delete(self._collection, obj_id)
+
+    def _check_unique(self, obj_id, values):
+        for attr_name, value in values.items():
+            owner_id = self._unique_indexes[attr_name].get(value)
+            if owner_id is not None and owner_id != obj_id:
+                raise ValueError(f"{attr_name} already exists")
+
+    def _index(self, obj):
+        for attr_name, index in self._unique_indexes.items():
+            index[getattr(obj, attr_name)] = obj.id
+        for attr_name, index in self._indexes.items():
+            index.setdefault(getattr(obj, attr_name), {})[obj.id] = None
+        for attr_name in self._range_indexes:
+            value = getattr(obj, attr_name)
+            if value is not None:
+                self._range_insert(attr_name, (value, obj.id))
+
+    def _unindex(self, obj):
+        for attr_name, index in self._unique_indexes.items():
+            index.pop(getattr(obj, attr_name), None)
+        for attr_name, index in self._indexes.items():
+            value = getattr(obj, attr_name)
+            ids = index.get(value)
+            if ids is not None:
+                ids.pop(obj.id, None)
+                if not ids:
+                    del index[value]
+        for attr_name in self._range_indexes:
+            value = getattr(obj, attr_name)
+            if value is not None:
+                self._range_remove(attr_name, (value, obj.id))
 
     def add(self, obj):
+        self._check_unique(obj.id, {attr_name: getattr(obj, attr_name)
+                                    for attr_name in self._unique_indexes})
         self._storage[obj.id] = obj
+        self._index(obj)
+        self._changed()
+        self._log_put(obj)
 
     def get(self, obj_id):
         return self._storage.get(obj_id)
 
     def get_all(self):
-        return list(self._storage.values())
+        version, objs = self._snapshot
+        if version != self._version:
+            # The version is read before copying: if a write lands during the copy, the
+            # snapshot is stored under the old version and rebuilt by the next reader.
+            version = self._version
+            objs = tuple(self._storage.values())
+            self._snapshot = (version, objs)
+        return objs
+
+    def _scan(self):
+        """Iterable over every stored object, for full scans"""
+        return self._storage.values()
 
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
-            obj.update(data)
+            self._check_unique(obj_id, {attr_name: data[attr_name]
+                                        for attr_name in self._unique_indexes if attr_name in data})
+            self._unindex(obj)
+            try:
+                obj.update(data)
+            finally:
+                # Re-index (and log) even if a setter rejected the data: the object
+                # keeps the attributes that were successfully assigned.
+                self._index(obj)
+                self._log_put(obj)
 
     def delete(self, obj_id):
-        if obj_id in self._storage:
-            del self._storage[obj_id]
+        obj = self._storage.pop(obj_id, None)
+        if obj is not None:
+            self._unindex(obj)
+            self._changed()
+            self._log_delete(obj_id)
 
     def get_by_attribute(self, attr_name, attr_value):
-        return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
+        if attr_name == 'id':
+            return self.get(attr_value)
+        if attr_name in self._unique_indexes:
+            obj_id = self._unique_indexes[attr_name].get(attr_value)
+            return self._storage.get(obj_id) if obj_id is not None else None
+        if attr_name in self._indexes:
+            ids = self._indexes[attr_name].get(attr_value)
+            return self._storage[next(iter(ids))] if ids else None
+        return next((obj for obj in self._scan() if getattr(obj, attr_name) == attr_value), None)
+
+    def _candidates(self, filters):
+        """Objects that may match filters, narrowed through an index when one covers a filter"""
+        for attr_name, value in filters.items():
+            if attr_name == 'id' or attr_name in self._unique_indexes:
+                obj_id = value if attr_name == 'id' else self._unique_indexes[attr_name].get(value)
+                obj = self._storage.get(obj_id) if obj_id is not None else None
+                return [obj] if obj else []
+            if attr_name in self._indexes:
+                return [self._storage[obj_id] for obj_id in self._indexes[attr_name].get(value, ())]
+        return self._scan()
+
+    def exists(self, **filters):
+        """Return True if an object matches every attr=value filter"""
+        return any(all(getattr(obj, attr_name) == value for attr_name, value in filters.items())
+                   for obj in self._candidates(filters))
+
+    def count(self, **filters):
+        """Return how many objects match every attr=value filter"""
+        if not filters:
+            return len(self._storage)
+        if len(filters) == 1:
+            (attr_name, value), = filters.items()
+            if attr_name in self._indexes:
+                return len(self._indexes[attr_name].get(value, ()))
+        return sum(1 for obj in self._candidates(filters)
+                   if all(getattr(obj, attr_name) == value for attr_name, value in filters.items()))
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        """Return every object whose attr_name equals attr_value"""
+        if attr_name in self._indexes:
+            return [self._storage[obj_id] for obj_id in self._indexes[attr_name].get(attr_value, ())]
+        if attr_name == 'id' or attr_name in self._unique_indexes:
+            obj = self.get_by_attribute(attr_name, attr_value)
+            return [obj] if obj else []
+        return [obj for obj in self._scan() if getattr(obj, attr_name) == attr_value]
+
+
+class ConcurrentInMemoryRepository(InMemoryRepository):
+    """Thread-safe InMemoryRepository using lock striping.
+
+    A write locks the stripes of the object id and of every indexed value
+    it touches (old and new), so writes to unrelated objects proceed in
+    parallel while two writers of the same object, or of the same unique
+    value, are serialised. `get` and `get_all` are lock-free; index
+    lookups briefly lock the stripe of the looked-up value, and full
+    scans iterate over a snapshot of the storage.
+    """
+    def __init__(self, unique_indexes=(), indexes=(), range_indexes=(), stripes=64):
+        self._locks = StripedLock(stripes)
+        # A range index is one sorted list shared by every value: each has its own lock
+        self._range_locks = {}
+        super().__init__(unique_indexes=unique_indexes, indexes=indexes, range_indexes=range_indexes)
+
+    def _lock_keys(self, obj, data=None):
+        keys = [('id', obj.id)]
+        for attr_name in chain(self._unique_indexes, self._indexes):
+            keys.append((attr_name, getattr(obj, attr_name)))
+            if data and attr_name in data:
+                keys.append((attr_name, data[attr_name]))
+        return keys
+
+    def _indexed_keys(self, filters):
+        return [(attr_name, value) for attr_name, value in filters.items()
+                if attr_name in self._unique_indexes or attr_name in self._indexes]
+
+    def register_index(self, attr_name, unique=False):
+        with self._locks.locked_all():
+            super().register_index(attr_name, unique=unique)
+
+    def register_range_index(self, attr_name):
+        with self._locks.locked_all():
+            self._range_locks.setdefault(attr_name, threading.Lock())
+            super().register_range_index(attr_name)
+
+    def _range_insert(self, attr_name, key):
+        with self._range_locks[attr_name]:
+            super()._range_insert(attr_name, key)
+
+    def _range_remove(self, attr_name, key):
+        with self._range_locks[attr_name]:
+            super()._range_remove(attr_name, key)
+
+    def _range_slice(self, attr_name, lo, hi, limit, reverse):
+        with self._range_locks[attr_name]:
+            return super()._range_slice(attr_name, lo, hi, limit, reverse)
+
+    def load(self, objs):
+        with self._locks.locked_all():
+            super().load(objs)
+
+    def persist(self, obj_id):
+        with self._locks.locked(('id', obj_id)):
+            super().persist(obj_id)
+
+    def add(self, obj):
+        with self._locks.locked(*self._lock_keys(obj)):
+            super().add(obj)
+
+    def update(self, obj_id, data):
+        while True:
+            obj = self.get(obj_id)
+            if obj is None:
+                return
+            keys = self._lock_keys(obj, data)
+            with self._locks.locked(*keys):
+                # The stripes were chosen from the object's values before locking:
+                # retry if another writer changed them (or removed the object) meanwhile.
+                if self._storage.get(obj_id) is obj and self._lock_keys(obj, data) == keys:
+                    return super().update(obj_id, data)
+
+    def delete(self, obj_id):
+        while True:
+            obj = self.get(obj_id)
+            if obj is None:
+                return
+            keys = self._lock_keys(obj)
+            with self._locks.locked(*keys):
+                if self._storage.get(obj_id) is obj and self._lock_keys(obj) == keys:
+                    return super().delete(obj_id)
+
+    def get_by_attribute(self, attr_name, attr_value):
+        with self._locks.locked(*self._indexed_keys({attr_name: attr_value})):
+            return super().get_by_attribute(attr_name, attr_value)
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        with self._locks.locked(*self._indexed_keys({attr_name: attr_value})):
+            return super().get_all_by_attribute(attr_name, attr_value)
+
+    def _candidates(self, filters):
+        with self._locks.locked(*self._indexed_keys(filters)):
+            return list(super()._candidates(filters))
+
+    def _scan(self):
+        # The get_all snapshot is immutable, so concurrent inserts cannot break the iteration
+        return self.get_all()
@@ -1,4 +1,8 @@
-from app.persistence.repository import InMemoryRepository
+import atexit
+import gc
+from app.persistence.durable import DurableStore
+from app.persistence.locks import ReadWriteLock
+from app.persistence.repository import ConcurrentInMemoryRepository
 from app.models.user import User
 from app.models.amenity import Amenity
 from app.models.place import Place
@@ -6,10 +10,59 @@ from app.models.review import Review
 
 class HBnBFacade:
     def __init__(self):
-        self.user_repo = InMemoryRepository()
-        self.amenity_repo = InMemoryRepository()
-        self.place_repo = InMemoryRepository()
-        self.review_repo = InMemoryRepository()
+        self.user_repo = ConcurrentInMemoryRepository(unique_indexes=('email',))
+        self.amenity_repo = ConcurrentInMemoryRepository(unique_indexes=('name',))
+        self.place_repo = ConcurrentInMemoryRepository(indexes=('owner',),
+                                                       range_indexes=('price',))
+        self.review_repo = ConcurrentInMemoryRepository(indexes=('place', 'user'),
+                                                        range_indexes=('rating',))
+        # Guards the relationship lists (user.places, place.reviews...) that
+        # multi-object operations update in several steps
+        self._relations_lock = ReadWriteLock()
+        self.store = None
+
+    # PERSISTENCE
+    def enable_persistence(self, path, fsync_interval=0.05, snapshot_every=100_000):
+        """Back the repositories with a DurableStore in path and reload the state saved there"""
+        if self.store is not None:
+            if self.store.path == path:
+                return self.store
+            raise RuntimeError(f"Persistence is already enabled in {self.store.path}")
+        store = DurableStore(path, fsync_interval=fsync_interval, snapshot_every=snapshot_every)
+        self.user_repo.attach_store(store, 'users')
+        self.amenity_repo.attach_store(store, 'amenities')
+        self.place_repo.attach_store(store, 'places')
+        self.review_repo.attach_store(store, 'reviews')
+        # The cyclic garbage collector would rescan every object already created each time
+        # it triggers during the load: it is paused until all the objects are built.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._load_state(store.load())
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        self.store = store
+        atexit.register(store.close)
+        return store
+
+    def _load_state(self, state):
+        # Relationships are rebuilt from the ids saved in the records, parents first
+        users = {obj_id: User.from_record(record) for obj_id, record in state['users'].items()}
+        amenities = [Amenity.from_record(record) for record in state['amenities'].values()]
+        places = {}
+        for obj_id, record in state['places'].items():
+            place = Place.from_record(record, users)
+            if place is not None:
+                places[obj_id] = place
+        reviews = [review for review in (Review.from_record(record, places, users)
+                                         for record in state['reviews'].values())
+                   if review is not None]
+
+        self.user_repo.load(users.values())
+        self.amenity_repo.load(amenities)
+        self.place_repo.load(places.values())
+        self.review_repo.load(reviews)
 
     # USER
     def create_user(self, user_data):
@@ -25,6 +78,9 @@ class HBnBFacade:
 
     def get_user_by_email(self, email):
         return self.user_repo.get_by_attribute('email', email)
+
+    def email_exists(self, email):
+        return self.user_repo.exists(email=email)
     
     def update_user(self, user_id, user_data):
         self.user_repo.update(user_id, user_data)
@@ -35,6 +91,9 @@ class HBnBFacade:
         self.amenity_repo.add(amenity)
         return amenity
 
+    def amenity_name_exists(self, name):
+        return self.amenity_repo.exists(name=name)
+
     def get_amenity(self, amenity_id):
         return self.amenity_repo.get(amenity_id)
 
@@ -58,11 +117,12 @@ class HBnBFacade:
                 if not amenity:
                     raise KeyError('Invalid input data')
         place = Place(**place_data)
-        self.place_repo.add(place)
-        user.add_place(place)
         if amenities:
             for amenity in amenities:
                 place.add_amenity(amenity)
+        with self._relations_lock.write_locked():
+            self.place_repo.add(place)
+            user.add_place(place)
         return place
 
     def get_place(self, place_id):
@@ -71,9 +131,20 @@ class HBnBFacade:
     def get_all_places(self):
         return self.place_repo.get_all()
 
+    def get_places_by_price(self, min_price=None, max_price=None, limit=None, descending=False):
+        """Places priced between min_price and max_price (inclusive), cheapest first"""
+        return self.place_repo.range_query('price', min_price, max_price, limit, descending)
+
     def update_place(self, place_id, place_data):
         self.place_repo.update(place_id, place_data)
 
+    def add_place_amenities(self, place_id, amenities):
+        place = self.place_repo.get(place_id)
+        with self._relations_lock.write_locked():
+            for amenity in amenities:
+                place.add_amenity(amenity)
+            self.place_repo.persist(place_id)
+
     # REVIEWS
     def create_review(self, review_data):
         user = self.user_repo.get(review_data['user_id'])
@@ -89,9 +160,10 @@ class HBnBFacade:
         review_data['place'] = place
 
         review = Review(**review_data)
-        self.review_repo.add(review)
-        user.add_review(review)
-        place.add_review(review)
+        with self._relations_lock.write_locked():
+            self.review_repo.add(review)
+            user.add_review(review)
+            place.add_review(review)
         return review
         
     def get_review(self, review_id):
@@ -100,21 +172,27 @@ class HBnBFacade:
     def get_all_reviews(self):
         return self.review_repo.get_all()
 
+    def get_reviews_by_rating(self, min_rating=None, max_rating=None, limit=None, descending=False):
+        """Reviews rated between min_rating and max_rating (inclusive), lowest first"""
+        return self.review_repo.range_query('rating', min_rating, max_rating, limit, descending)
+
     def get_reviews_by_place(self, place_id):
         place = self.place_repo.get(place_id)
         if not place:
             raise KeyError('Place not found')
-        return place.reviews
+        with self._relations_lock.read_locked():
+            return list(place.reviews)
 
     def update_review(self, review_id, review_data):
         self.review_repo.update(review_id, review_data)
 
     def delete_review(self, review_id):
-        review = self.review_repo.get(review_id)
-        
-        user = self.user_repo.get(review.user.id)
-        place = self.place_repo.get(review.place.id)
+        with self._relations_lock.write_locked():
+            review = self.review_repo.get(review_id)
+
+            user = self.user_repo.get(review.user.id)
+            place = self.place_repo.get(review.place.id)
 
-        user.delete_review(review)
-        place.delete_review(review)
-        self.review_repo.delete(review_id)
+            user.delete_review(review)
+            place.delete_review(review)
+            self.review_repo.delete(review_id)
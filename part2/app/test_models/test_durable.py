@@ -0,0 +1,71 @@
+from app.services.facade import HBnBFacade
+import os
+import tempfile
+import unittest
+import uuid
+
+
+class TestDurableStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def open_facade(self):
+        facade = HBnBFacade()
+        facade.enable_persistence(self.path, fsync_interval=0, snapshot_every=0)
+        self.addCleanup(facade.store.close)
+        return facade
+
+    def populate(self, facade):
+        user = facade.create_user({'first_name': "John", 'last_name': "Doe",
+                                   'email': f"{uuid.uuid4()}@example.com"})
+        amenity = facade.create_amenity({'name': f"Wi-Fi {uuid.uuid4().hex[:8]}"})
+        place = facade.create_place({'title': "Loft", 'price': 100, 'latitude': 45.0, 'longitude': 4.0,
+                                     'owner_id': user.id, 'amenities': [{'id': amenity.id}]})
+        review = facade.create_review({'text': "Great", 'rating': 4, 'user_id': user.id, 'place_id': place.id})
+        facade.update_place(place.id, {'title': "Big loft"})
+        return user, place, review
+
+    def assert_reloaded(self, user, place, review):
+        facade = self.open_facade()
+        loaded_place = facade.get_place(place.id)
+        self.assertEqual(loaded_place.to_dict(), place.to_dict())
+        self.assertEqual(loaded_place.amenities, place.amenities)
+        self.assertIs(loaded_place.owner, facade.get_user(user.id))
+        self.assertEqual(facade.get_user_by_email(user.email).to_dict(), user.to_dict())
+        self.assertEqual([r.to_dict() for r in loaded_place.reviews], [review.to_dict()])
+        self.assertEqual(facade.get_review(review.id).created_at, review.created_at)
+        return facade
+
+    def test_reload_from_log(self):
+        facade = self.open_facade()
+        user, place, review = self.populate(facade)
+        facade.store.close()
+        self.assert_reloaded(user, place, review)
+
+    def test_reload_from_snapshot_and_log(self):
+        facade = self.open_facade()
+        user, place, review = self.populate(facade)
+        facade.store.snapshot()
+        facade.update_user(user.id, {'last_name': "Smith"})
+        facade.store.close()
+        reloaded = self.assert_reloaded(user, place, review)
+        self.assertEqual(reloaded.get_user(user.id).last_name, "Smith")
+
+    def test_torn_log_tail_is_ignored(self):
+        facade = self.open_facade()
+        user, place, review = self.populate(facade)
+        facade.store.close()
+        log_path = os.path.join(self.path, 'log.00000000')
+        size = os.path.getsize(log_path)
+        with open(log_path, 'ab') as f:
+            f.write(b'\x10\x00\x00\x00partial')
+        self.assert_reloaded(user, place, review)
+        self.assertEqual(os.path.getsize(log_path), size)
+
+
+if __name__ == "__main__":
+    unittest.main()
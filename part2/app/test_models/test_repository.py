@@ -0,0 +1,140 @@
+from app.persistence.repository import ConcurrentInMemoryRepository, InMemoryRepository
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.user import User
+import threading
+import unittest
+import uuid
+
+
+def make_user(**kwargs):
+    data = {'first_name': "John", 'last_name': "Doe", 'email': f"{uuid.uuid4()}@example.com"}
+    data.update(kwargs)
+    return User(**data)
+
+
+class TestInMemoryRepositoryIndexes(unittest.TestCase):
+    def test_unique_index_lookup(self):
+        repo = InMemoryRepository(unique_indexes=('email',))
+        user = make_user()
+        repo.add(user)
+        self.assertIs(repo.get_by_attribute('email', user.email), user)
+        self.assertIs(repo.get_by_attribute('id', user.id), user)
+        self.assertIsNone(repo.get_by_attribute('email', "nobody@example.com"))
+
+    def test_unique_index_rejects_duplicates(self):
+        repo = InMemoryRepository(unique_indexes=('name',))
+        repo.add(Amenity(name="Wi-Fi"))
+        with self.assertRaises(ValueError):
+            repo.add(Amenity(name="Wi-Fi"))
+
+    def test_index_follows_update_and_delete(self):
+        repo = InMemoryRepository(unique_indexes=('email',))
+        user = make_user()
+        repo.add(user)
+        old_email = user.email
+        new_email = f"{uuid.uuid4()}@example.com"
+        repo.update(user.id, {'email': new_email})
+        self.assertIsNone(repo.get_by_attribute('email', old_email))
+        self.assertIs(repo.get_by_attribute('email', new_email), user)
+        repo.delete(user.id)
+        self.assertIsNone(repo.get_by_attribute('email', new_email))
+
+    def test_non_unique_index(self):
+        repo = InMemoryRepository(indexes=('owner',))
+        owner = make_user()
+        places = [Place(title=f"Place {i}", price=100, latitude=10.0, longitude=20.0, owner=owner)
+                  for i in range(3)]
+        for place in places:
+            repo.add(place)
+        self.assertIs(repo.get_by_attribute('owner', owner), places[0])
+        self.assertEqual(repo.get_all_by_attribute('owner', owner), places)
+        repo.delete(places[0].id)
+        self.assertEqual(repo.get_all_by_attribute('owner', owner), places[1:])
+
+    def test_register_index_builds_from_existing_objects(self):
+        repo = InMemoryRepository()
+        user = make_user()
+        repo.add(user)
+        repo.register_index('email', unique=True)
+        self.assertIs(repo.get_by_attribute('email', user.email), user)
+
+    def test_exists_and_count(self):
+        repo = InMemoryRepository(unique_indexes=('email',), indexes=('last_name',))
+        users = [make_user(last_name="Doe"), make_user(last_name="Doe"), make_user(last_name="Roe")]
+        for user in users:
+            repo.add(user)
+        self.assertTrue(repo.exists(email=users[0].email))
+        self.assertFalse(repo.exists(email="nobody@example.com"))
+        self.assertTrue(repo.exists(first_name="John", last_name="Roe"))
+        self.assertEqual(repo.count(), 3)
+        self.assertEqual(repo.count(last_name="Doe"), 2)
+        self.assertEqual(repo.count(first_name="John"), 3)
+        self.assertEqual(repo.count(email=users[2].email, last_name="Doe"), 0)
+
+    def test_get_all_snapshot_is_shared_until_a_write(self):
+        repo = InMemoryRepository(unique_indexes=('email',))
+        first = make_user()
+        repo.add(first)
+        snapshot = repo.get_all()
+        self.assertEqual(snapshot, (first,))
+        self.assertIs(repo.get_all(), snapshot)
+        repo.update(first.id, {'last_name': "Smith"})
+        self.assertIs(repo.get_all(), snapshot)
+        second = make_user()
+        repo.add(second)
+        self.assertEqual(repo.get_all(), (first, second))
+        self.assertEqual(snapshot, (first,))
+        repo.delete(first.id)
+        self.assertEqual(repo.get_all(), (second,))
+
+    def test_range_query_follows_updates_and_deletes(self):
+        repo = InMemoryRepository(range_indexes=('price',))
+        owner = make_user()
+        places = [Place("Place", price, 10.0, 20.0, owner) for price in (50.0, 10.0, 30.0, 40.0, 20.0)]
+        for place in places:
+            repo.add(place)
+        prices = lambda objs: [place.price for place in objs]
+        self.assertEqual(prices(repo.range_query('price', 20.0, 40.0)), [20.0, 30.0, 40.0])
+        self.assertEqual(prices(repo.range_query('price', hi=30.0, limit=2)), [10.0, 20.0])
+        self.assertEqual(prices(repo.range_query('price', lo=20.0, limit=2, reverse=True)), [50.0, 40.0])
+        repo.update(places[0].id, {'price': 25.0})
+        repo.delete(places[1].id)
+        self.assertEqual(prices(repo.range_query('price')), [20.0, 25.0, 30.0, 40.0])
+        # Attributes without a range index fall back to a scan
+        self.assertEqual(len(repo.range_query('latitude', 10.0, 10.0)), 4)
+        self.assertEqual(repo.range_query('latitude', 11.0), [])
+
+
+class TestConcurrentInMemoryRepository(unittest.TestCase):
+    def run_threads(self, target, count=8):
+        threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_concurrent_adds_keep_indexes_consistent(self):
+        repo = ConcurrentInMemoryRepository(unique_indexes=('email',), indexes=('last_name',))
+        users = [[make_user(last_name=str(i % 3)) for _ in range(200)] for i in range(8)]
+        self.run_threads(lambda i: [repo.add(user) for user in users[i]])
+        self.assertEqual(repo.count(), 1600)
+        for user in users[0]:
+            self.assertIs(repo.get_by_attribute('email', user.email), user)
+            self.assertTrue(repo.exists(email=user.email))
+        self.assertEqual(sum(repo.count(last_name=str(i)) for i in range(3)), 1600)
+
+    def test_concurrent_updates_and_deletes(self):
+        repo = ConcurrentInMemoryRepository(indexes=('last_name',), stripes=4)
+        users = [make_user(last_name="0") for _ in range(50)]
+        for user in users:
+            repo.add(user)
+        self.run_threads(lambda i: [repo.update(user.id, {'last_name': str(i)}) for user in users])
+        self.assertEqual(sum(repo.count(last_name=str(i)) for i in range(8)), 50)
+        self.run_threads(lambda i: [repo.delete(user.id) for user in users])
+        self.assertEqual(repo.count(), 0)
+        self.assertEqual(sum(repo.count(last_name=str(i)) for i in range(8)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,12 @@ import os
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
+    # Directory of the on-disk log and snapshots of the in-memory store (disabled when None)
+    PERSISTENCE_PATH = os.getenv('HBNB_DATA_DIR')
+    # Seconds between two batched fsyncs of the log (0 = fsync every write)
+    PERSISTENCE_FSYNC_INTERVAL = 0.05
+    # Number of logged mutations after which a compacted snapshot is written
+    PERSISTENCE_SNAPSHOT_EVERY = 100_000
 
 class DevelopmentConfig(Config):
     DEBUG = True
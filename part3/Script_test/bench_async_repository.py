@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark côte à côte du chemin synchrone (HBnBFacade, un thread par requête
+en cours) et du chemin asynchrone (AsyncHBnBFacade, une seule boucle
+d'événements) pour une lecture de lieu par id.
+
+Le chemin synchrone dispose de NB_THREADS threads, comme un worker gthread ;
+le chemin asynchrone lance `concurrence` tâches sur une seule boucle. Le
+paramètre `latence_ms` ajoute à chaque opération une attente simulant
+l'aller-retour réseau d'une base distante (MySQL...) : c'est là que l'async
+sert plus de requêtes en parallèle par worker, alors qu'avec SQLite en local
+(latence 0) le coût de l'async (thread aiosqlite, boucle) domine.
+Le moteur async utilise ici un pool de connexions, possible parce que la boucle
+vit tout le benchmark (comme sous un serveur ASGI) ; la configuration par défaut
+de l'application ouvre une connexion par session (voir config.py).
+
+Exécuter depuis le dossier part3 avec :
+    python3 Script_test/bench_async_repository.py [concurrence] [latence_ms]
+La base utilisée est un fichier SQLite temporaire, supprimé à la fin.
+"""
+import asyncio
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from config import TUNED_ENGINE_OPTIONS, DevelopmentConfig
+
+NB_PLACES = 1_000
+NB_THREADS = 8
+OPS_PER_CLIENT = 50
+
+
+def report(label, ops, elapsed):
+    print(f"{label:<8} {ops / elapsed:10.0f} ops/s   ({elapsed:.2f} s)")
+
+
+def run_sync(app, facade, db, place_ids, concurrency, latency):
+    def client(seed):
+        rng = random.Random(seed)
+        with app.app_context():
+            for _ in range(OPS_PER_CLIENT):
+                facade.get_place(rng.choice(place_ids)).to_dict()
+                if latency:
+                    time.sleep(latency)
+            db.session.remove()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(NB_THREADS) as pool:
+        list(pool.map(client, range(concurrency)))
+    report('sync', concurrency * OPS_PER_CLIENT, time.perf_counter() - start)
+
+
+async def run_async(async_facade, async_db, place_ids, concurrency, latency):
+    async def client(seed):
+        rng = random.Random(seed)
+        for _ in range(OPS_PER_CLIENT):
+            (await async_facade.get_place(rng.choice(place_ids))).to_dict()
+            if latency:
+                await asyncio.sleep(latency)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(seed) for seed in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    # Ferme les connexions du pool (et leurs threads aiosqlite) avant la fin de la boucle
+    await async_db.dispose()
+    report('async', concurrency * OPS_PER_CLIENT, elapsed)
+
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.0
+    directory = tempfile.mkdtemp()
+
+    class BenchConfig(DevelopmentConfig):
+        DEBUG = False
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(directory, 'bench.db')
+        ASYNC_ENGINE_OPTIONS = {'poolclass': AsyncAdaptedQueuePool, **TUNED_ENGINE_OPTIONS}
+
+    from app import create_app
+    from app.extensions import async_db, db
+    from app.services import async_facade, facade
+
+    app = create_app(BenchConfig)
+    try:
+        with app.app_context():
+            owner = facade.create_user({'first_name': 'Bench', 'last_name': 'Owner',
+                                        'email': 'bench@example.com', 'password': 'bench'})
+            place_ids = facade.bulk_create_places([
+                {'title': f'Place {i}', 'price': 10.0 + i, 'latitude': 1.0, 'longitude': 2.0,
+                 'owner_id': owner.id} for i in range(NB_PLACES)])
+        print(f"{concurrency} clients x {OPS_PER_CLIENT} lectures, latence simulée {latency * 1000:.1f} ms, "
+              f"{NB_THREADS} threads pour le chemin sync")
+        run_sync(app, facade, db, place_ids, concurrency, latency)
+        asyncio.run(run_async(async_facade, async_db, place_ids, concurrency, latency))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'insertion en masse (facade.bulk_create_places) comparée à
+l'insertion unitaire (facade.create_place, un commit par lieu).
+
+Exécuter depuis le dossier part3 avec : python3 Script_test/bench_bulk_insert.py [nb_lieux]
+La base utilisée est un fichier SQLite temporaire, supprimé à la fin.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.services import facade
+from config import TestingConfig
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    sample = min(count, 1_000)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp, 'bench.db')
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            owners = facade.bulk_create_users([
+                {'first_name': 'Owner', 'last_name': str(i), 'email': f'owner{i}@bench.com', 'password': 'x'}
+                for i in range(10)
+            ])
+            amenity = facade.create_amenity({'name': 'Wi-Fi'})
+
+            def place_data(i):
+                return {
+                    'title': f'Place {i}',
+                    'price': 50 + i % 200,
+                    'latitude': -60.0 + (i % 12000) / 100,
+                    'longitude': -170.0 + (i % 34000) / 100,
+                    'owner_id': owners[i % len(owners)],
+                    'amenities': [amenity.id] if i % 2 else [],
+                }
+
+            start = time.perf_counter()
+            for i in range(sample):
+                facade.create_place(place_data(i))
+            unit = (time.perf_counter() - start) / sample
+
+            data = [place_data(i) for i in range(count)]
+            start = time.perf_counter()
+            facade.bulk_create_places(data)
+            bulk = time.perf_counter() - start
+
+        print(f"create_place      : {unit * 1e6:8.1f} µs/lieu (mesuré sur {sample} lieux)"
+              f" -> {unit * count:.1f}s estimées pour {count}")
+        print(f"bulk_create_places: {bulk / count * 1e6:8.1f} µs/lieu -> {bulk:.1f}s pour {count}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark du débit d'insertion selon le générateur d'ids : UUID v4
+(aléatoires) contre UUID v7 (croissants dans le temps, générateur par défaut).
+
+Insère nb_avis lignes dans une table d'avis (id UUIDBinary en clé primaire,
+comme reviews) par transactions de BATCH_SIZE lignes, et affiche le débit au
+fil du remplissage. Le cache de pages SQLite est volontairement réduit
+(CACHE_SIZE_KB) pour reproduire une table plus grande que la mémoire : avec
+des ids aléatoires chaque insertion touche une page d'index au hasard, avec
+des ids v7 elles se font toutes en fin d'index. Affiche aussi la taille de
+l'index de clé primaire et son taux de remplissage (table dbstat).
+
+Exécuter depuis le dossier part3 avec : python3 Script_test/bench_id_generator.py [nb_avis]
+Les bases sont des fichiers temporaires, supprimés à la fin.
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, event, insert, text
+
+from app.models.ids import uuid4_id, uuid7_id
+from app.models.types import UUIDBinary
+
+NB_REVIEWS = 1_000_000
+BATCH_SIZE = 5_000
+REPORT_EVERY = 200_000
+CACHE_SIZE_KB = 2_000
+
+
+def run(label, generator, path, nb_reviews):
+    metadata = MetaData()
+    reviews = Table('reviews', metadata,
+                    Column('id', UUIDBinary(), primary_key=True),
+                    Column('rating', Integer, nullable=False),
+                    Column('text', String(200), nullable=False))
+    engine = create_engine('sqlite:///' + path)
+
+    @event.listens_for(engine, 'connect')
+    def small_page_cache(dbapi_connection, connection_record):
+        dbapi_connection.execute(f'PRAGMA cache_size=-{CACHE_SIZE_KB}')
+
+    metadata.create_all(engine)
+    rng = random.Random(42)
+    print(f"\n== {label}")
+    total_start = start = time.perf_counter()
+    for done in range(0, nb_reviews, BATCH_SIZE):
+        rows = [{'id': generator(), 'rating': rng.randint(1, 5), 'text': 'Great stay'}
+                for _ in range(min(BATCH_SIZE, nb_reviews - done))]
+        with engine.begin() as conn:
+            conn.execute(insert(reviews), rows)
+        inserted = done + len(rows)
+        if inserted % REPORT_EVERY == 0:
+            print(f"{inserted:>9} lignes   {REPORT_EVERY / (time.perf_counter() - start):10.0f} lignes/s")
+            start = time.perf_counter()
+    total = time.perf_counter() - total_start
+    with engine.connect() as conn:
+        pages, size, unused = conn.execute(text(
+            "SELECT COUNT(*), SUM(pgsize), SUM(unused) FROM dbstat WHERE name = 'sqlite_autoindex_reviews_1'")).one()
+    print(f"total {total:.1f} s, {nb_reviews / total:.0f} lignes/s ; index de clé primaire : {pages} pages, "
+          f"{size / 2**20:.1f} Mo, remplissage {100 * (1 - unused / size):.0f} %")
+    engine.dispose()
+
+
+def main():
+    nb_reviews = int(sys.argv[1]) if len(sys.argv) > 1 else NB_REVIEWS
+    print(f"{nb_reviews} avis par lots de {BATCH_SIZE}, cache SQLite de {CACHE_SIZE_KB} Ko")
+    directory = tempfile.mkdtemp()
+    try:
+        run("UUID v4 (aléatoires)", uuid4_id, os.path.join(directory, 'v4.db'), nb_reviews)
+        run("UUID v7 (croissants)", uuid7_id, os.path.join(directory, 'v7.db'), nb_reviews)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
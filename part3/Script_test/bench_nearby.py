@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la recherche de proximité (GET /api/v1/places/nearby).
+
+Remplit une base SQLite fichier avec nb_lieux lieux répartis au hasard sur un
+rectangle de la taille de la France (geohash calculé comme par les
+validateurs), puis compare pour NB_SEARCHES centres tirés au hasard :
+
+- sans index : lieux du rectangle englobant le cercle, latitude et longitude
+  non indexées, soit un parcours de toute la table ;
+- geohash : intervalles de l'index de geohash des cellules qui couvrent le
+  cercle (PlaceRepository.nearby_candidates) ;
+- facade : `facade.get_places_nearby` complet (candidats, distance exacte,
+  tri et chargement des lieux les plus proches avec le profil 'list').
+
+Exécuter depuis le dossier part3 avec : python3 Script_test/bench_nearby.py [nb_lieux]
+La base est un fichier temporaire, supprimé à la fin.
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, select
+
+from config import TestingConfig
+
+NB_PLACES = 1_000_000
+NB_SEARCHES = 200
+RADII_KM = (1, 5, 20)
+LIMIT = 50
+BATCH_SIZE = 20_000
+# Latitudes et longitudes de la zone peuplée
+AREA = (42.5, 51.0, -4.5, 8.0)
+
+
+def main():
+    nb_places = int(sys.argv[1]) if len(sys.argv) > 1 else NB_PLACES
+    directory = tempfile.mkdtemp()
+
+    class BenchConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(directory, 'nearby.db')
+
+    from app import create_app
+    from app.extensions import db
+    from app.models.geohash import bounding_box, haversine_km
+    from app.models.ids import new_id
+    from app.models.place import Place
+    from app.services import facade
+    from app.services.repositories.place_repository import nearby_candidates
+
+    rng = random.Random(42)
+    south, north, west, east = AREA
+    try:
+        app = create_app(BenchConfig)
+        with app.app_context():
+            owner_id, = facade.user_repo.add_rows([{'first_name': 'Bench', 'last_name': 'Owner',
+                                                   'email': 'owner@example.com', 'password': 'x'}])
+            db.session.commit()
+            validate = facade.place_repo.validate_values
+            start = time.perf_counter()
+            for done in range(0, nb_places, BATCH_SIZE):
+                rows = []
+                for i in range(done, min(done + BATCH_SIZE, nb_places)):
+                    row = validate({'latitude': rng.uniform(south, north), 'longitude': rng.uniform(west, east)})
+                    row.update(id=new_id(), title=f'Place {i}', price=50.0, owner_id=owner_id,
+                               review_count=0, rating_sum=0.0, rating_avg=0.0)
+                    rows.append(row)
+                db.session.execute(insert(Place.__table__), rows)
+                db.session.commit()
+            print(f"{nb_places} lieux insérés en {time.perf_counter() - start:.1f} s, "
+                  f"{NB_SEARCHES} recherches par rayon, {LIMIT} résultats au plus")
+
+            centers = [(rng.uniform(south, north), rng.uniform(west, east)) for _ in range(NB_SEARCHES)]
+
+            def scan_candidates(latitude, longitude, radius_km):
+                box_south, box_north, box_west, box_east = bounding_box(latitude, longitude, radius_km)
+                return select(Place.id, Place.latitude, Place.longitude).where(
+                    Place.latitude.between(box_south, box_north), Place.longitude.between(box_west, box_east))
+
+            def timed(search, radius_km, searches):
+                start = time.perf_counter()
+                found = [search(latitude, longitude, radius_km) for latitude, longitude in searches]
+                return (time.perf_counter() - start) * 1000 / len(searches), found
+
+            def within(statement, latitude, longitude, radius_km):
+                return sorted(place_id for place_id, place_latitude, place_longitude in db.session.execute(statement)
+                              if haversine_km(latitude, longitude, place_latitude, place_longitude) <= radius_km)
+
+            print(f"\n{'rayon':>8}{'candidats':>11}{'sans index':>14}{'geohash':>12}{'facade':>12}")
+            for radius_km in RADII_KM:
+                # Le parcours complet est lent : quelques recherches suffisent pour le mesurer
+                scan_time, scanned = timed(lambda la, lo, r: within(scan_candidates(la, lo, r), la, lo, r),
+                                           radius_km, centers[:10])
+                index_time, indexed = timed(lambda la, lo, r: within(nearby_candidates(la, lo, r), la, lo, r),
+                                            radius_km, centers)
+                assert indexed[:10] == scanned
+                candidates = sum(len(db.session.execute(nearby_candidates(la, lo, radius_km)).all())
+                                 for la, lo in centers) / len(centers)
+                db.session.expunge_all()
+                facade_time, _ = timed(lambda la, lo, r: facade.get_places_nearby(la, lo, r, LIMIT),
+                                       radius_km, centers)
+                db.session.expunge_all()
+                print(f"{radius_km:>5} km{candidates:>11.0f}{scan_time:>11.1f} ms{index_time:>9.2f} ms"
+                      f"{facade_time:>9.2f} ms")
+            db.session.remove()
+        with app.app_context():
+            db.engine.dispose()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark des lectures les plus fréquentes (connexion, inscription) :
+recherche par email, get par id, test d'existence d'un email.
+
+Pour chacune, compare la requête reconstruite à chaque appel (Query legacy
+`User.query...`, ou `select()` construit à la volée) à la requête préparée une
+fois par le repository (`SQLAlchemyRepository.prepared`, valeurs en `bindparam`).
+Affiche le coût moyen par appel et les résultats du cache de compilation SQL
+du moteur (`hit` : SQL compilé réutilisé, `miss` : compilation).
+
+La session est vidée après chaque appel : chaque get fait donc bien sa requête
+SQL au lieu d'être servi par la carte d'identité de la session.
+
+Exécuter depuis le dossier part3 avec : python3 Script_test/bench_prepared_statements.py [nb_appels]
+La base utilisée est SQLite en mémoire.
+"""
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, literal, select
+from sqlalchemy.engine.interfaces import CacheStats
+
+from config import TestingConfig
+
+NB_CALLS = 5_000
+NB_USERS = 1_000
+
+
+def main():
+    nb_calls = int(sys.argv[1]) if len(sys.argv) > 1 else NB_CALLS
+
+    from app import create_app
+    from app.extensions import db
+    from app.models.user import User
+    from app.services import facade
+
+    app = create_app(TestingConfig)
+    with app.app_context():
+        facade.user_repo.add_rows([{'first_name': 'Bench', 'last_name': f'User {i}',
+                                    'email': f'bench{i}@example.com', 'password': 'x'}
+                                   for i in range(NB_USERS)])
+        users = [(user.id, user.email) for user in facade.get_users()]
+        db.session.expunge_all()
+
+        cache_results = Counter()
+
+        @event.listens_for(db.engine, 'after_cursor_execute')
+        def count_cache_result(conn, cursor, statement, parameters, context, executemany):
+            if context.cache_hit is CacheStats.CACHE_HIT:
+                cache_results['hit'] += 1
+            else:
+                cache_results['miss'] += 1
+
+        def run(label, lookup):
+            cache_results.clear()
+            start = time.perf_counter()
+            for i in range(nb_calls):
+                lookup(*users[i % len(users)])
+                db.session.expunge_all()
+            elapsed = time.perf_counter() - start
+            print(f"{label:<46} {elapsed * 1e6 / nb_calls:8.1f} µs/appel   "
+                  f"cache de compilation : {cache_results['hit']} hit / {cache_results['miss']} miss")
+
+        print(f"{nb_calls} appels par méthode, {NB_USERS} utilisateurs")
+        run("email : User.query.filter_by().first()",
+            lambda user_id, email: User.query.filter_by(email=email).first())
+        run("email : select() construit à chaque appel",
+            lambda user_id, email: db.session.scalars(
+                select(User).where(User.email == email).limit(1)).first())
+        run("email : get_user_by_email (préparée)",
+            lambda user_id, email: facade.user_repo.get_user_by_email(email))
+        run("id : User.query.get()",
+            lambda user_id, email: User.query.get(user_id))
+        run("id : db.session.get()",
+            lambda user_id, email: db.session.get(User, user_id))
+        run("id : repository.get (préparée)",
+            lambda user_id, email: facade.user_repo.get(user_id))
+        run("existence : select() construit à chaque appel",
+            lambda user_id, email: db.session.execute(
+                select(literal(1)).select_from(User).filter_by(email=email).limit(1)).first())
+        run("existence : repository.exists (préparée)",
+            lambda user_id, email: facade.email_exists(email))
+
+        assert facade.user_repo.get_user_by_email(users[0][1]).id == users[0][0]
+
+
+if __name__ == '__main__':
+    main()
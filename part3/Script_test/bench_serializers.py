@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la sérialisation des réponses : `to_dict()` + json.dumps
+(représentation d'origine de Flask-RESTX) contre les fonctions générées de
+app/models/serializers.py + orjson (app/api/representations.py).
+
+Charge nb_lieux lieux avec leurs amenities (profil et jeu de champs 'list',
+comme la liste des lieux), puis mesure séparément, sur les mêmes objets déjà en
+mémoire : la construction des dicts, l'encodage JSON, et les deux enchaînés
+(coût CPU d'une réponse hors accès à la base). Chaque mesure est la meilleure
+de NB_ROUNDS répétitions.
+
+Exécuter depuis le dossier part3 avec : python3 Script_test/bench_serializers.py [nb_lieux]
+La base utilisée est SQLite en mémoire.
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orjson
+from sqlalchemy import insert
+
+from config import TestingConfig
+
+NB_PLACES = 2_000
+AMENITIES_PER_PLACE = 3
+NB_ROUNDS = 5
+
+
+def best_of(function):
+    """Meilleur temps (en secondes) de NB_ROUNDS appels, et le résultat du dernier"""
+    best = float('inf')
+    for _ in range(NB_ROUNDS):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    nb_places = int(sys.argv[1]) if len(sys.argv) > 1 else NB_PLACES
+
+    from app import create_app
+    from app.extensions import db
+    from app.models.place_amenity import place_amenity
+    from app.models.serializers import serialize_all
+    from app.services import facade
+
+    app = create_app(TestingConfig)
+    with app.app_context():
+        owner_id, = facade.user_repo.add_rows([
+            {'first_name': 'Bench', 'last_name': 'owner', 'email': 'owner@example.com', 'password': 'x'}])
+        amenity_ids = facade.amenity_repo.add_rows([{'name': f'Amenity {i}'} for i in range(20)])
+        place_ids = facade.place_repo.add_rows([
+            {'title': f'Place {i}', 'description': 'A nice place to stay', 'price': 50.0 + i % 200,
+             'latitude': 45.0, 'longitude': 3.0, 'owner_id': owner_id,
+             'review_count': 5, 'rating_sum': 20.0, 'rating_avg': 4.0}
+            for i in range(nb_places)])
+        db.session.execute(insert(place_amenity), [
+            {'place_id': place_id, 'amenity_id': amenity_ids[(i + j) % len(amenity_ids)]}
+            for i, place_id in enumerate(place_ids) for j in range(AMENITIES_PER_PLACE)])
+        db.session.commit()
+
+        places = facade.place_repo.get_all(profile='list')
+        print(f"{len(places)} lieux, {AMENITIES_PER_PLACE} amenities par lieu, "
+              f"meilleur de {NB_ROUNDS}")
+
+        dict_time, dicts = best_of(lambda: [place.to_dict(include_reviews=False) for place in places])
+        generated_time, generated = best_of(lambda: serialize_all(places, 'list'))
+        assert generated == dicts
+        json_time, body = best_of(lambda: json.dumps(dicts) + "\n")
+        orjson_time, fast_body = best_of(lambda: orjson.dumps(generated, option=orjson.OPT_APPEND_NEWLINE))
+        assert orjson.loads(fast_body) == json.loads(body)
+        before, _ = best_of(lambda: json.dumps([place.to_dict(include_reviews=False) for place in places]) + "\n")
+        after, _ = best_of(lambda: orjson.dumps(serialize_all(places, 'list'), option=orjson.OPT_APPEND_NEWLINE))
+
+        print(f"\n{'':<24}{'avant':>12}{'après':>12}{'gain':>8}")
+        for label, old, new in (("dicts", dict_time, generated_time),
+                                ("encodage JSON", json_time, orjson_time),
+                                ("réponse complète", before, after)):
+            print(f"{label:<24}{old * 1000:>9.1f} ms{new * 1000:>9.1f} ms{old / new:>7.1f}x")
+        print(f"\nréponse de {len(fast_body) / 2**20:.1f} Mo : {before * 1e6 / len(places):.1f} -> "
+              f"{after * 1e6 / len(places):.1f} µs par lieu")
+
+
+if __name__ == '__main__':
+    main()
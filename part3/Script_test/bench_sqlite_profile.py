@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark du profil SQLite (config.SQLITE_TUNED_PRAGMAS) : débit en lecture et
+en écriture avec plusieurs clients en parallèle, avant (PRAGMA par défaut) et
+après (WAL, synchronous=NORMAL, mmap...).
+
+Chaque client est un processus séparé avec son propre moteur, comme un worker
+Gunicorn : la moitié insère des lignes (un commit par insertion), l'autre
+moitié lit des lignes au hasard.
+
+Exécuter depuis le dossier part3 avec : python3 Script_test/bench_sqlite_profile.py [nb_clients] [durée_s]
+La base utilisée est un fichier SQLite temporaire, supprimé à la fin.
+"""
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.persistence.engine import apply_sqlite_pragmas
+from config import SQLITE_TUNED_PRAGMAS, TUNED_ENGINE_OPTIONS
+
+SEED_ROWS = 10_000
+
+
+def make_engine(path, pragmas, engine_options):
+    engine = create_engine('sqlite:///' + path, **engine_options)
+    apply_sqlite_pragmas(engine, pragmas)
+    return engine
+
+
+def client(path, pragmas, engine_options, writer, duration, results):
+    engine = make_engine(path, pragmas, engine_options)
+    ops = errors = 0
+    deadline = time.perf_counter() + duration
+    with engine.connect() as conn:
+        while time.perf_counter() < deadline:
+            try:
+                if writer:
+                    conn.execute(text("INSERT INTO places (title, price) VALUES (:t, :p)"),
+                                 {'t': 'bench', 'p': random.randint(10, 500)})
+                else:
+                    conn.execute(text("SELECT title, price FROM places WHERE id = :id"),
+                                 {'id': random.randint(1, SEED_ROWS)}).fetchone()
+                conn.commit()
+                ops += 1
+            except OperationalError:
+                # `database is locked` : l'opération est perdue pour le client
+                conn.rollback()
+                errors += 1
+    engine.dispose()
+    results.put((writer, ops, errors))
+
+
+def run(label, pragmas, engine_options, clients, duration):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        engine = make_engine(path, pragmas, engine_options)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE places (id INTEGER PRIMARY KEY, title TEXT, price INTEGER)"))
+            conn.execute(text("INSERT INTO places (title, price) VALUES (:t, :p)"),
+                         [{'t': f'Place {i}', 'p': i % 500} for i in range(SEED_ROWS)])
+        engine.dispose()
+
+        results = multiprocessing.Queue()
+        procs = [multiprocessing.Process(target=client,
+                                         args=(path, pragmas, engine_options, i % 2 == 0, duration, results))
+                 for i in range(clients)]
+        for proc in procs:
+            proc.start()
+        totals = {True: [0, 0], False: [0, 0]}
+        for _ in procs:
+            writer, ops, errors = results.get()
+            totals[writer][0] += ops
+            totals[writer][1] += errors
+        for proc in procs:
+            proc.join()
+
+    print(f"{label:<22} écritures: {totals[True][0] / duration:9.0f} ops/s ({totals[True][1]} erreurs)"
+          f" | lectures: {totals[False][0] / duration:9.0f} ops/s ({totals[False][1]} erreurs)")
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    print(f"{clients} clients ({clients - clients // 2} écrivains), {duration}s par profil")
+    run('PRAGMA par défaut', {}, {}, clients, duration)
+    run('SQLITE_TUNED_PRAGMAS', SQLITE_TUNED_PRAGMAS, TUNED_ENGINE_OPTIONS, clients, duration)
+
+
+if __name__ == '__main__':
+    main()
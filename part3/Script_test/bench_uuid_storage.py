@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark du stockage des ids : UUID texte (VARCHAR(36), format d'origine)
+contre UUID binaire (UUIDBinary, 16 octets).
+
+Construit deux bases SQLite identiques à l'exception du type des ids : une
+table de lieux (nb_avis / 10 lignes) et une table d'avis (nb_avis lignes) avec
+clé primaire, clé étrangère indexée vers le lieu, comme places / reviews.
+Compare la taille de la table et de chaque index (table virtuelle dbstat),
+le temps d'insertion, une jointure avis -> lieux sur toute la table et des
+lectures par clé primaire.
+
+Exécuter depuis le dossier part3 avec : python3 Script_test/bench_uuid_storage.py [nb_avis]
+Les bases sont des fichiers temporaires, supprimés à la fin.
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import (Column, Float, ForeignKey, Integer, MetaData, String, Table, bindparam, create_engine,
+                        func, insert, select, text)
+
+from app.models.types import UUIDBinary
+
+NB_REVIEWS = 1_000_000
+NB_LOOKUPS = 20_000
+BATCH_SIZE = 10_000
+
+
+def build_tables(id_type):
+    metadata = MetaData()
+    places = Table('places', metadata,
+                   Column('id', id_type, primary_key=True),
+                   Column('price', Float, nullable=False))
+    reviews = Table('reviews', metadata,
+                    Column('id', id_type, primary_key=True),
+                    Column('rating', Integer, nullable=False),
+                    Column('place_id', id_type, ForeignKey('places.id'), nullable=False, index=True))
+    return metadata, places, reviews
+
+
+def run(label, id_type, path, place_ids, review_rows, lookups):
+    metadata, places, reviews = build_tables(id_type)
+    engine = create_engine('sqlite:///' + path)
+    metadata.create_all(engine)
+    print(f"\n== {label}")
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        for i in range(0, len(place_ids), BATCH_SIZE):
+            conn.execute(insert(places), [{'id': place_id, 'price': float(j % 500)}
+                                          for j, place_id in enumerate(place_ids[i:i + BATCH_SIZE], i)])
+        for i in range(0, len(review_rows), BATCH_SIZE):
+            conn.execute(insert(reviews), review_rows[i:i + BATCH_SIZE])
+    print(f"insertion                  {time.perf_counter() - start:8.2f} s")
+
+    with engine.connect() as conn:
+        conn.execute(text('VACUUM'))
+        sizes = conn.execute(text(
+            "SELECT name, SUM(pgsize) FROM dbstat WHERE name LIKE '%reviews%' GROUP BY name ORDER BY name")).all()
+        for name, size in sizes:
+            print(f"{name:<26} {size / 2**20:8.1f} Mo")
+        print(f"{'fichier':<26} {os.path.getsize(path) / 2**20:8.1f} Mo")
+
+        join = (select(func.count(), func.avg(reviews.c.rating))
+                .select_from(reviews.join(places, reviews.c.place_id == places.c.id))
+                .where(places.c.price < 250))
+        start = time.perf_counter()
+        conn.execute(join).one()
+        print(f"jointure avis -> lieux     {time.perf_counter() - start:8.2f} s")
+
+        # Requête préparée avec bindparam, comme SQLAlchemyRepository.get
+        by_id = select(reviews.c.rating).where(reviews.c.id == bindparam('value'))
+        start = time.perf_counter()
+        for review_id in lookups:
+            conn.execute(by_id, {'value': review_id}).one()
+        elapsed = time.perf_counter() - start
+        print(f"lecture par id             {elapsed * 1e6 / len(lookups):8.1f} µs")
+    engine.dispose()
+
+
+def main():
+    nb_reviews = int(sys.argv[1]) if len(sys.argv) > 1 else NB_REVIEWS
+    rng = random.Random(42)
+    place_ids = [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(max(1, nb_reviews // 10))]
+    review_rows = [{'id': str(uuid.UUID(int=rng.getrandbits(128), version=4)), 'rating': rng.randint(1, 5),
+                    'place_id': rng.choice(place_ids)} for _ in range(nb_reviews)]
+    lookups = [row['id'] for row in rng.sample(review_rows, min(NB_LOOKUPS, nb_reviews))]
+    print(f"{nb_reviews} avis, {len(place_ids)} lieux")
+
+    directory = tempfile.mkdtemp()
+    try:
+        run("ids VARCHAR(36)", String(36), os.path.join(directory, 'text.db'), place_ids, review_rows, lookups)
+        run("ids UUIDBinary (16 octets)", UUIDBinary(), os.path.join(directory, 'binary.db'),
+            place_ids, review_rows, lookups)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
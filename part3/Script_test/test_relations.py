@@ -261,7 +261,7 @@ def test_user_place_relation():
     
     # Vérifier que User1 a bien 2 places
     print_test("Vérification que l'utilisateur possède plusieurs places")
-    all_places = requests.get(f"{BASE_URL}/places/").json()
+    all_places = requests.get(f"{BASE_URL}/places/").json()['items']
     user1_places = [p for p in all_places if p.get('owner_id') == test_data['user1_id']]
     
     if len(user1_places) >= 2:
@@ -414,7 +414,7 @@ def test_user_review_relation():
     
     # Vérifier qu'un user a plusieurs reviews
     print_test("Vérification qu'un utilisateur peut avoir plusieurs reviews")
-    all_reviews = requests.get(f"{BASE_URL}/reviews/").json()
+    all_reviews = requests.get(f"{BASE_URL}/reviews/").json()['items']
     user2_reviews = [r for r in all_reviews if r.get('user_id') == test_data['user2_id']]
     
     if len(user2_reviews) >= 1:
@@ -632,23 +632,23 @@ def test_get_all_entities():
     try:
         # Users
         response = requests.get(f"{BASE_URL}/users/")
-        if response.status_code == 200 and len(response.json()) >= 2:
-            print_success(f"Liste des users récupérée ({len(response.json())} users)")
+        if response.status_code == 200 and len(response.json()['items']) >= 2:
+            print_success(f"Liste des users récupérée ({len(response.json()['items'])} users)")
         
         # Places
         response = requests.get(f"{BASE_URL}/places/")
-        if response.status_code == 200 and len(response.json()) >= 1:
-            print_success(f"Liste des places récupérée ({len(response.json())} places)")
+        if response.status_code == 200 and len(response.json()['items']) >= 1:
+            print_success(f"Liste des places récupérée ({len(response.json()['items'])} places)")
         
         # Reviews
         response = requests.get(f"{BASE_URL}/reviews/")
-        if response.status_code == 200 and len(response.json()) >= 1:
-            print_success(f"Liste des reviews récupérée ({len(response.json())} reviews)")
+        if response.status_code == 200 and len(response.json()['items']) >= 1:
+            print_success(f"Liste des reviews récupérée ({len(response.json()['items'])} reviews)")
         
         # Amenities
         response = requests.get(f"{BASE_URL}/amenities/")
-        if response.status_code == 200 and len(response.json()) >= 1:
-            print_success(f"Liste des amenities récupérée ({len(response.json())} amenities)")
+        if response.status_code == 200 and len(response.json()['items']) >= 1:
+            print_success(f"Liste des amenities récupérée ({len(response.json()['items'])} amenities)")
         
         return True
         
@@ -1,44 +1,115 @@
-from flask import Flask
-from flask_restx import Api
-from app.extensions import bcrypt, db, jwt
-from app.api.v1.users import users_api as users_ns
-from app.api.v1.amenities import api as amenities_ns
-from app.api.v1.places import api as places_ns
-from app.api.v1.reviews import api as reviews_ns
-from app.api.v1.auth import api as auth_ns
-from app.api.v1.protected import api as protected_ns
-from app.api.v1.users import admin_api as admin_ns
-
-
-# Module d'initialisation de l'application Flask
-# Ce fichier crée l'application, initialise les extensions (bcrypt, jwt, db)
-# et enregistre les différents namespaces de l'API (users, amenities, places, reviews, auth, protected, admin)
-
-
-def create_app(config_class="config.DevelopmentConfig"):
-    app = Flask(__name__)
-    app.config.from_object(config_class)
-    
-    # Initialisation des extensions : chiffrement, gestion JWT et base de données
-    bcrypt.init_app(app)
-    jwt.init_app(app)
-    db.init_app(app)
-
-    # Création de l'objet Api de Flask-RESTX (génère la doc Swagger)
-    api = Api(app, version='1.0', title='HBnB API',
-              description='HBnB Application API')
-
-    # Enregistrement des namespaces (groupes de routes) exposés par l'API
-    api.add_namespace(users_ns, path='/api/v1/users')
-    api.add_namespace(amenities_ns, path='/api/v1/amenities')
-    api.add_namespace(places_ns, path='/api/v1/places')
-    api.add_namespace(reviews_ns, path='/api/v1/reviews')
-    api.add_namespace(auth_ns, path='/api/v1/auth')
-    api.add_namespace(protected_ns, path='/api/v1/protected')
-    api.add_namespace(admin_ns, path='/api/v1/admin')
-
-    # Création automatique des tables si elles n'existent pas (exécuté dans le contexte de l'application)
-    with app.app_context():
-        db.create_all()
-
+from flask import Flask, jsonify, request
+from flask_restx import Api
+from app.api.representations import output_json
+from app.extensions import async_db, bcrypt, db, jwt
+from app.models.ids import set_id_generator
+from app.models.serializers import compile_serializers
+from app.persistence.repository import begin_unit_of_work, end_unit_of_work, in_unit_of_work
+from app.persistence.engine import apply_sqlite_pragmas
+from app.persistence.routing import REPLICA_READS_KEY, configure_read_replicas
+from app.persistence.strict_loading import STRICT_LOADING_KEY
+from app.services import facade
+from app.api.v1.users import users_api as users_ns
+from app.api.v1.amenities import api as amenities_ns
+from app.api.v1.places import api as places_ns
+from app.api.v1.reviews import api as reviews_ns
+from app.api.v1.auth import api as auth_ns
+from app.api.v1.protected import api as protected_ns
+from app.api.v1.users import admin_api as admin_ns
+from app.api.v1 import admin  # routes d'administration enregistrées sur le namespace admin
+
+
+# Module d'initialisation de l'application Flask
+# Ce fichier crée l'application, initialise les extensions (bcrypt, jwt, db)
+# et enregistre les différents namespaces de l'API (users, amenities, places, reviews, auth, protected, admin)
+
+
+def create_app(config_class="config.DevelopmentConfig"):
+    app = Flask(__name__)
+    app.config.from_object(config_class)
+    
+    # Initialisation des extensions : chiffrement, gestion JWT et base de données
+    bcrypt.init_app(app)
+    jwt.init_app(app)
+    db.init_app(app)
+    # Moteur asynchrone de la même base, créé à la première utilisation (voir app/persistence/engine.py)
+    async_db.init_app(app)
+
+    # Création de l'objet Api de Flask-RESTX (génère la doc Swagger)
+    api = Api(app, version='1.0', title='HBnB API',
+              description='HBnB Application API')
+    # Corps des réponses JSON encodé par orjson (voir app/api/representations.py)
+    api.representation('application/json')(output_json)
+
+    # Enregistrement des namespaces (groupes de routes) exposés par l'API
+    api.add_namespace(users_ns, path='/api/v1/users')
+    api.add_namespace(amenities_ns, path='/api/v1/amenities')
+    api.add_namespace(places_ns, path='/api/v1/places')
+    api.add_namespace(reviews_ns, path='/api/v1/reviews')
+    api.add_namespace(auth_ns, path='/api/v1/auth')
+    api.add_namespace(protected_ns, path='/api/v1/protected')
+    api.add_namespace(admin_ns, path='/api/v1/admin')
+
+    # Fonctions de sérialisation des modèles générées depuis leur mapper (voir app/models/serializers.py)
+    compile_serializers()
+
+    # Générateur des ids des nouveaux objets (voir app/models/ids.py)
+    set_id_generator(app.config.get('ID_GENERATOR', 'uuid7'))
+
+    # Cache d'identité des repositories (voir IDENTITY_CACHE dans config.py)
+    facade.configure_identity_cache(app.config.get('IDENTITY_CACHE', {}))
+    # Cache de résultats des lectures fréquentes, invalidé par table (voir QUERY_CACHE dans config.py)
+    facade.configure_query_cache(app.config.get('QUERY_CACHE', {}))
+
+    # Unité de travail par requête : toutes les écritures d'une requête sont committées
+    # en une seule fois après la vue (un seul fsync), ou annulées si la réponse est une erreur
+    if app.config.get('UNIT_OF_WORK_PER_REQUEST', True):
+        @app.before_request
+        def open_unit_of_work():
+            begin_unit_of_work()
+
+        @app.after_request
+        def close_unit_of_work(response):
+            if not in_unit_of_work():
+                return response
+            try:
+                end_unit_of_work(success=response.status_code < 400)
+            except Exception as e:
+                app.logger.error("Commit of the request failed: %s", e)
+                response = jsonify({'error': 'Failed to save changes'})
+                response.status_code = 500
+            return response
+
+        @app.teardown_request
+        def discard_unit_of_work(exception=None):
+            # Exception non gérée : after_request n'a pas été appelé, on annule la transaction
+            if in_unit_of_work():
+                end_unit_of_work(success=False)
+
+    # Répliques en lecture (READ_REPLICAS) : seules les requêtes GET / HEAD y lisent,
+    # et seulement tant qu'elles n'ont rien écrit (voir app/persistence/routing.py)
+    if app.config.get('READ_REPLICAS'):
+        @app.before_request
+        def allow_replica_reads():
+            if request.method in ('GET', 'HEAD'):
+                db.session.info[REPLICA_READS_KEY] = True
+
+    # Chargement strict (STRICT_LOADING) : une lecture GET / HEAD qui charge une relation
+    # à la demande lève une erreur au lieu d'émettre une requête (voir app/persistence/strict_loading.py)
+    if app.config.get('STRICT_LOADING'):
+        @app.before_request
+        def forbid_lazy_loads():
+            if request.method in ('GET', 'HEAD'):
+                db.session.info[STRICT_LOADING_KEY] = True
+
+    # Création automatique des tables si elles n'existent pas (exécuté dans le contexte de l'application)
+    with app.app_context():
+        # Profil SQLite (WAL, synchronous, mmap...) appliqué avant la première connexion
+        for engine in db.engines.values():
+            apply_sqlite_pragmas(engine, app.config.get('SQLITE_PRAGMAS', {}))
+        configure_read_replicas(app, db.engines)
+        # Les tables sont créées sur la primaire seulement ; les répliques en sont des copies
+        # (bind_key=None : les métadonnées des binds d'une autre application sont ignorées)
+        db.create_all(bind_key=None)
+
     return app
\ No newline at end of file
@@ -0,0 +1,21 @@
+"""
+Ce fichier définit l'encodage JSON des réponses de l'API.
+
+`output_json` remplace la représentation `application/json` de Flask-RESTX
+(json.dumps du module standard) : le corps est encodé en bytes par orjson,
+beaucoup plus rapide sur les grandes listes. En mode debug le JSON est
+indenté, comme avec la représentation d'origine.
+"""
+import orjson
+from flask import current_app, make_response
+
+
+def output_json(data, code, headers=None):
+    """Réponse Flask dont le corps est `data` encodé en JSON par orjson"""
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+    if current_app.debug:
+        option |= orjson.OPT_INDENT_2
+    response = make_response(orjson.dumps(data, option=option), code)
+    response.headers.extend(headers or {})
+    response.mimetype = 'application/json'
+    return response
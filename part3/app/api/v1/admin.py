@@ -0,0 +1,62 @@
+import orjson
+from flask import Response, request, stream_with_context
+from flask_restx import Resource
+from app.services import facade
+from flask_jwt_extended import jwt_required, get_jwt
+from app.api.v1.users import admin_api
+from app.models import Amenity, Place, Review, User
+from app.models.serializers import serializer
+
+# Endpoints d'administration technique (supervision et réglage des performances)
+# Les routes sont enregistrées sur le namespace admin défini dans users.py
+
+
+@admin_api.route('/cache/stats')
+class AdminCacheStats(Resource):
+    @admin_api.response(200, 'Cache statistics retrieved successfully')
+    @admin_api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def get(self):
+        """Statistiques du cache d'identité par modèle (admin uniquement)"""
+        claims = get_jwt()
+        if not claims.get('is_admin', False):
+            return {'error': 'Admin privileges required'}, 403
+        return facade.get_cache_stats(), 200
+
+
+# Ressources exportables : méthode de parcours en flux de la facade, modèle et jeu de champs d'une ligne
+EXPORTS = {
+    'users': (facade.iter_users, User, 'default'),
+    'amenities': (facade.iter_amenities, Amenity, 'default'),
+    'places': (facade.iter_places, Place, 'summary'),
+    'reviews': (facade.iter_reviews, Review, 'default'),
+}
+
+
+@admin_api.route('/export/<resource>')
+class AdminExport(Resource):
+    @admin_api.doc(params={'batch_size': 'Number of rows loaded per batch'})
+    @admin_api.response(200, 'Rows streamed as newline-delimited JSON')
+    @admin_api.response(403, 'Admin privileges required')
+    @admin_api.response(404, 'Unknown resource')
+    @jwt_required()
+    def get(self, resource):
+        """Export complet d'une table en NDJSON, streamé lot par lot (admin uniquement)"""
+        claims = get_jwt()
+        if not claims.get('is_admin', False):
+            return {'error': 'Admin privileges required'}, 403
+        if resource not in EXPORTS:
+            return {'error': f"Unknown resource, expected one of: {', '.join(EXPORTS)}"}, 404
+        batch_size = request.args.get('batch_size', 1000, type=int)
+        if batch_size is None or batch_size < 1:
+            return {'error': 'batch_size must be a positive integer'}, 400
+
+        iter_rows, model, field_set = EXPORTS[resource]
+        serialize = serializer(model, field_set)
+
+        def generate():
+            for obj in iter_rows(batch_size):
+                yield orjson.dumps(serialize(obj), option=orjson.OPT_APPEND_NEWLINE)
+
+        # La réponse est produite au fil de l'eau : un seul lot de lignes est en mémoire à la fois
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
@@ -2,6 +2,8 @@ from flask_restx import Namespace, Resource, fields
 from app.services import facade
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.api.v1.users import admin_api
+from app.api.v1.pagination import PAGE_PARAMS, InvalidCursor, get_page_args, page_response
+from app.models.serializers import serialize
 
 api = Namespace('amenities', description='Amenity operations')
 
@@ -22,20 +24,24 @@ class AmenityList(Resource):
         # Vérification d'administration attendue : on suppose la présence de 'claims'
         # Normalement les claims viennent de get_jwt() dans un contexte protégé
         is_admin = claims.get('is_admin', False)
-        existing_amenity = facade.amenity_repo.get_by_attribute('name', amenity_data.get('name'))
-        if existing_amenity:
+        if facade.amenity_name_exists(amenity_data.get('name')):
             return {'error': 'Invalid input data'}, 400
         try:
             new_amenity = facade.create_amenity(amenity_data)
-            return new_amenity.to_dict(), 201
+            return serialize(new_amenity), 201
         except Exception as e:
             return {'error': str(e)}, 400
 
+    @admin_api.doc(params=PAGE_PARAMS)
     @admin_api.response(200, 'List of amenities retrieved successfully')
+    @admin_api.response(400, 'Invalid pagination parameters')
     def get(self):
         """Retrieve a list of all amenities"""
-        amenities = facade.get_all_amenities()
-        return [amenity.to_dict() for amenity in amenities], 200
+        try:
+            amenities, next_after = facade.get_amenities_page_data(**get_page_args())
+        except InvalidCursor as e:
+            return {'error': str(e)}, 400
+        return page_response(amenities, next_after), 200
 
 @admin_api.route('/amenities/<amenity_id>')
 class AdminAmenityModify(Resource):
@@ -82,22 +88,26 @@ class AdminAmenityCreate(Resource):
 
         amenity_data = admin_api.payload
 
-        existing_amenity = facade.amenity_repo.get_by_attribute('name', amenity_data.get('name'))
-        if existing_amenity:
+        if facade.amenity_name_exists(amenity_data.get('name')):
             return {'error': 'Amenity already exists'}, 400
 
         # Logique : création d'un nouvel équipement via la couche facade
         try:
             new_amenity = facade.create_amenity(amenity_data)
-            return new_amenity.to_dict(), 201
+            return serialize(new_amenity), 201
         except Exception as e:
             return {'error': str(e)}, 400
 
+    @admin_api.doc(params=PAGE_PARAMS)
     @admin_api.response(200, 'List of amenities retrieved successfully')
+    @admin_api.response(400, 'Invalid pagination parameters')
     def get(self):
         """Retrieve a list of all amenities (PUBLIC via admin namespace)"""
-        amenities = facade.get_all_amenities()
-        return [amenity.to_dict() for amenity in amenities], 200
+        try:
+            amenities, next_after = facade.get_amenities_page_data(**get_page_args())
+        except InvalidCursor as e:
+            return {'error': str(e)}, 400
+        return page_response(amenities, next_after), 200
 
 @api.route('/<amenity_id>')
 class AmenityResource(Resource):
@@ -108,7 +118,7 @@ class AmenityResource(Resource):
         amenity = facade.get_amenity(amenity_id)
         if not amenity:
             return {'error': 'Amenity not found'}, 404
-        return amenity.to_dict(), 200
+        return serialize(amenity), 200
 
     @api.expect(amenity_model)
     @api.response(200, 'Amenity updated successfully')
@@ -156,19 +166,23 @@ class AmenityListResource(Resource):
         """Register a new amenity"""
         amenity_data = api.payload
         
-        existing_amenity = facade.amenity_repo.get_by_attribute('name', amenity_data.get('name'))
-        if existing_amenity:
+        if facade.amenity_name_exists(amenity_data.get('name')):
             return {'error': 'Invalid input data'}, 400
         try:
             new_amenity = facade.create_amenity(amenity_data)
-            return new_amenity.to_dict(), 201
+            return serialize(new_amenity), 201
         except Exception as e:
             return {'error': str(e)}, 400
 
 @api.route('/')
 class AmenityList(Resource):
+    @api.doc(params=PAGE_PARAMS)
     @api.response(200, 'List of amenities retrieved successfully')
+    @api.response(400, 'Invalid pagination parameters')
     def get(self):
         """Retrieve a list of all amenities (PUBLIC)"""
-        amenities = facade.get_all_amenities()
-        return [amenity.to_dict() for amenity in amenities], 200
+        try:
+            amenities, next_after = facade.get_amenities_page_data(**get_page_args())
+        except InvalidCursor as e:
+            return {'error': str(e)}, 400
+        return page_response(amenities, next_after), 200
@@ -0,0 +1,98 @@
+"""
+Ce fichier regroupe les outils de pagination partagés par les endpoints de liste.
+
+Les listes sont paginées par clé (keyset) : le client reçoit un `next_cursor`
+opaque qu'il renvoie tel quel dans le paramètre `cursor` pour obtenir la page
+suivante. Le curseur encode la clé (valeur triée, id) du dernier élément de la
+page, ce qui permet au repository de reprendre directement à cet endroit au
+lieu de parcourir toute la table.
+"""
+import base64
+import json
+import uuid
+from flask import current_app, request
+
+
+# Documentation Swagger des paramètres de pagination communs à toutes les listes
+PAGE_PARAMS = {
+    'cursor': 'Opaque cursor returned as next_cursor by the previous page',
+    'limit': 'Maximum number of items to return',
+    'order_by': 'Sort key of the list',
+}
+
+
+class InvalidCursor(ValueError):
+    """Levée lorsque le curseur ou les paramètres de pagination sont invalides"""
+
+
+def encode_cursor(key, order_by='id'):
+    """Transforme une clé (valeur, id) en jeton opaque utilisable dans une URL.
+
+    Le jeton enregistre aussi le tri qui l'a produit : rejoué avec un autre
+    `order_by`, il comparerait la valeur à une colonne d'un autre type.
+    """
+    if key is None:
+        return None
+    raw = json.dumps([order_by, *key], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, order_by='id'):
+    """Retrouve la clé (valeur, id) à partir d'un jeton produit par encode_cursor pour ce tri"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        token = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeError):
+        raise InvalidCursor('Invalid cursor')
+    if not isinstance(token, list) or len(token) != 3:
+        raise InvalidCursor('Invalid cursor')
+    cursor_order_by, value, last_id = token
+    if cursor_order_by != order_by:
+        raise InvalidCursor('Cursor does not match order_by')
+    # La valeur triée est un scalaire JSON et l'id un UUID : tout autre contenu
+    # ferait échouer la conversion des paramètres SQL (erreur 500)
+    if value is not None and not isinstance(value, (str, int, float)):
+        raise InvalidCursor('Invalid cursor')
+    try:
+        last_id = str(uuid.UUID(last_id))
+    except (TypeError, ValueError, AttributeError):
+        raise InvalidCursor('Invalid cursor')
+    return value, last_id
+
+
+def get_limit_arg():
+    """Lit `limit` dans la query string (PAGE_SIZE_DEFAULT par défaut, plafonné à PAGE_SIZE_MAX)"""
+    default_limit = current_app.config.get('PAGE_SIZE_DEFAULT', 50)
+    max_limit = current_app.config.get('PAGE_SIZE_MAX', 200)
+    try:
+        limit = int(request.args.get('limit', default_limit))
+    except ValueError:
+        raise InvalidCursor('limit must be a positive integer')
+    if limit < 1:
+        raise InvalidCursor('limit must be a positive integer')
+    return min(limit, max_limit)
+
+
+def get_page_args(allowed_order_by=('id',)):
+    """Lit `cursor`, `limit` et `order_by` dans la query string de la requête courante"""
+    limit = get_limit_arg()
+
+    order_by = request.args.get('order_by', allowed_order_by[0])
+    if order_by not in allowed_order_by:
+        raise InvalidCursor(f"order_by must be one of: {', '.join(allowed_order_by)}")
+
+    return {
+        'after': decode_cursor(request.args.get('cursor'), order_by),
+        'limit': limit,
+        'order_by': order_by,
+    }
+
+
+def page_response(items, next_after, order_by='id'):
+    """Construit la réponse JSON d'une page : éléments + curseur suivant (pour le tri order_by)"""
+    return {
+        'items': items,
+        'next_cursor': encode_cursor(next_after, order_by),
+    }
@@ -1,8 +1,11 @@
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
-from flask import request
+from flask import current_app, request
 from app import db
+from app.persistence.repository import commit
+from app.api.v1.pagination import PAGE_PARAMS, InvalidCursor, get_limit_arg, get_page_args, page_response
+from app.models.serializers import serialize, serialize_all
 
 
 places_api = Namespace('places', description='Place operations')
@@ -44,6 +47,10 @@ place_model = places_api.model('Place', {
     'amenities': fields.List(fields.String, required=False, description="List of amenities ID's")
 })
 
+# Clés de tri acceptées par la liste des lieux ('-' pour un tri décroissant)
+PLACE_ORDERINGS = ('id', 'price', '-price', 'rating_avg', '-rating_avg')
+
+
 @admin_places_api.route('/places/<place_id>')
 class AdminPlaceModify(Resource):
     @admin_places_api.expect(place_model)  # Spécifie le modèle attendu pour la validation des données
@@ -72,7 +79,7 @@ class AdminPlaceModify(Resource):
        # Logic to update the place 
         try:
             updated_place = facade.update_place(place_id, data)
-            return updated_place.to_dict(), 200
+            return serialize(updated_place), 200
         except Exception as e:
             return {'error': str(e)}, 400
 
@@ -95,18 +102,70 @@ class PlaceList(Resource):
         place_data['owner_id'] = current_user_id
         try:
             new_place = facade.create_place(place_data)
-            return new_place.to_dict(), 201
+            return serialize(new_place), 201
         except ValueError as e:
             return {'error': str(e)}, 400
         except Exception as e:
             print(f"Erreur détaillée: {str(e)}")
             return {'error': 'Failed to create place'}, 500
 
+    @places_api.doc(params={**PAGE_PARAMS, 'min_rating': 'Only places whose average rating is at least this value'})
     @places_api.response(200, 'List of places retrieved successfully')
+    @places_api.response(400, 'Invalid pagination parameters')
     def get(self):
         """Retrieve a list of all places"""
-        places = facade.get_all_places()
-        return [place.to_dict() for place in places], 200
+        try:
+            page_args = get_page_args(allowed_order_by=PLACE_ORDERINGS)
+            min_rating = request.args.get('min_rating')
+            if min_rating is not None:
+                try:
+                    min_rating = float(min_rating)
+                except ValueError:
+                    raise InvalidCursor('min_rating must be a number')
+            places, next_after = facade.get_places_page(min_rating=min_rating, **page_args)
+        except InvalidCursor as e:
+            return {'error': str(e)}, 400
+        return page_response(serialize_all(places, 'list'), next_after, page_args['order_by']), 200
+
+
+def get_nearby_args():
+    """Lit `lat`, `lon`, `radius_km` et `limit` dans la query string de la requête courante"""
+    try:
+        latitude = float(request.args['lat'])
+        longitude = float(request.args['lon'])
+    except (KeyError, ValueError):
+        raise InvalidCursor('lat and lon are required and must be numbers')
+    if not -90.0 <= latitude <= 90.0 or not -180.0 <= longitude <= 180.0:
+        raise InvalidCursor('lat must be between -90 and 90, lon between -180 and 180')
+    max_radius = current_app.config.get('NEARBY_RADIUS_MAX_KM', 100)
+    radius_km = request.args.get('radius_km', current_app.config.get('NEARBY_RADIUS_DEFAULT_KM', 5), type=float)
+    if radius_km is None or not 0 < radius_km <= max_radius:
+        raise InvalidCursor(f'radius_km must be a number between 0 and {max_radius}')
+    return {
+        'latitude': latitude,
+        'longitude': longitude,
+        'radius_km': radius_km,
+        # Pas de pagination ici : un `cursor` ou un `order_by` présent dans l'URL est ignoré
+        'limit': get_limit_arg(),
+    }
+
+
+@places_api.route('/nearby')
+class PlaceNearby(Resource):
+    @places_api.doc(params={'lat': 'Latitude of the search center', 'lon': 'Longitude of the search center',
+                            'radius_km': 'Search radius in kilometers', 'limit': 'Maximum number of places'})
+    @places_api.response(200, 'Places within the radius, nearest first')
+    @places_api.response(400, 'Invalid search parameters')
+    def get(self):
+        """List the places around a point, sorted by distance"""
+        try:
+            nearby = facade.get_places_nearby(**get_nearby_args())
+        except InvalidCursor as e:
+            return {'error': str(e)}, 400
+        places = serialize_all((place for place, _ in nearby), 'list')
+        for place, (_, distance) in zip(places, nearby):
+            place['distance_km'] = round(distance, 3)
+        return {'items': places}, 200
 
 
 @places_api.route('/<place_id>')
@@ -115,10 +174,10 @@ class PlaceResource(Resource):
     @places_api.response(404, 'Place not found')
     def get(self, place_id):
         """Get place details by ID"""
-        place = facade.get_place(place_id)
+        place = facade.get_place_data(place_id)
         if not place:
             return {'error': 'Place not found'}, 404
-        return place.to_dict(), 200
+        return place, 200
 
     @places_api.expect(place_model)
     @places_api.response(200, 'Place updated successfully')
@@ -150,7 +209,7 @@ class PlaceResource(Resource):
 
         try:
             updated_place = facade.update_place(place_id, place_data)
-            return updated_place.to_dict(), 200
+            return serialize(updated_place), 200
         except ValueError as e:
             return {'error': str(e)}, 400
         except Exception as e:
@@ -193,11 +252,11 @@ class PlaceAmenities(Resource):
         amenities_data = request.get_json()
 
             # Validation du format des données reçues
-        if not amenities_data or not isinstance(amenities_data, list):
+        if not amenities_data or not isinstance(amenities_data, dict):
             return {'error': 'Invalid input data'}, 400
         
             # Extraction et validation des IDs des équipements
-        amenity_ids = amenities_data['amenity_ids']
+        amenity_ids = amenities_data.get('amenity_ids')
         
         if not isinstance(amenity_ids, list):
             return {'error': 'amenity_ids must be a list'}, 400
@@ -210,20 +269,19 @@ class PlaceAmenities(Resource):
         if place.owner_id != current_user_id:
             return {'error': 'Unauthorized action'}, 403
         try:
-            for amenity_obj in amenities_data:
-                if not isinstance(amenity_obj, dict) or 'id' not in amenity_obj:
-                    return {'error': 'Invalid amenity format'}, 400
-                
-                amenity_id = amenity_obj['id']
-                amenity = facade.get_amenity(amenity_id)
-                
-                if not amenity:
+            # Tous les équipements sont chargés en une seule requête
+            amenities = facade.get_amenities(amenity_ids)
+            found_ids = {amenity.id for amenity in amenities}
+            for amenity_id in amenity_ids:
+                if amenity_id not in found_ids:
                     return {'error': f'Amenity {amenity_id} not found'}, 404
-                
-                if amenity not in place.amenities:
+
+            current_ids = {amenity.id for amenity in place.amenities}
+            for amenity in amenities:
+                if amenity.id not in current_ids:
                     place.amenities.append(amenity)
             
-            db.session.commit()
+            commit()
             return {'message': 'Amenities added successfully'}, 200
         except Exception as e:
             db.session.rollback()
@@ -232,13 +290,18 @@ class PlaceAmenities(Resource):
 
 @places_api.route('/<place_id>/reviews/')
 class PlaceReviewList(Resource):
+    @places_api.doc(params=PAGE_PARAMS)
     @places_api.response(200, 'List of reviews for the place retrieved successfully')
+    @places_api.response(400, 'Invalid pagination parameters')
     @places_api.response(404, 'Place not found')
     def get(self, place_id):
         """Get all reviews for a specific place"""
-        place = facade.get_place(place_id)
-        if not place:
+        try:
+            reviews, next_after = facade.get_reviews_page_by_place_data(place_id, **get_page_args())
+        except InvalidCursor as e:
+            return {'error': str(e)}, 400
+        except KeyError:
             return {'error': 'Place not found'}, 404
-        return [review.to_dict() for review in place.reviews], 200
+        return page_response(reviews, next_after), 200
 
 api = places_api
\ No newline at end of file
@@ -2,6 +2,8 @@ from flask_restx import Namespace, Resource, fields
 from app.services import facade
 from flask import request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.api.v1.pagination import PAGE_PARAMS, InvalidCursor, get_page_args, page_response
+from app.models.serializers import serialize, serialize_all
 
 api = Namespace('reviews', description='Review operations')
 
@@ -34,13 +36,11 @@ class ReviewList(Resource):
         if not user:
             return {'error': 'User not found'}, 400
         # Vérifie que l'utilisateur n'est pas le propriétaire du lieu
-        if place.owner.id == current_user:
+        if place.owner_id == current_user:
             return {'error': 'You cannot review your own place'}, 400
 
         # Vérifie que l'utilisateur n'a pas déjà donné son avis sur ce lieu
-        existing_reviews = [
-            r for r in place.reviews if r.user.id == current_user]
-        if existing_reviews:
+        if facade.has_reviewed(current_user, place.id):
             return {'error': 'You have already reviewed this place'}, 400
 
         # Association de l'avis avec l'utilisateur connecté pour la sécurité
@@ -48,14 +48,20 @@ class ReviewList(Resource):
 
         try:
             new_review = facade.create_review(review_data)
-            return new_review.to_dict(), 201
+            return serialize(new_review), 201
         except Exception as e:
             return {'error': str(e)}, 400
 
+    @api.doc(params=PAGE_PARAMS)
     @api.response(200, 'List of reviews retrieved successfully')
+    @api.response(400, 'Invalid pagination parameters')
     def get(self):
-        """Récupérer la liste de tous les avis"""
-        return [review.to_dict() for review in facade.get_all_reviews()], 200
+        """Récupérer la liste de tous les avis (paginée)"""
+        try:
+            reviews, next_after = facade.get_reviews_page(**get_page_args())
+        except InvalidCursor as e:
+            return {'error': str(e)}, 400
+        return page_response(serialize_all(reviews), next_after), 200
 
 
 @api.route('/<review_id>')
@@ -67,7 +73,7 @@ class ReviewResource(Resource):
         review = facade.get_review(review_id)
         if not review:
             return {'error': 'Review not found'}, 404
-        return review.to_dict(), 200
+        return serialize(review), 200
 
     @api.expect(review_model)
     @api.response(200, 'Review updated successfully')
@@ -83,7 +89,7 @@ class ReviewResource(Resource):
         if not review:
             return {'error': 'Review not found'}, 404
         # vérifie que user connecté = auteur de la review
-        if review.user.id != current_user:
+        if review.user_id != current_user:
             return {'error': 'Unauthorized action'}, 403
 
         try:
@@ -102,7 +108,7 @@ class ReviewResource(Resource):
         if not review:
             return {'error': 'Review not found'}, 404
         # vérifie que user connecté = auteur de la review
-        if review.user.id != current_user:
+        if review.user_id != current_user:
             return {'error': 'Unauthorized action'}, 403
 
         try:
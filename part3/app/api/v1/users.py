@@ -1,6 +1,8 @@
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from app.api.v1.pagination import PAGE_PARAMS, InvalidCursor, get_page_args, page_response
+from app.models.serializers import serialize, serialize_all
 
 
 users_api = Namespace('users', description='User operations')
@@ -93,13 +95,13 @@ class AdminUserCreate(Resource):
         email = user_data.get('email')
 
         # Check if email is already in use
-        if facade.get_user_by_email(email):
+        if facade.email_exists(email):
             return {'error': 'Email already registered'}, 400
 
         # Logic to create a new user
         try:
             new_user = facade.create_user(user_data)  # ← Utiliser facade, pas self
-            return new_user.to_dict(), 201  # ← Code 201 pour création
+            return serialize(new_user), 201  # ← Code 201 pour création
         except Exception as e:
             return {'error': str(e)}, 400
 
@@ -176,21 +178,25 @@ class UserList(Resource):
 
         # Vérifie l'unicité de l'email avant la création de l'utilisateur
         # Empêche les adresses email en double dans le système
-        existing_user = facade.get_user_by_email(user_data['email'])
-        if existing_user:
+        if facade.email_exists(user_data['email']):
             return {'error': 'Email already registered'}, 409
 
         try:
             new_user = facade.create_user(user_data)
-            return new_user.to_dict(), 201
+            return serialize(new_user), 201
         except Exception as e:
             return {'error': str(e)}, 400
 
+    @users_api.doc(params=PAGE_PARAMS)
     @users_api.response(200, 'List of users retrieved successfully')
+    @users_api.response(400, 'Invalid pagination parameters')
     def get(self):
-        """Récupérer la liste des utilisateurs"""
-        users = facade.get_users()
-        return [user.to_dict() for user in users], 200
+        """Récupérer la liste des utilisateurs (paginée)"""
+        try:
+            users, next_after = facade.get_users_page(**get_page_args())
+        except InvalidCursor as e:
+            return {'error': str(e)}, 400
+        return page_response(serialize_all(users), next_after), 200
 
 
 @users_api.route('/<user_id>')
@@ -203,7 +209,7 @@ class UserResource(Resource):
             user = facade.get_user(user_id)
             if not user:
                 return {'error': 'User not found'}, 404
-            return user.to_dict(), 200
+            return serialize(user), 200
             
         except Exception as e:
             print(f"ERROR: {type(e).__name__}: {str(e)}")
@@ -236,7 +242,7 @@ class UserResource(Resource):
         try:
             facade.update_user(user_id, user_data)
             updated_user = facade.get_user(user_id)
-            return updated_user.to_dict(), 200
+            return serialize(updated_user), 200
         except Exception as e:
             return {'error': str(e)}, 400
 
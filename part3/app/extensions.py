@@ -1,14 +1,19 @@
 # Module des extensions Flask utilisées par l'application
 # Ce fichier crée des instances non initialisées (factories) des extensions
 # - `bcrypt` : chiffrement des mots de passe (Flask-Bcrypt)
-# - `db`     : ORM / gestion de la base de données (Flask-SQLAlchemy)
+# - `db`     : ORM / gestion de la base de données (Flask-SQLAlchemy), avec une session
+#              qui peut lire sur des répliques (voir app/persistence/routing.py)
 # - `jwt`    : gestion des tokens JWT (Flask-JWT-Extended)
+# - `async_db` : moteur et sessions SQLAlchemy asyncio pour le code asynchrone
 # L'initialisation effective (`init_app`) est réalisée dans `app/__init__.py`
 from flask_bcrypt import Bcrypt
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
+from app.persistence.engine import AsyncDatabase
+from app.persistence.routing import RoutingSession
 
 # Instances des extensions (sera initialisé dans create_app)
 bcrypt = Bcrypt()
-db = SQLAlchemy()
-jwt = JWTManager()
\ No newline at end of file
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+jwt = JWTManager()
+async_db = AsyncDatabase()
\ No newline at end of file
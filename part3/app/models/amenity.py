@@ -1,6 +1,5 @@
 from .basemodel import BaseModel
 from app.extensions import db
-import uuid
 from sqlalchemy.orm import validates, relationship
 from typing import TYPE_CHECKING
 
@@ -14,7 +13,6 @@ from app.models.place_amenity import place_amenity
 class Amenity(BaseModel):
 	__tablename__ = 'amenities'
 
-	id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
 	name = db.Column(db.String(50), nullable=False, index=True)
 
 	# Relation Many-to-Many avec Place via la table d'association place_amenity
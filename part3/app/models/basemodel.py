@@ -1,18 +1,20 @@
-import uuid
 from datetime import datetime
 from app.extensions import db
+from app.models.ids import new_id
+from app.models.types import UUIDBinary
+from app.persistence.repository import commit
 
 class BaseModel(db.Model):
     __abstract__ = True
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(UUIDBinary(), primary_key=True, default=new_id)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     def save(self):
         """Update the updated_at timestamp whenever the object is modified"""
         self.updated_at = datetime.utcnow()
-        db.session.commit()
+        commit()
 
 
     def update(self, data):
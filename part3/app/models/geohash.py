@@ -0,0 +1,130 @@
+"""
+Ce fichier implémente le geohash des coordonnées des lieux (Place.geohash).
+
+Un geohash découpe le globe en cellules : chaque caractère (base 32, 5 bits)
+divise la cellule précédente en 32, alternativement en longitude et en
+latitude. Deux points proches partagent le plus souvent un long préfixe, et
+toutes les positions d'une cellule sont les geohashes qui commencent par son
+préfixe : une recherche de proximité devient une poignée de parcours d'index
+par intervalle (`geohash >= 'u09t' AND geohash < 'u09t{'`).
+
+`covering_cells` retourne les cellules (la cellule du centre et ses voisines)
+qui couvrent un cercle : le filtrage exact se fait ensuite avec la distance
+`haversine_km`.
+"""
+import math
+
+# Alphabet base 32 des geohashes (sans a, i, l, o)
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Longueur des geohashes stockés : cellules d'environ 3,7 cm x 1,9 cm
+GEOHASH_PRECISION = 12
+
+# Caractère qui suit tous ceux de BASE32 : borne haute exclusive d'un préfixe
+PREFIX_END = '{'
+
+# Rayon moyen de la Terre (UGGI)
+EARTH_RADIUS_KM = 6371.0088
+
+
+def _spread(bits):
+    """Intercale un 0 entre chaque bit d'un entier de 32 bits au plus (abc -> a0b0c)"""
+    bits &= 0xFFFFFFFF
+    bits = (bits | bits << 16) & 0x0000FFFF0000FFFF
+    bits = (bits | bits << 8) & 0x00FF00FF00FF00FF
+    bits = (bits | bits << 4) & 0x0F0F0F0F0F0F0F0F
+    bits = (bits | bits << 2) & 0x3333333333333333
+    return (bits | bits << 1) & 0x5555555555555555
+
+
+def _grid(precision):
+    """(nombre de lignes en latitude, nombre de colonnes en longitude) des cellules de cette précision"""
+    total = 5 * precision
+    return 1 << (total // 2), 1 << (total - total // 2)
+
+
+def _index(value, low, span, size):
+    return min(int((value - low) / span * size), size - 1)
+
+
+def _cell(row, column, precision):
+    """Geohash de la cellule (row, column) de la grille de cette précision"""
+    # Le bit de poids fort est un bit de longitude
+    if precision % 2:
+        bits = _spread(column) | _spread(row) << 1
+    else:
+        bits = _spread(column) << 1 | _spread(row)
+    return ''.join(BASE32[(bits >> shift) & 31] for shift in range(5 * (precision - 1), -1, -5))
+
+
+def encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Geohash de (latitude, longitude) en degrés"""
+    rows, columns = _grid(precision)
+    return _cell(_index(latitude, -90.0, 180.0, rows), _index(longitude, -180.0, 360.0, columns), precision)
+
+
+def decode(geohash):
+    """(sud, nord, ouest, est) de la cellule d'un geohash"""
+    bits = 0
+    for char in geohash:
+        bits = bits << 5 | BASE32.index(char)
+    row = column = 0
+    for position in range(5 * len(geohash) - 1, -1, -1):
+        bit = bits >> position & 1
+        # Bits de longitude aux positions paires en partant du bit de poids fort
+        if (5 * len(geohash) - 1 - position) % 2 == 0:
+            column = column << 1 | bit
+        else:
+            row = row << 1 | bit
+    rows, columns = _grid(len(geohash))
+    height, width = 180.0 / rows, 360.0 / columns
+    return (-90.0 + row * height, -90.0 + (row + 1) * height,
+            -180.0 + column * width, -180.0 + (column + 1) * width)
+
+
+def haversine_km(latitude1, longitude1, latitude2, longitude2):
+    """Distance en km entre deux points, sur une Terre sphérique"""
+    phi1, phi2 = math.radians(latitude1), math.radians(latitude2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2 +
+         math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(longitude2 - longitude1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """(sud, nord, ouest, est) du plus petit rectangle contenant le cercle.
+
+    Ouest et est peuvent sortir de [-180, 180] quand le cercle traverse
+    l'antiméridien ; le rectangle fait tout le tour du globe (-180, 180) quand
+    le cercle contient un pôle.
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    south = latitude - math.degrees(angle)
+    north = latitude + math.degrees(angle)
+    if south <= -90.0 or north >= 90.0:
+        return max(south, -90.0), min(north, 90.0), -180.0, 180.0
+    spread = math.sin(angle) / math.cos(math.radians(latitude))
+    if spread >= 1.0:
+        return south, north, -180.0, 180.0
+    delta = math.degrees(math.asin(spread))
+    return south, north, longitude - delta, longitude + delta
+
+
+def covering_cells(latitude, longitude, radius_km, max_cells=9):
+    """Geohashes des cellules qui couvrent le cercle, à la plus grande précision
+    pour laquelle il en faut au plus max_cells. Retourne [''] (tout le globe) si
+    même les cellules d'un caractère sont trop nombreuses."""
+    south, north, west, east = bounding_box(latitude, longitude, radius_km)
+    cells = ['']
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        rows, columns = _grid(precision)
+        first_row, last_row = _index(south, -90.0, 180.0, rows), _index(north, -90.0, 180.0, rows)
+        # Indices hors de la grille quand le rectangle traverse l'antiméridien : ramenés par modulo
+        width = 360.0 / columns
+        column_range = range(math.floor((west + 180.0) / width), math.floor((east + 180.0) / width) + 1)
+        if east - west >= 360.0 or len(column_range) >= columns:
+            column_range = range(columns)
+        if (last_row - first_row + 1) * len(column_range) > max_cells:
+            break
+        cells = [_cell(row, column % columns, precision)
+                 for row in range(first_row, last_row + 1) for column in column_range]
+    return cells
@@ -0,0 +1,78 @@
+"""
+Ce fichier définit la génération des identifiants des modèles (BaseModel.id).
+
+Le générateur est choisi par la configuration (`ID_GENERATOR`) :
+
+- 'uuid7' (par défaut) : UUID version 7 (RFC 9562), dont les 48 premiers
+  bits sont l'horodatage en millisecondes. Les nouveaux ids sont croissants :
+  les insertions se font en fin d'index B-tree (pas de découpage de pages
+  au hasard), et trier par id revient à trier par date de création ;
+- 'uuid4' : UUID entièrement aléatoire, l'ancien comportement.
+
+Les deux produisent des chaînes UUID canoniques, stockées sur 16 octets par
+UUIDBinary : les ids existants restent valides quel que soit le générateur.
+"""
+import os
+import threading
+import time
+import uuid
+
+# Bits du compteur (champ rand_a) qui garantit l'ordre des ids créés dans la même milliseconde
+_COUNTER_BITS = 12
+_COUNTER_MAX = (1 << _COUNTER_BITS) - 1
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid4_id():
+    return str(uuid.uuid4())
+
+
+def uuid7_id():
+    """UUID v7 croissant au sein du processus, même pour plusieurs ids dans la même milliseconde"""
+    global _last_ms, _counter
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms > _last_ms:
+            _last_ms = ms
+            # Départ aléatoire dans la première moitié : le compteur a de la marge pour croître
+            _counter = int.from_bytes(os.urandom(2), 'big') & (_COUNTER_MAX >> 1)
+        else:
+            # Même milliseconde (ou horloge revenue en arrière) : on incrémente le compteur,
+            # et s'il déborde on avance l'horodatage d'une milliseconde
+            _counter += 1
+            if _counter > _COUNTER_MAX:
+                _last_ms += 1
+                _counter = 0
+        ms, counter = _last_ms, _counter
+    rand_b = int.from_bytes(os.urandom(8), 'big') & ((1 << 62) - 1)
+    value = (ms << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | rand_b
+    digits = f'{value:032x}'
+    return f'{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}'
+
+
+ID_GENERATORS = {
+    'uuid4': uuid4_id,
+    'uuid7': uuid7_id,
+}
+
+_generator = uuid7_id
+
+
+def set_id_generator(generator):
+    """Choisit le générateur d'ids des nouveaux objets : nom ('uuid7', 'uuid4')
+    ou fonction sans argument retournant une chaîne UUID"""
+    global _generator
+    if callable(generator):
+        _generator = generator
+    elif generator in ID_GENERATORS:
+        _generator = ID_GENERATORS[generator]
+    else:
+        raise ValueError(f"Unknown id generator: {generator}")
+
+
+def new_id():
+    """Nouvel identifiant, produit par le générateur configuré"""
+    return _generator()
@@ -1,7 +1,8 @@
 from .basemodel import BaseModel
 from sqlalchemy.orm import validates, relationship
-import uuid
 from app.extensions import db
+from app.models.geohash import GEOHASH_PRECISION, encode
+from app.models.types import UUIDBinary
 from typing import TYPE_CHECKING
 
 # TYPE_CHECKING est utilisé uniquement pendant l'analyse statique.
@@ -18,17 +19,30 @@ from app.models.place_amenity import place_amenity
 class Place(BaseModel):
     __tablename__ = 'places'
 
-    # Identifiant unique du lieu (UUID, auto-généré)
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     title = db.Column(db.String(100), nullable=False, index=True)
     description = db.Column(db.Text, nullable=True)
     price = db.Column(db.Float(), nullable=False, index=True)
     latitude = db.Column(db.Float(), nullable=False)
     longitude = db.Column(db.Float(), nullable=False)
+    # Geohash de (latitude, longitude), recalculé par leurs validateurs, pour la recherche
+    # de proximité (voir app/models/geohash.py). L'index couvre aussi les coordonnées :
+    # les lieux d'une cellule hors du rectangle de recherche sont écartés sans lire la table.
+    geohash = db.Column(db.String(GEOHASH_PRECISION), nullable=True)
+    __table_args__ = (db.Index('ix_places_geohash', 'geohash', 'latitude', 'longitude'),)
+
+    # Agrégats des avis, tenus à jour par la facade à chaque création / modification /
+    # suppression d'avis (voir `python3 maintenance.py recompute-ratings` en cas de dérive)
+    review_count = db.Column(db.Integer(), nullable=False, default=0, server_default='0')
+    rating_sum = db.Column(db.Float(), nullable=False, default=0.0, server_default='0')
+    # Note moyenne (0 sans avis), indexée pour trier et filtrer les lieux par note
+    rating_avg = db.Column(db.Float(), nullable=False, default=0.0, server_default='0', index=True)
+    # Colonnes calculées, jamais modifiables par les données d'une requête
+    AGGREGATE_COLUMNS = ('review_count', 'rating_sum', 'rating_avg')
+    DERIVED_COLUMNS = AGGREGATE_COLUMNS + ('geohash',)
 
     # Clé étrangère vers l’utilisateur propriétaire
     owner_id = db.Column(
-        db.String(36),
+        UUIDBinary(),
         db.ForeignKey('users.id'),
         nullable=False
     )
@@ -49,7 +63,7 @@ class Place(BaseModel):
     amenities = db.relationship(
         'Amenity',
         secondary=place_amenity,
-        lazy='subquery',
+        lazy='select',
         back_populates='places'
     )
     
@@ -89,6 +103,7 @@ class Place(BaseModel):
         value = float(value)
         if not -90.0 <= value <= 90.0:
             raise ValueError("Latitude must be between -90 and 90")
+        self._update_geohash(value, self.longitude)
         return value
     
     
@@ -99,8 +114,14 @@ class Place(BaseModel):
         value = float(value)
         if not -180.0 <= value <= 180.0:
             raise ValueError("Longitude must be between -180 and 180")
+        self._update_geohash(self.latitude, value)
         return value
 
+    def _update_geohash(self, latitude, longitude):
+        # Tant qu'une des deux coordonnées manque (constructeur), le geohash attend l'autre
+        if latitude is not None and longitude is not None:
+            self.geohash = encode(latitude, longitude)
+
     
 
 
@@ -125,9 +146,11 @@ class Place(BaseModel):
             'latitude': self.latitude,
             'longitude': self.longitude,
             'owner_id': self.owner_id,
+            'review_count': self.review_count,
+            'rating_avg': self.rating_avg if self.review_count else None,
         }
         if include_owner and self.owner:
-            result['owner'] = self.owner.to_dict(include_places=False)  # ✅ Évite la boucle
+            result['owner'] = self.owner.to_dict()
         if include_reviews:
             result['reviews'] = [review.to_dict() for review in self.reviews]
         if include_amenities:
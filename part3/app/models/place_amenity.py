@@ -1,4 +1,5 @@
 from app.extensions import db
+from app.models.types import UUIDBinary
 
 # Définition d'une table d'association Many-to-Many entre les tables "places" et "amenities"
 # Cette table ne représente pas un modèle avec des données propres,
@@ -11,7 +12,7 @@ place_amenity = db.Table( # Nom de la table d'association en base de données
     # Ce champ est aussi une des clés primaires pour garantir l'unicité.
     db.Column(
         'place_id',
-        db.String(36),
+        UUIDBinary(),
         db.ForeignKey('places.id'),
         primary_key=True
     ),
@@ -20,7 +21,7 @@ place_amenity = db.Table( # Nom de la table d'association en base de données
     # Clé primaire pour garantir l'unicité de la combinaison place-amenity.
     db.Column(
         'amenity_id',
-        db.String(36),
+        UUIDBinary(),
         db.ForeignKey('amenities.id'),
         primary_key=True
     )
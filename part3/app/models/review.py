@@ -1,7 +1,7 @@
 from .basemodel import BaseModel
 from app.extensions import db
+from app.models.types import UUIDBinary
 from .user import User
-import uuid
 from sqlalchemy.orm import validates, relationship
 from typing import TYPE_CHECKING
 
@@ -14,21 +14,19 @@ if TYPE_CHECKING:
 class Review(BaseModel):
 	__tablename__ = 'reviews'
 
-	# Identifiant unique généré automatiquement sous forme d’UUID
-	id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
 	text = db.Column(db.String(120), nullable=False, index=True)
 	rating = db.Column(db.Float(), nullable=False, index=True)
 
 	# Clé étrangère vers la table des lieux (places)
 	place_id = db.Column(
-		db.String(36),
+		UUIDBinary(),
 		db.ForeignKey('places.id'),
 		nullable=False,
 	)
 	
 	# Clé étrangère vers la table des utilisateurs (users)
 	user_id = db.Column(
-		db.String(36),
+		UUIDBinary(),
 		db.ForeignKey('users.id'),
 		nullable=False
 	)
@@ -74,8 +72,8 @@ class Review(BaseModel):
 			'id': self.id,
 			'text': self.text,
 			'rating': self.rating,
-			'place_id': self.place.id,
-			'user_id': self.user.id,
+			'place_id': self.place_id,
+			'user_id': self.user_id,
         	'created_at': self.created_at.isoformat() if self.created_at else None,
         	'updated_at': self.updated_at.isoformat() if self.updated_at else None
 		}
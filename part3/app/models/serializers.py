@@ -0,0 +1,151 @@
+"""
+Ce fichier génère les fonctions de sérialisation des modèles (objet -> dict).
+
+Chaque modèle déclare ses jeux de champs nommés dans `FIELD_SETS` : colonnes,
+relations (sérialisées avec un jeu de champs du modèle lié) et champs calculés.
+`compile_serializers()`, appelée par `create_app`, lit le mapper SQLAlchemy de
+chaque modèle et génère pour chaque jeu une fonction Python dédiée, du type :
+
+    def serialize_Review_default(obj):
+        d = obj.__dict__
+        return {
+            'id': d['id'] if 'id' in d else obj.id,
+            'created_at': _iso(d['created_at'] if 'created_at' in d else obj.created_at),
+            ...
+        }
+
+Une colonne chargée est lue directement dans l'état de l'objet, sans passer
+par le descripteur de l'attribut ; une colonne expirée ou une relation non
+chargée repasse par l'attribut (rechargement ou `raiseload`, voir les profils
+de chargement). Le résultat est identique à celui de `to_dict()` (dates en ISO
+8601), pour une fraction du coût sur les grandes listes.
+
+    serialize(place)                  # un objet, jeu de champs 'default'
+    serialize_all(places, 'list')     # une liste d'objets du même modèle
+"""
+from sqlalchemy import DateTime, inspect
+from sqlalchemy.orm import configure_mappers
+
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+
+class FieldSet:
+    """Champs d'un modèle à sérialiser, dans l'ordre des clés du dict produit.
+
+    `relationships` associe une relation listée dans `fields` au jeu de champs
+    du modèle lié ('default' sinon) ; `computed` associe un champ à une fonction
+    `f(obj)` qui remplace la lecture de l'attribut.
+    """
+
+    def __init__(self, fields, relationships=None, computed=None):
+        self.fields = tuple(fields)
+        self.relationships = dict(relationships or {})
+        self.computed = dict(computed or {})
+
+
+def _place_rating_avg(place):
+    # Pas de note moyenne tant que le lieu n'a aucun avis (voir Place.to_dict)
+    return place.rating_avg if place.review_count else None
+
+
+PLACE_COLUMNS = ('id', 'title', 'description', 'price', 'latitude', 'longitude', 'owner_id',
+                 'review_count', 'rating_avg')
+
+FIELD_SETS = {
+    User: {
+        # User.to_dict()
+        'default': FieldSet(('id', 'first_name', 'last_name', 'email', 'is_admin')),
+    },
+    Amenity: {
+        # Amenity.to_dict()
+        'default': FieldSet(('id', 'name')),
+    },
+    Review: {
+        # Review.to_dict()
+        'default': FieldSet(('id', 'text', 'rating', 'place_id', 'user_id', 'created_at', 'updated_at')),
+    },
+    Place: {
+        # Place.to_dict() : détail d'un lieu, avec avis et amenities
+        'default': FieldSet(PLACE_COLUMNS + ('reviews', 'amenities'),
+                            computed={'rating_avg': _place_rating_avg}),
+        # Place.to_dict(include_reviews=False) : listes de lieux, avis résumés par review_count et rating_avg
+        'list': FieldSet(PLACE_COLUMNS + ('amenities',), computed={'rating_avg': _place_rating_avg}),
+        # Place.to_dict(include_reviews=False, include_amenities=False) : export, sans relation
+        'summary': FieldSet(PLACE_COLUMNS, computed={'rating_avg': _place_rating_avg}),
+    },
+}
+
+# Fonctions générées, par (modèle, jeu de champs)
+_serializers = {}
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+def _generate(model, name, field_set):
+    """Génère, compile et retourne la fonction de sérialisation d'un jeu de champs"""
+    mapper = inspect(model)
+    namespace = {'_iso': _iso}
+    entries = []
+    for field in field_set.fields:
+        read = f"(d[{field!r}] if {field!r} in d else obj.{field})"
+        if field in field_set.computed:
+            namespace[f'_computed_{field}'] = field_set.computed[field]
+            expression = f"_computed_{field}(obj)"
+        elif field in mapper.relationships:
+            relationship = mapper.relationships[field]
+            related = serializer(relationship.mapper.class_, field_set.relationships.get(field, 'default'))
+            namespace[f'_serialize_{field}'] = related
+            if relationship.uselist:
+                expression = f"[_serialize_{field}(item) for item in {read}]"
+            else:
+                expression = f"(_serialize_{field}(item) if (item := {read}) is not None else None)"
+        elif field in mapper.column_attrs:
+            column_type = mapper.column_attrs[field].columns[0].type
+            expression = f"_iso({read})" if isinstance(column_type, DateTime) else read
+        else:
+            raise ValueError(f"{model.__name__} has no column or relationship named {field!r}")
+        entries.append(f"        {field!r}: {expression},")
+    function_name = f'serialize_{model.__name__}_{name}'
+    source = "\n".join([f"def {function_name}(obj):", "    d = obj.__dict__", "    return {", *entries, "    }"])
+    exec(compile(source, f'<{function_name}>', 'exec'), namespace)
+    return namespace[function_name]
+
+
+def serializer(model, field_set='default'):
+    """Fonction de sérialisation du jeu de champs `field_set` de `model`, générée au premier appel"""
+    key = (model, field_set)
+    function = _serializers.get(key)
+    if function is None:
+        try:
+            declared = FIELD_SETS[model][field_set]
+        except KeyError:
+            raise ValueError(f"Unknown field set for {model.__name__}: {field_set}")
+        function = _serializers[key] = _generate(model, field_set, declared)
+    return function
+
+
+def compile_serializers():
+    """Génère toutes les fonctions déclarées dans FIELD_SETS (au démarrage de l'application)"""
+    configure_mappers()
+    for model, field_sets in FIELD_SETS.items():
+        for field_set in field_sets:
+            serializer(model, field_set)
+
+
+def serialize(obj, field_set='default'):
+    """dict du jeu de champs `field_set` de obj"""
+    return serializer(type(obj), field_set)(obj)
+
+
+def serialize_all(objs, field_set='default'):
+    """Liste des dicts des objets (tous du même modèle)"""
+    objs = list(objs)
+    if not objs:
+        return []
+    function = serializer(type(objs[0]), field_set)
+    return [function(obj) for obj in objs]
@@ -0,0 +1,50 @@
+"""
+Ce fichier définit les types de colonnes SQLAlchemy propres à HBnB.
+
+UUIDBinary stocke un UUID sur 16 octets (BINARY(16) sous MySQL, BLOB sous
+SQLite) au lieu des 36 caractères de sa forme texte : les clés primaires,
+les clés étrangères, leurs index et la table d'association place_amenity
+sont plus de deux fois plus petits. Côté Python, les ids restent des chaînes
+canoniques ('1b4e28ba-2fa1-11d2-883f-0016d3cca427') : l'API, les jetons JWT
+et le code applicatif ne voient pas la différence.
+"""
+import uuid
+
+from sqlalchemy.dialects import mysql
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+
+class UUIDBinary(TypeDecorator):
+    """UUID stocké en binaire (16 octets), exposé en chaîne canonique"""
+
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        # Un BLOB ne peut pas être indexé en entier sous MySQL : BINARY(16) de taille fixe
+        if dialect.name == 'mysql':
+            return dialect.type_descriptor(mysql.BINARY(16))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, uuid.UUID):
+            return value.bytes
+        if isinstance(value, bytes):
+            return value
+        try:
+            if len(value) == 36:
+                # Forme canonique : conversion directe, plusieurs fois plus rapide que uuid.UUID()
+                return bytes.fromhex(value.replace('-', ''))
+            return uuid.UUID(value).bytes
+        except ValueError:
+            # Id mal formé (ex. /places/nope) : une valeur qui ne fait pas 16 octets
+            # ne correspond à aucune ligne, la recherche ne trouve donc rien
+            return str(value).encode()
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        digits = bytes(value).hex()
+        return f'{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}'
@@ -1,7 +1,6 @@
 from .basemodel import BaseModel
 import re
 from app.extensions import bcrypt, db
-import uuid
 from sqlalchemy.orm import validates, relationship
 from typing import TYPE_CHECKING
 
@@ -15,7 +14,6 @@ class User(BaseModel):
     __tablename__ = 'users' # Nom de la table dans la base de données
 
     # Définition des colonnes principales
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     first_name = db.Column(db.String(50), nullable=False, index=True)
     last_name = db.Column(db.String(50), nullable=False, index=True)
     email = db.Column(db.String(120), nullable=False, unique=True, index=True)
@@ -114,7 +112,12 @@ class User(BaseModel):
 
     def hash_password(self, password):
         """Hashes the password before storing it."""
-        self.password = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.password = User.password_hash(password)
+
+    @staticmethod
+    def password_hash(password):
+        """Returns the bcrypt hash of password (used when updating without loading the user)."""
+        return bcrypt.generate_password_hash(password).decode('utf-8')
 
     def verify_password(self, password):
         """Verifies if the provided password matches the hashed password."""
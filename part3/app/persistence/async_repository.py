@@ -0,0 +1,230 @@
+"""
+Ce fichier définit AsyncSQLAlchemyRepository, la version asynchrone de
+SQLAlchemyRepository construite sur SQLAlchemy asyncio (AsyncSession,
+aiosqlite en local).
+
+Il respecte le même contrat Repository (mêmes méthodes, mêmes paramètres et
+mêmes résultats) mais chaque méthode est une coroutine à attendre avec
+`await`, et iter_all est un générateur asynchrone (`async for`). Pendant
+l'aller-retour avec la base, la boucle d'événements sert les autres tâches
+au lieu de bloquer un thread.
+
+Chaque méthode utilise la session de la tâche courante (`async_db.session_scope()`)
+ou en ouvre une le temps de l'appel. Une relation ne peut pas être chargée à
+la demande hors `await` : celles dont les objets retournés ont besoin sont
+chargées d'avance par `load_options` (ex. `selectinload(Place.reviews)`).
+"""
+from contextlib import asynccontextmanager
+from sqlalchemy import and_, delete, func, insert, inspect, literal, or_, select, update
+from sqlalchemy.orm import lazyload
+from app.extensions import async_db
+from app.persistence.repository import (BULK_CHUNK_SIZE, IN_CLAUSE_CHUNK_SIZE, ITER_BATCH_SIZE,
+                                        UNIT_OF_WORK_KEY, Repository, SQLAlchemyRepository,
+                                        _parse_order_by, column_defaults, column_keys,
+                                        mark_written, values_validator)
+
+
+def in_async_unit_of_work(session):
+    """Indique si une unité de travail asynchrone est ouverte sur la session"""
+    return session.info.get(UNIT_OF_WORK_KEY, 0) > 0
+
+
+@asynccontextmanager
+async def async_unit_of_work():
+    """Regroupe toutes les écritures asynchrones du bloc dans une seule transaction"""
+    async with async_db.session_scope() as session:
+        depth = session.info.get(UNIT_OF_WORK_KEY, 0)
+        session.info[UNIT_OF_WORK_KEY] = depth + 1
+        try:
+            yield session
+        except BaseException:
+            session.info[UNIT_OF_WORK_KEY] = depth
+            if not depth:
+                await session.rollback()
+            raise
+        session.info[UNIT_OF_WORK_KEY] = depth
+        if not depth:
+            try:
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+
+async def async_commit(session):
+    """Commit immédiat hors unité de travail ; dans une unité, le commit est différé à sa fermeture"""
+    if not in_async_unit_of_work(session):
+        await session.commit()
+
+
+class AsyncSQLAlchemyRepository(Repository):
+    def __init__(self, model, load_options=()):
+        self.model = model
+        # Options de chargement des relations appliquées à chaque lecture d'objets
+        self.load_options = tuple(load_options)
+
+    def _select(self):
+        return select(self.model).options(*self.load_options)
+
+    async def add(self, obj):
+        async with async_db.session_scope() as session:
+            session.add(obj)
+            if in_async_unit_of_work(session):
+                await session.flush()
+            else:
+                await session.commit()
+
+    async def add_many(self, objs, chunk_size=BULK_CHUNK_SIZE):
+        """Insère des objets en masse avec des INSERT Core exécutés en executemany (voir SQLAlchemyRepository)"""
+        keys = column_keys(self.model)
+        defaults = column_defaults(self.model)
+        rows = []
+        for obj in objs:
+            row = {key: getattr(obj, key) for key in keys}
+            for key, default in defaults:
+                if row[key] is None:
+                    row[key] = default()
+                    setattr(obj, key, row[key])
+            rows.append(row)
+        return await self._insert_rows(rows, chunk_size)
+
+    def _values_validator(self):
+        return values_validator(self.model)
+
+    async def add_rows(self, rows, chunk_size=BULK_CHUNK_SIZE):
+        """Insère en masse des dictionnaires {colonne: valeur} validés ; retourne les ids insérés"""
+        defaults = column_defaults(self.model)
+        validate = self._values_validator()
+        prepared = []
+        for data in rows:
+            row = validate(data)
+            for key, default in defaults:
+                if row.get(key) is None:
+                    row[key] = default()
+            prepared.append(row)
+        await self._insert_rows(prepared, chunk_size)
+        return [row['id'] for row in prepared]
+
+    async def _insert_rows(self, rows, chunk_size):
+        table = self.model.__table__
+        async with async_db.session_scope() as session:
+            for start in range(0, len(rows), chunk_size):
+                await session.execute(insert(table), rows[start:start + chunk_size])
+                await async_commit(session)
+        return len(rows)
+
+    async def get(self, obj_id):
+        async with async_db.session_scope() as session:
+            return await session.get(self.model, obj_id, options=self.load_options)
+
+    async def get_many(self, ids):
+        ids = list(dict.fromkeys(ids))
+        found = {}
+        async with async_db.session_scope() as session:
+            for start in range(0, len(ids), IN_CLAUSE_CHUNK_SIZE):
+                chunk = ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+                for obj in await session.scalars(self._select().where(self.model.id.in_(chunk))):
+                    found[obj.id] = obj
+        return [found[obj_id] for obj_id in ids if obj_id in found]
+
+    async def get_all(self):
+        async with async_db.session_scope() as session:
+            return (await session.scalars(self._select())).all()
+
+    async def iter_all(self, batch_size=ITER_BATCH_SIZE):
+        """Parcourt toute la table en flux (`async for`), batch_size lignes à la fois.
+
+        Comme pour SQLAlchemyRepository.iter_all, les relations ne sont pas
+        chargées et chaque lot est détaché de la session une fois parcouru.
+        """
+        stmt = select(self.model).options(lazyload('*')).execution_options(yield_per=batch_size)
+        async with async_db.session_scope() as session:
+            result = await session.stream_scalars(stmt)
+            try:
+                async for batch in result.partitions():
+                    for obj in batch:
+                        yield obj
+                    for obj in batch:
+                        if obj in session and not inspect(obj).modified:
+                            session.expunge(obj)
+            finally:
+                await result.close()
+
+    async def update(self, obj_id, data):
+        async with async_db.session_scope() as session:
+            obj = await self.get(obj_id)
+            if obj:
+                for key, value in data.items():
+                    setattr(obj, key, value)
+                mark_written(self.model, [obj_id], session=session.sync_session)
+                await async_commit(session)
+
+    async def delete(self, obj_id):
+        """Suppression par l'ORM : l'objet est chargé pour appliquer les cascades des relations"""
+        async with async_db.session_scope() as session:
+            obj = await self.get(obj_id)
+            if not obj:
+                return 0
+            await session.delete(obj)
+            mark_written(self.model, [obj_id], session=session.sync_session)
+            await async_commit(session)
+            return 1
+
+    async def update_by_id(self, obj_id, data):
+        """UPDATE ... WHERE id = :id sans charger l'objet ; retourne le nombre de lignes modifiées"""
+        columns = set(column_keys(self.model)).difference(SQLAlchemyRepository.PROTECTED_COLUMNS)
+        values = self._values_validator()({key: value for key, value in data.items() if key in columns})
+        if not values:
+            return 0
+        async with async_db.session_scope() as session:
+            result = await session.execute(update(self.model).where(self.model.id == obj_id).values(**values))
+            if result.rowcount:
+                mark_written(self.model, [obj_id], session=session.sync_session)
+                await async_commit(session)
+            return result.rowcount
+
+    async def delete_by_id(self, obj_id):
+        """DELETE ... WHERE id = :id sans charger l'objet ni appliquer les cascades ORM"""
+        async with async_db.session_scope() as session:
+            result = await session.execute(delete(self.model).where(self.model.id == obj_id))
+            if result.rowcount:
+                mark_written(self.model, [obj_id], session=session.sync_session)
+                await async_commit(session)
+            return result.rowcount
+
+    async def get_by_attribute(self, attr_name, attr_value):
+        stmt = self._select().where(getattr(self.model, attr_name) == attr_value).limit(1)
+        async with async_db.session_scope() as session:
+            return (await session.scalars(stmt)).first()
+
+    async def exists(self, **filters):
+        stmt = select(literal(1)).select_from(self.model).filter_by(**filters).limit(1)
+        async with async_db.session_scope() as session:
+            return (await session.execute(stmt)).first() is not None
+
+    async def count(self, **filters):
+        stmt = select(func.count()).select_from(self.model).filter_by(**filters)
+        async with async_db.session_scope() as session:
+            return (await session.execute(stmt)).scalar_one()
+
+    async def get_page(self, after=None, limit=50, order_by='id', conditions=(), **filters):
+        attr_name, descending = _parse_order_by(order_by)
+        column = getattr(self.model, attr_name)
+        stmt = self._select().filter_by(**filters).where(*conditions)
+        if after is not None:
+            value, last_id = after
+            if descending:
+                stmt = stmt.where(or_(column < value, and_(column == value, self.model.id < last_id)))
+            else:
+                stmt = stmt.where(or_(column > value, and_(column == value, self.model.id > last_id)))
+        if descending:
+            stmt = stmt.order_by(column.desc(), self.model.id.desc())
+        else:
+            stmt = stmt.order_by(column.asc(), self.model.id.asc())
+        async with async_db.session_scope() as session:
+            rows = (await session.scalars(stmt.limit(limit + 1))).all()
+        items = rows[:limit]
+        next_after = None
+        if len(rows) > limit:
+            next_after = (getattr(items[-1], attr_name), items[-1].id)
+        return items, next_after
@@ -0,0 +1,156 @@
+"""
+Ce fichier fournit un cache mémoire local au processus, borné en taille (LRU)
+et en durée de vie (TTL), utilisé par les repositories pour éviter de relire
+en base des objets déjà chargés par une requête précédente.
+
+Le cache est propre à chaque processus : avec plusieurs workers, une écriture
+n'invalide que le cache du worker qui l'a faite, le TTL borne donc la durée
+pendant laquelle un autre worker peut servir une valeur périmée.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Cache clé -> valeur avec éviction LRU, expiration TTL et compteurs de statistiques"""
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self._discarded(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key, value):
+        # Appelé avec le verrou tenu
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            evicted, _ = self._data.popitem(last=False)
+            self._discarded(evicted)
+            self.evictions += 1
+
+    def _discarded(self, key):
+        """Appelé (verrou tenu) quand une entrée est évincée ou expire"""
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+
+class TaggedCache(LRUCache):
+    """Cache de résultats de requêtes invalidé par étiquettes (noms des tables lues).
+
+    Chaque entrée est enregistrée avec les tables dont elle dépend ;
+    `invalidate_tags` supprime toutes les entrées qui dépendent d'une table
+    modifiée. Un compteur de version par table empêche qu'un résultat lu
+    avant une écriture concurrente soit mis en cache après son invalidation.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self._keys_by_tag = {}
+        self._tags_by_key = {}
+        self._versions = {}
+        self.invalidations = 0
+
+    def get_or_load(self, key, tags, loader):
+        """Valeur en cache de key, ou résultat de loader() mis en cache sous les étiquettes tags"""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._lock:
+            versions = [self._versions.get(tag, 0) for tag in tags]
+        value = loader()
+        with self._lock:
+            if versions != [self._versions.get(tag, 0) for tag in tags]:
+                # Une table lue a été modifiée pendant le chargement : résultat non mis en cache
+                return value
+            self._discarded(key)
+            self._store(key, value)
+            if key in self._data:
+                self._tags_by_key[key] = tuple(tags)
+                for tag in tags:
+                    self._keys_by_tag.setdefault(tag, set()).add(key)
+        return value
+
+    def invalidate_tags(self, tags):
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+                for key in list(self._keys_by_tag.get(tag, ())):
+                    if self._data.pop(key, None) is not None:
+                        self.invalidations += 1
+                    self._discarded(key)
+
+    def _discarded(self, key):
+        for tag in self._tags_by_key.pop(key, ()):
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+            self._discarded(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._keys_by_tag.clear()
+            self._tags_by_key.clear()
+
+    def stats(self):
+        stats = super().stats()
+        stats['invalidations'] = self.invalidations
+        return stats
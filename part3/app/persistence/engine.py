@@ -0,0 +1,119 @@
+"""
+Ce fichier applique le profil de configuration SQLite (PRAGMA) aux moteurs SQLAlchemy,
+et fournit le moteur asynchrone (SQLAlchemy asyncio) utilisé par les repositories async.
+
+Les PRAGMA comme `journal_mode`, `synchronous` ou `busy_timeout` sont propres
+à chaque connexion SQLite : ils sont donc exécutés par un hook sur l'événement
+`connect` du moteur, pour chaque nouvelle connexion ouverte par le pool.
+Les moteurs d'autres SGBD (MySQL...) sont ignorés.
+"""
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# Pilote asynchrone utilisé pour chaque SGBD quand l'URL n'en précise pas
+ASYNC_DRIVERS = {
+    'sqlite': 'aiosqlite',
+    'mysql': 'aiomysql',
+    'postgresql': 'asyncpg',
+}
+
+
+def apply_sqlite_pragmas(engine, pragmas):
+    """Enregistre un hook `connect` exécutant les PRAGMA donnés sur chaque nouvelle connexion"""
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+
+def async_database_url(url):
+    """URL de la même base avec un pilote asynchrone (sqlite:/// -> sqlite+aiosqlite:///)"""
+    url = make_url(url)
+    backend, _, driver = url.drivername.partition('+')
+    if driver and driver in ASYNC_DRIVERS.values():
+        return url
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver known for {backend}")
+    return url.set(drivername=f'{backend}+{ASYNC_DRIVERS[backend]}')
+
+
+class AsyncDatabase:
+    """Pendant asynchrone de `db` : moteur AsyncEngine et AsyncSession de la tâche courante.
+
+    Le moteur est créé à la première utilisation (le pilote asynchrone n'est
+    importé que si le code async sert). Chaque tâche ouvre sa session avec
+    `async with async_db.session_scope():`, les repositories y accèdent par
+    `async_db.session` comme les repositories synchrones par `db.session`.
+    """
+
+    def __init__(self):
+        self.url = None
+        self.engine_options = {}
+        self.pragmas = {}
+        self._engine = None
+        self._sessionmaker = None
+        self._session = ContextVar('hbnb_async_session', default=None)
+
+    def init_app(self, app):
+        self.url = async_database_url(app.config.get('ASYNC_DATABASE_URI')
+                                      or app.config['SQLALCHEMY_DATABASE_URI'])
+        self.engine_options = app.config.get('ASYNC_ENGINE_OPTIONS', {})
+        self.pragmas = app.config.get('SQLITE_PRAGMAS', {})
+        self._engine = None
+        self._sessionmaker = None
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+            if self.url is None:
+                raise RuntimeError("AsyncDatabase is not initialised, call init_app() first")
+            self._engine = create_async_engine(self.url, **self.engine_options)
+            apply_sqlite_pragmas(self._engine.sync_engine, self.pragmas)
+            # expire_on_commit=False : un objet relu après le commit déclencherait une requête implicite,
+            # impossible hors `await`
+            self._sessionmaker = async_sessionmaker(self._engine, expire_on_commit=False)
+        return self._engine
+
+    @property
+    def session(self):
+        session = self._session.get()
+        if session is None:
+            raise RuntimeError("No async session, use `async with async_db.session_scope():`")
+        return session
+
+    @asynccontextmanager
+    async def session_scope(self):
+        """Ouvre une AsyncSession pour la tâche courante (réutilise celle d'un bloc englobant)"""
+        session = self._session.get()
+        if session is not None:
+            yield session
+            return
+        self.engine
+        session = self._sessionmaker()
+        token = self._session.set(session)
+        try:
+            yield session
+        finally:
+            self._session.reset(token)
+            await session.close()
+
+    async def create_all(self, metadata):
+        async with self.engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+
+    async def dispose(self):
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+            self._sessionmaker = None
@@ -1,5 +1,198 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from itertools import chain
+from sqlalchemy import and_, bindparam, delete, event, func, insert, inspect, literal, or_, select, update
+from sqlalchemy.orm import Session, lazyload, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
 from app.extensions import db
+from app.persistence.cache import LRUCache, TaggedCache
+from app.persistence.routing import WRITE_MARKER_KEY, has_writes
+
+# Unité de travail (unit of work) : tant qu'une unité est ouverte sur la session,
+# les repositories ne committent plus après chaque opération ; un seul commit
+# (donc un seul fsync) est fait à la fermeture de l'unité, ou un rollback en cas d'erreur.
+# La profondeur est stockée dans `Session.info`, propre à chaque session (et donc à chaque requête).
+UNIT_OF_WORK_KEY = 'hbnb_unit_of_work'
+
+# Nombre de lignes envoyées par INSERT executemany (et par transaction) lors des insertions en masse
+BULK_CHUNK_SIZE = 10000
+
+# Nombre de lignes lues (puis détachées de la session) par lot lors d'un parcours iter_all
+ITER_BATCH_SIZE = 1000
+
+# Nombre maximal d'ids par clause `IN (...)` (SQLite limite le nombre de paramètres d'une requête)
+IN_CLAUSE_CHUNK_SIZE = 500
+
+
+def in_unit_of_work():
+    """Indique si une unité de travail est ouverte sur la session courante"""
+    return db.session.info.get(UNIT_OF_WORK_KEY, 0) > 0
+
+
+def begin_unit_of_work():
+    """Ouvre une unité de travail (les unités imbriquées sont fusionnées dans la plus externe)"""
+    db.session.info[UNIT_OF_WORK_KEY] = db.session.info.get(UNIT_OF_WORK_KEY, 0) + 1
+
+
+def end_unit_of_work(success=True):
+    """Ferme l'unité de travail : commit si success, rollback sinon (uniquement pour la plus externe)"""
+    depth = db.session.info.get(UNIT_OF_WORK_KEY, 0) - 1
+    db.session.info[UNIT_OF_WORK_KEY] = max(depth, 0)
+    if depth > 0:
+        return
+    if not success:
+        db.session.rollback()
+        return
+    try:
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+@contextmanager
+def unit_of_work():
+    """Regroupe toutes les écritures du bloc dans une seule transaction"""
+    begin_unit_of_work()
+    try:
+        yield db.session
+    except BaseException:
+        end_unit_of_work(success=False)
+        raise
+    end_unit_of_work(success=True)
+
+
+# Identités (modèle, id) modifiées ou supprimées pendant la transaction en cours
+STALE_IDENTITIES_KEY = 'hbnb_stale_identities'
+
+# Caches d'identité actifs, par classe de modèle (voir SQLAlchemyRepository.enable_cache)
+_identity_caches = {}
+
+# Tables modifiées pendant la transaction en cours (étiquettes du cache de requêtes)
+STALE_TABLES_KEY = 'hbnb_stale_tables'
+
+# Cache de résultats de requêtes, étiqueté par table (voir configure_query_cache et cached_query)
+_query_cache = None
+
+
+def configure_query_cache(options):
+    """Active le cache de résultats de requêtes avec options ({'maxsize': ..., 'ttl': ...}), ou le désactive"""
+    global _query_cache
+    _query_cache = TaggedCache(**options) if options else None
+    return _query_cache
+
+
+def get_query_cache():
+    return _query_cache
+
+
+def cached_query(key, tables, loader):
+    """Résultat de loader() servi par le cache de requêtes sous key.
+
+    tables liste les tables lues par loader : toute écriture (flush ORM ou
+    requête INSERT / UPDATE / DELETE de la session) sur l'une d'elles
+    invalide l'entrée. Le résultat doit être indépendant de la session
+    (dictionnaires, listes...), jamais des objets ORM. Sans cache, ou si la
+    session a déjà écrit (lecture de ses propres écritures), loader() est
+    appelé directement.
+    """
+    cache = _query_cache
+    if cache is None or session_has_writes():
+        return loader()
+    return cache.get_or_load(key, tables, loader)
+
+
+def _mark_stale_tables(session, tables):
+    if tables and _query_cache is not None:
+        session.info.setdefault(STALE_TABLES_KEY, set()).update(tables)
+        _query_cache.invalidate_tags(tables)
+
+
+def _flushed_tables(session):
+    """Tables (et tables d'association modifiées) des objets écrits par le flush en cours"""
+    tables = set()
+    for obj in chain(session.new, session.deleted):
+        mapper = inspect(obj).mapper
+        tables.update(table.name for table in mapper.tables)
+        tables.update(rel.secondary.name for rel in mapper.relationships if rel.secondary is not None)
+    for obj in session.dirty:
+        state = inspect(obj)
+        tables.update(table.name for table in state.mapper.tables)
+        tables.update(rel.secondary.name for rel in state.mapper.relationships
+                      if rel.secondary is not None and state.attrs[rel.key].history.has_changes())
+    return tables
+
+
+def session_has_writes():
+    """Indique si la session courante a déjà écrit ou a des modifications en attente"""
+    return has_writes(db.session)
+
+
+def mark_written(model=None, ids=(), session=None):
+    """Signale une écriture faite hors flush ORM (requête Core) et les identités devenues périmées.
+
+    `session` est par défaut `db.session` ; le code asynchrone passe la session
+    synchrone de son AsyncSession (`AsyncSession.sync_session`).
+    """
+    session = session if session is not None else db.session
+    session.info[WRITE_MARKER_KEY] = True
+    if model is not None and ids:
+        identities = {(model, obj_id) for obj_id in ids}
+        session.info.setdefault(STALE_IDENTITIES_KEY, set()).update(identities)
+        _invalidate_identities(identities)
+
+
+def _invalidate_identities(identities):
+    for model, obj_id in identities:
+        cache = _identity_caches.get(model)
+        if cache is not None:
+            cache.invalidate(obj_id)
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_flushed_writes(session, flush_context):
+    # Les objets modifiés ou supprimés (cascades comprises) sont invalidés dès le flush,
+    # puis une seconde fois après le commit : une lecture concurrente faite entre les deux
+    # ne peut ainsi pas laisser en cache l'état d'avant le commit.
+    session.info[WRITE_MARKER_KEY] = True
+    identities = {(type(obj), obj.id) for obj in chain(session.dirty, session.deleted)
+                  if type(obj) in _identity_caches}
+    if identities:
+        session.info.setdefault(STALE_IDENTITIES_KEY, set()).update(identities)
+        _invalidate_identities(identities)
+    if _query_cache is not None:
+        _mark_stale_tables(session, _flushed_tables(session))
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_executed_writes(orm_execute_state):
+    # Requêtes INSERT / UPDATE / DELETE exécutées par la session hors flush (update_by_id, insertions en masse...)
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        # La suite de la requête lit ses propres écritures (ni cache, ni réplique)
+        orm_execute_state.session.info[WRITE_MARKER_KEY] = True
+        table = getattr(orm_execute_state.statement, 'table', None)
+        if table is not None:
+            _mark_stale_tables(orm_execute_state.session, {table.name})
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed_writes(session):
+    _invalidate_identities(session.info.pop(STALE_IDENTITIES_KEY, ()))
+    if _query_cache is not None:
+        _query_cache.invalidate_tags(session.info.pop(STALE_TABLES_KEY, ()))
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_rolled_back_writes(session):
+    _invalidate_identities(session.info.pop(STALE_IDENTITIES_KEY, ()))
+    if _query_cache is not None:
+        _query_cache.invalidate_tags(session.info.pop(STALE_TABLES_KEY, ()))
+
+
+def commit():
+    """Commit immédiat hors unité de travail ; dans une unité, le commit est différé à sa fermeture"""
+    if not in_unit_of_work():
+        db.session.commit()
 
 # Ceci est une classe abstraite définissant une interface commune pour les repositories.
 # Elle impose que toute classe héritant de Repository doive implémenter ces méthodes,
@@ -9,14 +202,29 @@ class Repository(ABC):
     def add(self, obj):
         pass
 
+    @abstractmethod
+    def add_many(self, objs):
+        """Insère un lot de nouveaux objets et retourne le nombre d'objets insérés"""
+        pass
+
     @abstractmethod
     def get(self, obj_id):
         pass
 
+    @abstractmethod
+    def get_many(self, ids):
+        """Retourne les objets d'ids, dans l'ordre d'ids (les ids inconnus sont ignorés)"""
+        pass
+
     @abstractmethod
     def get_all(self):
         pass
 
+    @abstractmethod
+    def iter_all(self, batch_size=ITER_BATCH_SIZE):
+        """Parcourt tous les objets, chargés batch_size à la fois"""
+        pass
+
     @abstractmethod
     def update(self, obj_id, data):
         pass
@@ -25,10 +233,81 @@ class Repository(ABC):
     def delete(self, obj_id):
         pass
 
+    @abstractmethod
+    def update_by_id(self, obj_id, data):
+        """Met à jour la ligne obj_id sans la charger ; retourne le nombre de lignes modifiées"""
+        pass
+
+    @abstractmethod
+    def delete_by_id(self, obj_id):
+        """Supprime la ligne obj_id sans la charger (sans cascade ORM) ; retourne le nombre de lignes supprimées"""
+        pass
+
     @abstractmethod
     def get_by_attribute(self, attr_name, attr_value):
         pass
 
+    @abstractmethod
+    def exists(self, **filters):
+        """Indique si au moins un objet correspond aux filtres d'égalité"""
+        pass
+
+    @abstractmethod
+    def count(self, **filters):
+        """Retourne le nombre d'objets correspondant aux filtres d'égalité"""
+        pass
+
+    @abstractmethod
+    def get_page(self, after=None, limit=50, order_by='id', **filters):
+        """Retourne (éléments, next_after) d'une page, paginée par clé (keyset).
+
+        `after` est la clé du dernier élément de la page précédente, telle que
+        retournée dans `next_after`, et `order_by` un nom de colonne, précédé
+        de '-' pour un tri décroissant.
+        """
+        pass
+
+
+def values_validator(model):
+    """Fonction appliquant les validateurs `@validates` du modèle à un dictionnaire de valeurs"""
+    mapper = inspect(model)
+    # Instance vide (sans __init__) servant de `self` aux validateurs
+    target = mapper.class_manager.new_instance()
+    validators = [(key, validator) for key, (validator, _) in mapper.validators.items()]
+
+    def validate(data):
+        values = dict(data)
+        for key, validator in validators:
+            if key in values:
+                values[key] = validator(target, key, values[key])
+        return values
+    return validate
+
+
+def column_keys(model):
+    return [attr.key for attr in inspect(model).column_attrs]
+
+
+def column_defaults(model):
+    """Liste (colonne, fabrique) des valeurs par défaut Python des colonnes (id, dates)"""
+    defaults = []
+    for column in model.__table__.columns:
+        default = column.default
+        if default is None:
+            continue
+        if default.is_callable:
+            defaults.append((column.key, lambda default=default: default.arg(None)))
+        else:
+            defaults.append((column.key, lambda default=default: default.arg))
+    return defaults
+
+
+def _parse_order_by(order_by):
+    """Découpe 'price' / '-price' en (nom de l'attribut, tri décroissant)"""
+    if order_by.startswith('-'):
+        return order_by[1:], True
+    return order_by, False
+
 
 class InMemoryRepository(Repository):
     def __init__(self):
@@ -37,12 +316,26 @@ class InMemoryRepository(Repository):
     def add(self, obj):
         self._storage[obj.id] = obj
 
+    def add_many(self, objs):
+        count = 0
+        for obj in objs:
+            self.add(obj)
+            count += 1
+        return count
+
     def get(self, obj_id):
         return self._storage.get(obj_id)
 
+    def get_many(self, ids):
+        return [self._storage[obj_id] for obj_id in dict.fromkeys(ids) if obj_id in self._storage]
+
     def get_all(self):
         return list(self._storage.values())
 
+    def iter_all(self, batch_size=ITER_BATCH_SIZE):
+        # Parcours d'une copie des objets : le dictionnaire peut être modifié pendant l'itération
+        yield from list(self._storage.values())
+
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
@@ -51,36 +344,326 @@ class InMemoryRepository(Repository):
     def delete(self, obj_id):
         if obj_id in self._storage:
             del self._storage[obj_id]
+            return 1
+        return 0
+
+    def update_by_id(self, obj_id, data):
+        obj = self.get(obj_id)
+        if not obj:
+            return 0
+        obj.update(data)
+        return 1
+
+    def delete_by_id(self, obj_id):
+        return self.delete(obj_id)
 
     def get_by_attribute(self, attr_name, attr_value):
         return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
 
+    def exists(self, **filters):
+        return any(all(getattr(obj, k) == v for k, v in filters.items()) for obj in self._storage.values())
+
+    def count(self, **filters):
+        if not filters:
+            return len(self._storage)
+        return sum(1 for obj in self._storage.values() if all(getattr(obj, k) == v for k, v in filters.items()))
+
+    def get_page(self, after=None, limit=50, order_by='id', **filters):
+        attr_name, descending = _parse_order_by(order_by)
+        objs = [obj for obj in self._storage.values()
+                if all(getattr(obj, k) == v for k, v in filters.items())]
+        objs.sort(key=lambda obj: (getattr(obj, attr_name), obj.id), reverse=descending)
+        if after is not None:
+            after = tuple(after)
+            if descending:
+                objs = [obj for obj in objs if (getattr(obj, attr_name), obj.id) < after]
+            else:
+                objs = [obj for obj in objs if (getattr(obj, attr_name), obj.id) > after]
+        items = objs[:limit]
+        next_after = None
+        if len(objs) > limit:
+            next_after = (getattr(items[-1], attr_name), items[-1].id)
+        return items, next_after
+
 class SQLAlchemyRepository(Repository):
-    def __init__(self, model):
+    def __init__(self, model, loading_profiles=None):
         self.model = model
+        self.cache = None
+        # Profils de chargement des relations, par nom (voir services/repositories/loading_profiles.py)
+        self.loading_profiles = dict(loading_profiles or {})
+        # Requêtes construites une seule fois (voir prepared) : leur SQL compilé est ensuite
+        # retrouvé dans le cache de compilation du moteur sans reconstruire l'expression
+        self._statements = {}
+
+    def prepared(self, name, build):
+        """Requête de build() construite au premier appel puis réutilisée sous name.
+
+        Les valeurs variables passent par des `bindparam` fournis à l'exécution
+        (`db.session.scalars(stmt, {'value': ...})`) : l'expression n'est plus
+        reconstruite à chaque appel et sa clé de cache de compilation reste la même.
+        """
+        stmt = self._statements.get(name)
+        if stmt is None:
+            stmt = self._statements[name] = build()
+        return stmt
+
+    def load_options(self, profile):
+        """Options de chargement du profil nommé (aucune pour None)"""
+        if profile is None:
+            return ()
+        try:
+            return self.loading_profiles[profile]
+        except KeyError:
+            raise ValueError(f"Unknown loading profile for {self.model.__name__}: {profile}")
+
+    def _lookup_statement(self, attr_name, profile=None):
+        """SELECT ... WHERE attr_name = :value LIMIT 1, avec les options du profil"""
+        return self.prepared(('lookup', attr_name, profile), lambda: select(self.model).options(
+            *self.load_options(profile)).where(getattr(self.model, attr_name) == bindparam('value')).limit(1))
+
+    def enable_cache(self, maxsize=1024, ttl=60):
+        """Active le cache d'identité (lecture traversante) de get() pour ce modèle"""
+        self.cache = LRUCache(maxsize=maxsize, ttl=ttl)
+        _identity_caches[self.model] = self.cache
+
+    def disable_cache(self):
+        self.cache = None
+        _identity_caches.pop(self.model, None)
+
+    def cached(self, name, args, loader, tables=()):
+        """Résultat de loader() mis en cache sous (table, name, args), invalidé par les écritures
+        sur la table du modèle ou sur les tables supplémentaires lues par loader (voir cached_query)"""
+        table = self.model.__tablename__
+        return cached_query((table, name) + tuple(args), (table,) + tuple(tables), loader)
+
+    def invalidate(self, obj_id):
+        """Retire un objet du cache d'identité après une modification faite hors repository"""
+        if self.cache is not None:
+            mark_written(self.model, [obj_id])
 
     def add(self, obj):
         db.session.add(obj)
-        db.session.commit()
+        if in_unit_of_work():
+            # Le flush attribue les valeurs par défaut (id, dates) et remonte les erreurs
+            # d'intégrité tout de suite, mais le commit reste différé
+            db.session.flush()
+        else:
+            db.session.commit()
 
-    def get(self, obj_id):
-        return self.model.query.get(obj_id)
+    def add_many(self, objs, chunk_size=BULK_CHUNK_SIZE):
+        """Insère des objets en masse avec des INSERT Core exécutés en executemany.
 
-    def get_all(self):
-        return self.model.query.all()
+        Les objets sont construits (et donc validés) par le code appelant ; ils
+        ne sont pas ajoutés à la session et restent transients, mais reçoivent
+        les valeurs par défaut générées (id, dates).
+        """
+        column_defaults = self._column_defaults()
+        rows = []
+        for obj in objs:
+            row = {}
+            for key in self._column_keys():
+                row[key] = getattr(obj, key)
+            for key, default in column_defaults:
+                if row[key] is None:
+                    row[key] = default()
+                    setattr(obj, key, row[key])
+            rows.append(row)
+        return self._insert_rows(rows, chunk_size)
+
+    def add_rows(self, rows, chunk_size=BULK_CHUNK_SIZE):
+        """Insère en masse des dictionnaires {colonne: valeur} sans construire d'objets ORM.
+
+        Chaque ligne passe par les validateurs `@validates` du modèle, puis
+        reçoit les valeurs par défaut des colonnes absentes. Retourne les ids
+        des lignes insérées.
+        """
+        column_defaults = self._column_defaults()
+        validate = self._values_validator()
+        prepared = []
+        for data in rows:
+            row = validate(data)
+            for key, default in column_defaults:
+                if row.get(key) is None:
+                    row[key] = default()
+            prepared.append(row)
+        self._insert_rows(prepared, chunk_size)
+        return [row['id'] for row in prepared]
+
+    def validate_values(self, data):
+        """Applique les validateurs `@validates` du modèle aux valeurs de data, sans objet ORM"""
+        return self._values_validator()(data)
+
+    def _values_validator(self):
+        return values_validator(self.model)
+
+    def _column_keys(self):
+        return column_keys(self.model)
+
+    def _column_defaults(self):
+        return column_defaults(self.model)
+
+    def _insert_rows(self, rows, chunk_size):
+        """INSERT executemany par lots ; chaque lot est committé dans sa propre transaction
+        (sauf dans une unité de travail, qui garde la main sur le commit)"""
+        table = self.model.__table__
+        for start in range(0, len(rows), chunk_size):
+            db.session.execute(insert(table), rows[start:start + chunk_size])
+            commit()
+        return len(rows)
+
+    def get(self, obj_id, profile=None):
+        # Un profil charge des relations : le cache d'identité, qui ne garde que les colonnes, est ignoré
+        if self.cache is None or profile is not None or session_has_writes():
+            return self._load(obj_id, profile)
+        values = self.cache.get(obj_id)
+        if values is not None:
+            return self._attach_cached(values)
+        obj = self._load(obj_id)
+        if obj is not None:
+            self.cache.set(obj_id, {key: getattr(obj, key) for key in self._column_keys()})
+        return obj
+
+    def _load(self, obj_id, profile=None):
+        """Objet déjà présent dans la session, sinon SELECT par clé primaire préparé"""
+        if inspect(self.model).identity_key_from_primary_key([obj_id]) in db.session.identity_map:
+            return db.session.get(self.model, obj_id)
+        # unique() : requis par SQLAlchemy quand le profil joint une collection (joinedload)
+        return db.session.scalars(self._lookup_statement('id', profile), {'value': obj_id}).unique().first()
+
+    def _attach_cached(self, values):
+        """Rattache à la session un objet reconstruit depuis le cache, sans requête SQL"""
+        mapper = inspect(self.model)
+        existing = db.session.identity_map.get(mapper.identity_key_from_primary_key([values['id']]))
+        if existing is not None:
+            return existing
+        obj = mapper.class_manager.new_instance()
+        for key, value in values.items():
+            set_committed_value(obj, key, value)
+        make_transient_to_detached(obj)
+        return db.session.merge(obj, load=False)
+
+    def get_many(self, ids, profile=None):
+        # Une requête `WHERE id IN (...)` au lieu d'un SELECT par id ; les très longues
+        # listes sont découpées pour rester sous la limite de paramètres du SGBD
+        ids = list(dict.fromkeys(ids))
+        found = {}
+        for start in range(0, len(ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+            for obj in self.model.query.options(*self.load_options(profile)).filter(self.model.id.in_(chunk)):
+                found[obj.id] = obj
+        return [found[obj_id] for obj_id in ids if obj_id in found]
+
+    def get_all(self, profile=None):
+        return self.model.query.options(*self.load_options(profile)).all()
+
+    def iter_all(self, batch_size=ITER_BATCH_SIZE):
+        """Parcourt toute la table en flux, batch_size lignes à la fois, à mémoire constante.
+
+        Les lignes sont lues avec `yield_per` (curseur côté serveur quand le SGBD
+        le permet) et chaque lot est détaché de la session une fois parcouru :
+        les objets ne doivent donc pas être conservés ni modifiés après le
+        passage au lot suivant. Le chargement anticipé des relations est
+        désactivé (incompatible avec yield_per) : une relation lue sur un objet
+        est chargée à la demande.
+        """
+        stmt = select(self.model).options(lazyload('*')).execution_options(yield_per=batch_size)
+        result = db.session.execute(stmt)
+        try:
+            for batch in result.scalars().partitions():
+                yield from batch
+                for obj in batch:
+                    # Un objet modifié pendant le parcours reste dans la session pour être sauvegardé
+                    if obj in db.session and not inspect(obj).modified:
+                        db.session.expunge(obj)
+        finally:
+            result.close()
 
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
             for key, value in data.items():
                 setattr(obj, key, value)
-            db.session.commit()
+            self.invalidate(obj_id)
+            commit()
 
     def delete(self, obj_id):
+        """Suppression par l'ORM : l'objet est chargé pour appliquer les cascades des relations"""
         obj = self.get(obj_id)
-        if obj:
-            db.session.delete(obj)
-            db.session.commit()
+        if not obj:
+            return 0
+        db.session.delete(obj)
+        self.invalidate(obj_id)
+        commit()
+        return 1
 
-    def get_by_attribute(self, attr_name, attr_value):
-        return self.model.query.filter(getattr(self.model, attr_name) == attr_value).first()
+    # Colonnes jamais modifiées par update_by_id (updated_at est rempli par son `onupdate`)
+    PROTECTED_COLUMNS = ('id', 'created_at', 'updated_at')
+
+    def update_by_id(self, obj_id, data):
+        """UPDATE ... WHERE id = :id sans charger l'objet ; retourne le nombre de lignes modifiées.
+
+        Les valeurs passent par les validateurs `@validates` du modèle ; les clés
+        qui ne sont pas des colonnes (ou protégées) sont ignorées. Les objets déjà
+        présents dans la session sont synchronisés par SQLAlchemy.
+        """
+        columns = set(self._column_keys()).difference(self.PROTECTED_COLUMNS)
+        values = self.validate_values({key: value for key, value in data.items() if key in columns})
+        if not values:
+            return 0
+        result = db.session.execute(update(self.model).where(self.model.id == obj_id).values(**values))
+        if result.rowcount:
+            mark_written(self.model, [obj_id])
+            commit()
+        return result.rowcount
+
+    def delete_by_id(self, obj_id):
+        """DELETE ... WHERE id = :id sans charger l'objet ni appliquer les cascades ORM ;
+        retourne le nombre de lignes supprimées"""
+        result = db.session.execute(delete(self.model).where(self.model.id == obj_id))
+        if result.rowcount:
+            mark_written(self.model, [obj_id])
+            commit()
+        return result.rowcount
+
+    def get_by_attribute(self, attr_name, attr_value, profile=None):
+        return db.session.scalars(self._lookup_statement(attr_name, profile), {'value': attr_value}).unique().first()
+
+    def exists(self, **filters):
+        """SELECT 1 ... LIMIT 1 : teste l'existence sans charger d'objet ORM"""
+        keys = tuple(sorted(filters))
+        stmt = self.prepared(('exists', keys), lambda: select(literal(1)).select_from(self.model).where(
+            *(getattr(self.model, key) == bindparam(key) for key in keys)).limit(1))
+        return db.session.execute(stmt, filters).first() is not None
+
+    def count(self, **filters):
+        """SELECT COUNT(*) ... : compte les lignes sans les charger"""
+        keys = tuple(sorted(filters))
+        stmt = self.prepared(('count', keys), lambda: select(func.count()).select_from(self.model).where(
+            *(getattr(self.model, key) == bindparam(key) for key in keys)))
+        return db.session.execute(stmt, filters).scalar_one()
+
+    def get_page(self, after=None, limit=50, order_by='id', conditions=(), profile=None, **filters):
+        """Voir Repository.get_page ; conditions ajoute des expressions SQLAlchemy au WHERE
+        (ex. `Place.rating_avg >= 4`) en plus des filtres d'égalité, profile charge les relations"""
+        attr_name, descending = _parse_order_by(order_by)
+        column = getattr(self.model, attr_name)
+        query = self.model.query.options(*self.load_options(profile)).filter_by(**filters).filter(*conditions)
+        if after is not None:
+            # Keyset : on reprend juste après la clé (valeur triée, id) du dernier élément
+            # de la page précédente, ce qui évite un OFFSET qui parcourt toute la table.
+            value, last_id = after
+            if descending:
+                query = query.filter(or_(column < value, and_(column == value, self.model.id < last_id)))
+            else:
+                query = query.filter(or_(column > value, and_(column == value, self.model.id > last_id)))
+        if descending:
+            query = query.order_by(column.desc(), self.model.id.desc())
+        else:
+            query = query.order_by(column.asc(), self.model.id.asc())
+        # Une ligne de plus que demandé indique s'il existe une page suivante
+        rows = query.limit(limit + 1).all()
+        items = rows[:limit]
+        next_after = None
+        if len(rows) > limit:
+            next_after = (getattr(items[-1], attr_name), items[-1].id)
+        return items, next_after
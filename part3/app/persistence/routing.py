@@ -0,0 +1,111 @@
+"""
+Ce fichier route les lectures SQL vers des répliques en lecture seule.
+
+Les répliques sont déclarées comme des binds Flask-SQLAlchemy
+(`SQLALCHEMY_BINDS = {'replica_1': 'sqlite:///replica1.db', ...}`) dont les
+clés sont listées dans `READ_REPLICAS`. La session `RoutingSession` envoie un
+SELECT vers une réplique seulement si :
+
+- les lectures sur réplique sont autorisées pour la session (`REPLICA_READS_KEY`,
+  posé par `create_app` pour les requêtes GET / HEAD) ;
+- la session n'a encore rien écrit : après une écriture, toute la suite de la
+  requête lit sur la base primaire (lecture de ses propres écritures) ;
+- aucun flush n'est en cours.
+
+Les écritures (flush, INSERT / UPDATE / DELETE) vont toujours sur la primaire.
+Une réplique est choisie à tour de rôle (`round_robin`) ou par plus faible
+latence moyenne mesurée sur ses requêtes (`least_latency`).
+"""
+import threading
+import time
+from itertools import count
+
+from flask import current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+# Clé de `app.extensions` sous laquelle est rangé le routeur de répliques de l'application
+REPLICA_ROUTER_EXTENSION = 'hbnb_replica_router'
+
+# Marqueur de `Session.info` autorisant la session à lire sur les répliques
+REPLICA_READS_KEY = 'hbnb_replica_reads'
+
+# Marqueur posé dans `Session.info` dès que la session a écrit (flush ou requête DML) :
+# la suite de la requête ne doit alors plus lire de copies (cache, réplique).
+WRITE_MARKER_KEY = 'hbnb_wrote'
+
+# Poids de la dernière mesure dans la moyenne mobile exponentielle des latences
+LATENCY_SMOOTHING = 0.2
+
+
+def has_writes(session):
+    """Indique si la session a déjà écrit ou a des modifications en attente"""
+    return bool(session.info.get(WRITE_MARKER_KEY) or session.new or session.dirty or session.deleted)
+
+
+class ReplicaRouter:
+    """Choisit le moteur d'une réplique pour chaque lecture"""
+
+    STRATEGIES = ('round_robin', 'least_latency')
+
+    def __init__(self, engines, strategy='round_robin'):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown replica selection strategy: {strategy}")
+        self.engines = list(engines)
+        self.strategy = strategy
+        self._turn = count()
+        # Latence moyenne (en secondes) des requêtes de chaque réplique
+        self.latencies = {engine: 0.0 for engine in self.engines}
+        self._lock = threading.Lock()
+        if strategy == 'least_latency':
+            for engine in self.engines:
+                self._measure(engine)
+
+    def choose(self):
+        if self.strategy == 'least_latency':
+            return min(self.engines, key=self.latencies.__getitem__)
+        # next() sur un itertools.count est atomique : pas de verrou pour le tour de rôle
+        return self.engines[next(self._turn) % len(self.engines)]
+
+    def _measure(self, engine):
+        @event.listens_for(engine, 'before_cursor_execute')
+        def start_timer(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault('hbnb_query_start', []).append(time.perf_counter())
+
+        @event.listens_for(engine, 'after_cursor_execute')
+        def record_latency(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info['hbnb_query_start'].pop()
+            with self._lock:
+                previous = self.latencies[engine]
+                self.latencies[engine] = previous + LATENCY_SMOOTHING * (elapsed - previous)
+
+
+def configure_read_replicas(app, engines):
+    """Installe le routeur de répliques de l'application à partir de READ_REPLICAS.
+
+    `engines` est le dictionnaire {bind_key: moteur} de Flask-SQLAlchemy
+    (`db.engines`), qui doit être appelé dans le contexte de l'application.
+    """
+    keys = app.config.get('READ_REPLICAS', [])
+    if not keys:
+        app.extensions.pop(REPLICA_ROUTER_EXTENSION, None)
+        return None
+    missing = [key for key in keys if key not in engines]
+    if missing:
+        raise ValueError(f"READ_REPLICAS not found in SQLALCHEMY_BINDS: {', '.join(missing)}")
+    router = ReplicaRouter([engines[key] for key in keys],
+                           app.config.get('REPLICA_SELECTION', 'round_robin'))
+    app.extensions[REPLICA_ROUTER_EXTENSION] = router
+    return router
+
+
+class RoutingSession(Session):
+    """Session Flask-SQLAlchemy qui envoie les SELECT autorisés vers une réplique"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and getattr(clause, 'is_select', False)
+                and self.info.get(REPLICA_READS_KEY) and not has_writes(self)):
+            router = current_app.extensions.get(REPLICA_ROUTER_EXTENSION)
+            if router is not None:
+                return router.choose()
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
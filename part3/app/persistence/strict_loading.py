@@ -0,0 +1,40 @@
+"""
+Ce fichier définit le chargement strict des relations (`STRICT_LOADING`).
+
+Quand le mode est actif pour une session (`STRICT_LOADING_KEY` dans
+`Session.info`, posé par `create_app` pour les requêtes GET / HEAD), aucune
+relation ne peut être chargée à la demande :
+
+- chaque SELECT ORM reçoit l'option `raiseload('*', sql_only=True)` : l'accès
+  à une relation que la requête (ou le profil de chargement du repository)
+  n'a pas chargée lève une erreur au lieu d'émettre une requête ;
+- les objets chargés autrement (relations chargées par `selectinload`, objets
+  remis en session par le cache d'identité) n'ont pas reçu cette option : une
+  requête de chargement à la demande émise pour eux lève la même erreur.
+
+Les relations déjà chargées, et les relations plusieurs-vers-un dont l'objet
+lié est déjà dans la session, restent accessibles sans requête. Le mode est
+pensé pour les tests (voir TestingConfig) : un endpoint qui ajoute une requête
+par objet sérialisé échoue au lieu de ralentir silencieusement.
+"""
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session, raiseload
+
+# Marqueur de `Session.info` interdisant le chargement à la demande des relations
+STRICT_LOADING_KEY = 'hbnb_strict_loading'
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _enforce_strict_loading(orm_execute_state):
+    if not orm_execute_state.session.info.get(STRICT_LOADING_KEY):
+        return
+    lazy_parent = orm_execute_state.lazy_loaded_from
+    if lazy_parent is not None:
+        raise InvalidRequestError(
+            f"Lazy load of a relationship of {lazy_parent.class_.__name__} {lazy_parent.identity} "
+            f"is not allowed with STRICT_LOADING")
+    if orm_execute_state.is_select and not (orm_execute_state.is_column_load or
+                                            orm_execute_state.is_relationship_load):
+        # Le joker ne s'applique qu'aux relations sans option explicite : les profils restent prioritaires
+        orm_execute_state.statement = orm_execute_state.statement.options(raiseload('*', sql_only=True))
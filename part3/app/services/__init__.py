@@ -1,5 +1,8 @@
 from .facade import HBnBFacade
+from .async_facade import AsyncHBnBFacade
 
 facade = HBnBFacade()
+# Pendant asynchrone de la facade, pour les vues et tâches `async`
+async_facade = AsyncHBnBFacade()
 
-__all__ = ['facade']
\ No newline at end of file
+__all__ = ['facade', 'async_facade']
\ No newline at end of file
@@ -0,0 +1,221 @@
+"""
+Ce fichier définit AsyncHBnBFacade, le pendant asynchrone de HBnBFacade.
+
+Elle expose les mêmes opérations CRUD sur les utilisateurs, équipements,
+lieux et avis, sous forme de coroutines s'appuyant sur les repositories
+asynchrones (AsyncSession). Elle est destinée aux vues et tâches `async` :
+`await async_facade.get_place(place_id)`. Les opérations en plusieurs étapes
+partagent une même transaction (`async with async_facade.transaction():`).
+"""
+
+from app.services.repositories.async_repositories import (AsyncAmenityRepository, AsyncPlaceRepository,
+                                                         AsyncReviewRepository, AsyncUserRepository)
+from app.persistence.async_repository import async_commit, async_unit_of_work
+from app.persistence.repository import ITER_BATCH_SIZE
+
+from app.models.user import User
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+
+
+class AsyncHBnBFacade:
+    def __init__(self):
+        self.amenity_repo = AsyncAmenityRepository()
+        self.place_repo = AsyncPlaceRepository()
+        self.review_repo = AsyncReviewRepository()
+        self.user_repo = AsyncUserRepository()
+
+    def transaction(self):
+        """Unité de travail : `async with async_facade.transaction():` regroupe les écritures en un seul commit"""
+        return async_unit_of_work()
+
+    # UTILISATEUR
+    async def create_user(self, user_data):
+        user = User(**user_data)
+        await self.user_repo.add(user)
+        return user
+
+    async def bulk_create_users(self, users_data):
+        users = [User(**user_data) for user_data in users_data]
+        await self.user_repo.add_many(users)
+        return [user.id for user in users]
+
+    async def get_users(self):
+        return await self.user_repo.get_all()
+
+    def iter_users(self, batch_size=ITER_BATCH_SIZE):
+        return self.user_repo.iter_all(batch_size)
+
+    async def get_users_page(self, after=None, limit=50, order_by='id'):
+        return await self.user_repo.get_page(after=after, limit=limit, order_by=order_by)
+
+    async def get_user(self, user_id):
+        return await self.user_repo.get(user_id)
+
+    async def get_user_by_email(self, email):
+        return await self.user_repo.get_user_by_email(email)
+
+    async def email_exists(self, email):
+        return await self.user_repo.exists(email=email)
+
+    async def update_user(self, user_id, user_data):
+        if 'password' in user_data:
+            user_data['password'] = User.password_hash(user_data['password'])
+        return await self.user_repo.update_by_id(user_id, user_data)
+
+    async def delete_user(self, user_id):
+        async with self.transaction():
+            totals = await self.review_repo.rating_totals_by_place(user_id=user_id)
+            if not await self.user_repo.delete(user_id):
+                raise ValueError(f"User with id {user_id} not found")
+            for place_id, (count, total) in totals.items():
+                await self.place_repo.adjust_ratings(place_id, -count, -total)
+        return True
+
+    # ÉQUIPEMENT
+    async def create_amenity(self, amenity_data):
+        amenity = Amenity(**amenity_data)
+        await self.amenity_repo.add(amenity)
+        return amenity
+
+    async def amenity_name_exists(self, name):
+        return await self.amenity_repo.exists(name=name)
+
+    async def get_amenity(self, amenity_id):
+        return await self.amenity_repo.get(amenity_id)
+
+    async def get_amenities(self, amenity_ids):
+        return await self.amenity_repo.get_many(amenity_ids)
+
+    async def get_all_amenities(self):
+        return await self.amenity_repo.get_all()
+
+    def iter_amenities(self, batch_size=ITER_BATCH_SIZE):
+        return self.amenity_repo.iter_all(batch_size)
+
+    async def get_amenities_page(self, after=None, limit=50, order_by='id'):
+        return await self.amenity_repo.get_page(after=after, limit=limit, order_by=order_by)
+
+    async def update_amenity(self, amenity_id, amenity_data):
+        return await self.amenity_repo.update_by_id(amenity_id, amenity_data)
+
+    async def delete_amenity(self, amenity_id):
+        if not await self.amenity_repo.delete_by_id(amenity_id):
+            raise ValueError(f"Amenity with id {amenity_id} not found")
+        return True
+
+    # LIEU
+    async def create_place(self, place_data):
+        async with self.transaction():
+            user = await self.user_repo.get(place_data['owner_id'])
+            if not user:
+                raise ValueError('User not found')
+            amenities = await self.get_amenities(place_data['amenities']) if 'amenities' in place_data else []
+            place = Place(
+                title=place_data['title'],
+                price=place_data['price'],
+                latitude=place_data['latitude'],
+                longitude=place_data['longitude'],
+                description=place_data.get('description')
+            )
+            place.owner = user
+            # Collection initialisée : sinon, lue après le commit, elle déclencherait un chargement implicite
+            place.reviews = []
+            place.amenities.extend(amenities)
+            await self.place_repo.add(place)
+        return place
+
+    async def get_place(self, place_id):
+        return await self.place_repo.get(place_id)
+
+    async def get_all_places(self):
+        return await self.place_repo.get_all()
+
+    def iter_places(self, batch_size=ITER_BATCH_SIZE):
+        return self.place_repo.iter_all(batch_size)
+
+    async def get_places_page(self, after=None, limit=50, order_by='id'):
+        return await self.place_repo.get_page(after=after, limit=limit, order_by=order_by)
+
+    async def update_place(self, place_id, place_data):
+        async with self.transaction() as session:
+            place = await self.place_repo.get(place_id)
+            if not place:
+                raise ValueError(f"Place with id {place_id} not found")
+            for key, value in place_data.items():
+                if hasattr(place, key) and key not in ['id', 'owner_id', 'created_at', 'updated_at', 'amenities',
+                                                       *Place.DERIVED_COLUMNS]:
+                    setattr(place, key, value)
+            if 'amenities' in place_data:
+                place.amenities = await self.get_amenities(place_data['amenities'])
+            await async_commit(session)
+        return place
+
+    async def delete_place(self, place_id):
+        if not await self.place_repo.delete(place_id):
+            raise ValueError(f"Place with id {place_id} not found")
+        return True
+
+    # AVIS
+    async def create_review(self, review_data):
+        async with self.transaction():
+            place = await self.place_repo.get(review_data['place_id'])
+            if not place:
+                raise ValueError('Place not found')
+            user = await self.user_repo.get(review_data['user_id'])
+            if not user:
+                raise ValueError('Invalid user_id: user not found')
+            data = {key: value for key, value in review_data.items() if key not in ('place_id', 'user_id')}
+            review = Review(place=place, user=user, **data)
+            await self.review_repo.add(review)
+            await self.place_repo.adjust_ratings(place.id, 1, review.rating)
+        return review
+
+    async def get_review(self, review_id):
+        return await self.review_repo.get(review_id)
+
+    async def get_all_reviews(self):
+        return await self.review_repo.get_all()
+
+    def iter_reviews(self, batch_size=ITER_BATCH_SIZE):
+        return self.review_repo.iter_all(batch_size)
+
+    async def get_reviews_page(self, after=None, limit=50, order_by='id'):
+        return await self.review_repo.get_page(after=after, limit=limit, order_by=order_by)
+
+    async def get_reviews_by_place(self, place_id):
+        place = await self.place_repo.get(place_id)
+        if not place:
+            raise KeyError('Place not found')
+        return place.reviews
+
+    async def get_reviews_page_by_place(self, place_id, after=None, limit=50, order_by='id'):
+        if not await self.place_repo.exists(id=place_id):
+            raise KeyError('Place not found')
+        return await self.review_repo.get_page(after=after, limit=limit, order_by=order_by, place_id=place_id)
+
+    async def update_review(self, review_id, review_data):
+        async with self.transaction():
+            review = await self.review_repo.get(review_id)
+            if not review:
+                return 0
+            old_place_id, old_rating = review.place_id, review.rating
+            updated = await self.review_repo.update_by_id(review_id, review_data)
+            if updated and review.place_id != old_place_id:
+                await self.place_repo.adjust_ratings(old_place_id, -1, -old_rating)
+                await self.place_repo.adjust_ratings(review.place_id, 1, review.rating)
+            elif updated and review.rating != old_rating:
+                await self.place_repo.adjust_ratings(review.place_id, 0, review.rating - old_rating)
+        return updated
+
+    async def delete_review(self, review_id):
+        async with self.transaction():
+            review = await self.review_repo.get(review_id)
+            if not review:
+                raise ValueError(f"Review with id {review_id} not found")
+            place_id, rating = review.place_id, review.rating
+            if not await self.review_repo.delete_by_id(review_id):
+                raise ValueError(f"Review with id {review_id} not found")
+            await self.place_repo.adjust_ratings(place_id, -1, -rating)
+        return True
@@ -10,12 +10,17 @@ from app.services.repositories.user_repository import UserRepository
 from app.services.repositories.amenity_repository import AmenityRepository
 from app.services.repositories.place_repository import PlaceRepository
 from app.services.repositories.review_repository import ReviewRepository
-from app.extensions import db
+from app.persistence.repository import (ITER_BATCH_SIZE, commit, configure_query_cache, get_query_cache,
+                                        unit_of_work)
 
 from app.models.user import User
 from app.models.amenity import Amenity
 from app.models.place import Place
 from app.models.review import Review
+from app.models.serializers import serialize, serialize_all
+
+# Tables lues par la sérialisation d'un lieu (Place.to_dict inclut ses avis et ses amenities)
+PLACE_DETAIL_TABLES = ('reviews', 'amenities', 'place_amenity')
 
 class HBnBFacade:
     def __init__(self):
@@ -24,6 +29,32 @@ class HBnBFacade:
         self.review_repo = ReviewRepository()
         self.user_repo = UserRepository()
 
+    def configure_identity_cache(self, cache_config):
+        """Active le cache d'identité des repositories listés dans cache_config (clé = nom du modèle)"""
+        for repo in (self.amenity_repo, self.place_repo, self.review_repo, self.user_repo):
+            options = cache_config.get(repo.model.__name__)
+            if options:
+                repo.enable_cache(**options)
+            else:
+                repo.disable_cache()
+
+    def configure_query_cache(self, options):
+        """Active le cache de résultats des lectures `*_data` (voir QUERY_CACHE dans config.py)"""
+        configure_query_cache(options)
+
+    def get_cache_stats(self):
+        """Compteurs du cache d'identité (hits, misses, évictions...) par modèle, et du cache de requêtes"""
+        stats = {repo.model.__name__: repo.cache.stats()
+                 for repo in (self.amenity_repo, self.place_repo, self.review_repo, self.user_repo)
+                 if repo.cache is not None}
+        if get_query_cache() is not None:
+            stats['queries'] = get_query_cache().stats()
+        return stats
+
+    def transaction(self):
+        """Unité de travail : `with facade.transaction():` regroupe les écritures en un seul commit"""
+        return unit_of_work()
+
     # UTILISATEUR
     # Méthodes liées à la gestion des utilisateurs (CRUD basique via UserRepository)
     def create_user(self, user_data):
@@ -31,29 +62,45 @@ class HBnBFacade:
         self.user_repo.add(user)
         return user
     
+    def bulk_create_users(self, users_data):
+        """Crée des utilisateurs en masse (validation et hachage par le modèle) et retourne leurs ids"""
+        users = [User(**user_data) for user_data in users_data]
+        self.user_repo.add_many(users)
+        return [user.id for user in users]
+
     def get_users(self):
         return self.user_repo.get_all()
 
+    def iter_users(self, batch_size=ITER_BATCH_SIZE):
+        return self.user_repo.iter_all(batch_size)
+
+    def get_users_page(self, after=None, limit=50, order_by='id'):
+        return self.user_repo.get_page(after=after, limit=limit, order_by=order_by)
+
     def get_user(self, user_id):
         return self.user_repo.get(user_id)
 
     def get_user_by_email(self, email):
         return self.user_repo.get_user_by_email(email)
+
+    def email_exists(self, email):
+        return self.user_repo.exists(email=email)
     
     def update_user(self, user_id, user_data):
+        # UPDATE direct sans charger l'utilisateur ; le mot de passe est haché avant l'écriture
         if 'password' in user_data:
-            user = self.user_repo.get(user_id)
-            if user:
-                user.hash_password(user_data['password'])
-                del user_data['password']
-        self.user_repo.update(user_id, user_data)
+            user_data['password'] = User.password_hash(user_data['password'])
+        return self.user_repo.update_by_id(user_id, user_data)
 
     def delete_user(self, user_id):
-        user = self.user_repo.get(user_id)
-        
-        if not user:
-            raise ValueError(f"User with id {user_id} not found")
-        self.user_repo.delete(user_id)
+        # Suppression par l'ORM : les lieux et avis de l'utilisateur sont supprimés en cascade
+        with self.transaction():
+            # Les avis supprimés en cascade sont retirés des agrégats des lieux notés
+            totals = self.review_repo.rating_totals_by_place(user_id=user_id)
+            if not self.user_repo.delete(user_id):
+                raise ValueError(f"User with id {user_id} not found")
+            for place_id, (count, total) in totals.items():
+                self.place_repo.adjust_ratings(place_id, -count, -total)
         return True
 
     # ÉQUIPEMENT
@@ -63,21 +110,39 @@ class HBnBFacade:
         self.amenity_repo.add(amenity)
         return amenity
 
+    def amenity_name_exists(self, name):
+        return self.amenity_repo.exists(name=name)
+
     def get_amenity(self, amenity_id):
         return self.amenity_repo.get(amenity_id)
 
+    def get_amenities(self, amenity_ids):
+        return self.amenity_repo.get_many(amenity_ids)
+
     def get_all_amenities(self):
         return self.amenity_repo.get_all()
 
+    def iter_amenities(self, batch_size=ITER_BATCH_SIZE):
+        return self.amenity_repo.iter_all(batch_size)
+
+    def get_amenities_page(self, after=None, limit=50, order_by='id'):
+        return self.amenity_repo.get_page(after=after, limit=limit, order_by=order_by)
+
+    # Les méthodes `*_data` retournent des dictionnaires sérialisés, servis par le cache de requêtes
+    def get_amenities_page_data(self, after=None, limit=50, order_by='id'):
+        """(amenities sérialisées, next_after) d'une page de la liste des amenities"""
+        def load():
+            amenities, next_after = self.get_amenities_page(after=after, limit=limit, order_by=order_by)
+            return serialize_all(amenities), next_after
+        return self.amenity_repo.cached('get_page', (after, limit, order_by), load)
+
     def update_amenity(self, amenity_id, amenity_data):
-        self.amenity_repo.update(amenity_id, amenity_data)
+        return self.amenity_repo.update_by_id(amenity_id, amenity_data)
     
     def delete_amenity(self, amenity_id):
-        amenity = self.amenity_repo.get(amenity_id)
-        if not amenity:
+        # DELETE direct : seuls les liens place_amenity dépendent d'une amenity
+        if not self.amenity_repo.delete_by_id(amenity_id):
             raise ValueError(f"Amenity with id {amenity_id} not found")
-        
-        self.amenity_repo.delete(amenity_id)
         return True
 
     # LIEU
@@ -87,6 +152,10 @@ class HBnBFacade:
         if not user:
             raise ValueError('User not found')
 
+    # Les amenities (si présentes) sont chargées en une seule requête, avant de
+    # rattacher le lieu à son propriétaire pour éviter un autoflush prématuré
+        amenities = self.get_amenities(place_data['amenities']) if 'amenities' in place_data else []
+
     # Crée l'objet Place sans fournir l'attribut owner au constructeur
         place = Place(
             title=place_data['title'],
@@ -97,21 +166,73 @@ class HBnBFacade:
         )
         place.owner = user
 
-    # Gestion des amenities (si présentes)
-        if 'amenities' in place_data:
-            for amenity_id in place_data['amenities']:
-                amenity = self.get_amenity(amenity_id)
-                if amenity:
-                    place.amenities.append(amenity)
+        place.amenities.extend(amenities)
 
         self.place_repo.add(place)
         return place
 
+    def bulk_create_places(self, places_data):
+        """Crée des lieux en masse et retourne leurs ids.
+
+        owner_id et amenities doivent désigner des objets existants ; les
+        valeurs sont validées par les validateurs du modèle Place sans
+        construire d'objets ORM.
+        """
+        owner_ids = {place_data['owner_id'] for place_data in places_data}
+        if len(self.user_repo.get_many(owner_ids)) != len(owner_ids):
+            raise ValueError('User not found')
+        amenity_ids = {amenity_id for place_data in places_data
+                       for amenity_id in place_data.get('amenities', ())}
+        if len(self.amenity_repo.get_many(amenity_ids)) != len(amenity_ids):
+            raise ValueError('Amenity not found')
+
+        place_ids = self.place_repo.add_rows({
+            'title': place_data['title'],
+            'price': place_data['price'],
+            'latitude': place_data['latitude'],
+            'longitude': place_data['longitude'],
+            'description': place_data.get('description'),
+            'owner_id': place_data['owner_id'],
+        } for place_data in places_data)
+
+        # Les liens vers les amenities sont insérés une fois les ids des lieux générés
+        links = [(place_id, amenity_id)
+                 for place_id, place_data in zip(place_ids, places_data)
+                 for amenity_id in dict.fromkeys(place_data.get('amenities', ()))]
+        if links:
+            self.place_repo.add_amenity_links(links)
+        return place_ids
+
     def get_place(self, place_id):
         return self.place_repo.get(place_id)
 
+    def get_place_data(self, place_id):
+        """Lieu sérialisé (mêmes champs que Place.to_dict()), ou None s'il n'existe pas"""
+        def load():
+            place = self.place_repo.get(place_id, profile='detail')
+            return serialize(place) if place else None
+        return self.place_repo.cached('get', (place_id,), load, tables=PLACE_DETAIL_TABLES)
+
     def get_all_places(self):
-        return self.place_repo.get_all()
+        return self.place_repo.get_all(profile='list')
+
+    def iter_places(self, batch_size=ITER_BATCH_SIZE):
+        """Parcours en flux de tous les lieux (exports, traitements de masse)"""
+        return self.place_repo.iter_all(batch_size)
+
+    def get_places_nearby(self, latitude, longitude, radius_km, limit=50):
+        """Lieux à moins de radius_km du point, du plus proche au plus lointain : liste de (lieu, distance en km)"""
+        return self.place_repo.nearby(latitude, longitude, radius_km, limit=limit, profile='list')
+
+    def backfill_place_geohashes(self):
+        """Calcule le geohash des lieux créés avant la colonne ; retourne le nombre de lieux mis à jour"""
+        return self.place_repo.backfill_geohash()
+
+    def get_places_page(self, after=None, limit=50, order_by='id', min_rating=None):
+        # Filtre sur la note moyenne : lecture de l'index de rating_avg, sans charger les avis
+        conditions = () if min_rating is None else (Place.rating_avg >= min_rating,)
+        return self.place_repo.get_page(after=after, limit=limit, order_by=order_by, conditions=conditions,
+                                        profile='list')
 
     def update_place(self, place_id, place_data):
         place = self.place_repo.get(place_id)
@@ -125,70 +246,140 @@ class HBnBFacade:
 
          # Mise à jour des champs simples
         for key, value in place_data.items():
-            if hasattr(place, key) and key not in ['created_at', 'updated_at']:
+            if hasattr(place, key) and key not in ['created_at', 'updated_at', 'amenities', *Place.DERIVED_COLUMNS]:
                 setattr(place, key, value)
 
     # Mise à jour des amenities si présent dans place_data
         if 'amenities' in place_data:
             # Réinitialiser la liste des amenities
-            place.amenities = []
-            for amenity_id in place_data['amenities']:
-                amenity = self.get_amenity(amenity_id)
-                if amenity:
-                    place.amenities.append(amenity)
-
-    # Persistance des changements en base de données
-        db.session.commit()
+            place.amenities = self.get_amenities(place_data['amenities'])
+
+    # Persistance des changements en base de données (différée si une unité de travail est ouverte)
+        commit()
         return place
 
     def delete_place(self, place_id):
-        place = self.place_repo.get(place_id)
-        if not place:
+        # Suppression par l'ORM : SQLAlchemy gère automatiquement les cascades (avis, liens amenities)
+        if not self.place_repo.delete(place_id):
             raise ValueError(f"Place with id {place_id} not found")
-        
-        # SQLAlchemy gère automatiquement les cascades
-        self.place_repo.delete(place_id)
         return True
 
     # AVIS
     # Méthodes pour gérer les avis (reviews) associés aux lieux
-    def create_review(self, review_data):        
-        place = self.place_repo.get(review_data['place_id'])
-        if not place:
-            raise ValueError('Place not found')
-        user = self.user_repo.get(review_data['user_id'])
-        if not user:
-            raise ValueError('Invalid user_id: user not found')
-        del review_data['user_id']
-        review_data['user'] = user
-        del review_data['place_id']
-        review_data['place'] = place
+    def create_review(self, review_data):
+        # L'avis et les agrégats du lieu sont écrits dans la même transaction
+        with self.transaction():
+            place = self.place_repo.get(review_data['place_id'])
+            if not place:
+                raise ValueError('Place not found')
+            user = self.user_repo.get(review_data['user_id'])
+            if not user:
+                raise ValueError('Invalid user_id: user not found')
+            del review_data['user_id']
+            review_data['user'] = user
+            del review_data['place_id']
+            review_data['place'] = place
 
-
-        review = Review(**review_data)
-        self.review_repo.add(review)
+            review = Review(**review_data)
+            self.review_repo.add(review)
+            self.place_repo.adjust_ratings(place.id, 1, review.rating)
 
         return review
         
+    def bulk_create_reviews(self, reviews_data):
+        """Crée des avis en masse et retourne leurs ids ; place_id et user_id doivent exister"""
+        place_ids = {review_data['place_id'] for review_data in reviews_data}
+        if len(self.place_repo.get_many(place_ids)) != len(place_ids):
+            raise ValueError('Place not found')
+        user_ids = {review_data['user_id'] for review_data in reviews_data}
+        if len(self.user_repo.get_many(user_ids)) != len(user_ids):
+            raise ValueError('Invalid user_id: user not found')
+
+        with self.transaction():
+            review_ids = self.review_repo.add_rows({
+                'text': review_data['text'],
+                'rating': review_data['rating'],
+                'place_id': review_data['place_id'],
+                'user_id': review_data['user_id'],
+            } for review_data in reviews_data)
+            # Un seul UPDATE des agrégats par lieu, quel que soit le nombre d'avis
+            totals = {}
+            for review_data in reviews_data:
+                count, total = totals.get(review_data['place_id'], (0, 0.0))
+                totals[review_data['place_id']] = (count + 1, total + review_data['rating'])
+            for place_id, (count, total) in totals.items():
+                self.place_repo.adjust_ratings(place_id, count, total)
+        return review_ids
+
     def get_review(self, review_id):
         return self.review_repo.get(review_id)
 
     def get_all_reviews(self):
         return self.review_repo.get_all()
 
+    def iter_reviews(self, batch_size=ITER_BATCH_SIZE):
+        return self.review_repo.iter_all(batch_size)
+
+    def get_reviews_page(self, after=None, limit=50, order_by='id'):
+        return self.review_repo.get_page(after=after, limit=limit, order_by=order_by)
+
     def get_reviews_by_place(self, place_id):
         place = self.place_repo.get(place_id)
         if not place:
             raise KeyError('Place not found')
         return place.reviews
 
+    def get_reviews_page_by_place(self, place_id, after=None, limit=50, order_by='id'):
+        place = self.place_repo.get(place_id)
+        if not place:
+            raise KeyError('Place not found')
+        return self.review_repo.get_page(after=after, limit=limit, order_by=order_by, place_id=place_id)
+
+    def has_reviewed(self, user_id, place_id):
+        """Indique si l'utilisateur a déjà laissé un avis sur le lieu (sans charger les avis)"""
+        return self.review_repo.exists(user_id=user_id, place_id=place_id)
+
+    def get_reviews_page_by_place_data(self, place_id, after=None, limit=50, order_by='id'):
+        """(avis sérialisés, next_after) d'une page des avis d'un lieu ; KeyError si le lieu n'existe pas"""
+        def load():
+            if not self.place_repo.exists(id=place_id):
+                return None
+            reviews, next_after = self.review_repo.get_page(after=after, limit=limit, order_by=order_by,
+                                                            place_id=place_id)
+            return serialize_all(reviews), next_after
+        page = self.review_repo.cached('page_by_place', (place_id, after, limit, order_by), load,
+                                       tables=('places',))
+        if page is None:
+            raise KeyError('Place not found')
+        return page
+
     def update_review(self, review_id, review_data):
-        self.review_repo.update(review_id, review_data)
+        with self.transaction():
+            review = self.review_repo.get(review_id)
+            if not review:
+                return 0
+            old_place_id, old_rating = review.place_id, review.rating
+            # L'UPDATE synchronise l'objet de la session : review porte ensuite les nouvelles valeurs
+            updated = self.review_repo.update_by_id(review_id, review_data)
+            if updated and review.place_id != old_place_id:
+                self.place_repo.adjust_ratings(old_place_id, -1, -old_rating)
+                self.place_repo.adjust_ratings(review.place_id, 1, review.rating)
+            elif updated and review.rating != old_rating:
+                self.place_repo.adjust_ratings(review.place_id, 0, review.rating - old_rating)
+        return updated
 
     def delete_review(self, review_id):
-        review = self.review_repo.get(review_id)
-        if not review:
-            raise ValueError(f"Review with id {review_id} not found")
-        
-        self.review_repo.delete(review_id)
+        # DELETE direct : aucun objet ne dépend d'un avis ; la note est retirée des agrégats du lieu
+        with self.transaction():
+            review = self.review_repo.get(review_id)
+            if not review:
+                raise ValueError(f"Review with id {review_id} not found")
+            place_id, rating = review.place_id, review.rating
+            if not self.review_repo.delete_by_id(review_id):
+                raise ValueError(f"Review with id {review_id} not found")
+            self.place_repo.adjust_ratings(place_id, -1, -rating)
         return True
+
+    def recompute_place_ratings(self):
+        """Recalcule les agrégats de note de tous les lieux depuis les avis ; retourne le nombre de lieux corrigés"""
+        return self.place_repo.recompute_ratings()
@@ -6,13 +6,20 @@ Il fournit des méthodes pour ajouter et sauvegarder des instances
 d'Amenity dans la base de données via SQLAlchemy, encapsulant
 ainsi la logique d'accès aux données et facilitant la maintenance.
 """
+from sqlalchemy import delete
 from app.models.amenity import Amenity
+from app.models.place_amenity import place_amenity
 from app.extensions import db
 from app.persistence.repository import SQLAlchemyRepository
 
 class AmenityRepository(SQLAlchemyRepository):
     def __init__(self):
         super().__init__(Amenity)
+
+    def delete_by_id(self, obj_id):
+        """Supprime d'abord les liens place_amenity de l'amenity, puis l'amenity elle-même"""
+        db.session.execute(delete(place_amenity).where(place_amenity.c.amenity_id == obj_id))
+        return super().delete_by_id(obj_id)
 class BaseRepository:
     def add(self, obj):
         db.session.add(obj)
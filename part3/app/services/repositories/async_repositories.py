@@ -0,0 +1,76 @@
+"""
+Ce fichier définit les repositories asynchrones des modèles, construits sur
+AsyncSQLAlchemyRepository et utilisés par AsyncHBnBFacade.
+
+Chacun reprend le comportement de son pendant synchrone (UserRepository,
+PlaceRepository...) et déclare les relations à charger d'avance, les objets
+retournés ne pouvant pas charger une relation à la demande hors `await`.
+"""
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import selectinload
+from app.extensions import async_db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.place_amenity import place_amenity
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.async_repository import AsyncSQLAlchemyRepository, async_commit
+from app.persistence.repository import BULK_CHUNK_SIZE, mark_written
+from app.services.repositories.place_repository import rating_adjustment, with_geohash
+from app.services.repositories.review_repository import rating_totals
+
+
+class AsyncUserRepository(AsyncSQLAlchemyRepository):
+    def __init__(self):
+        super().__init__(User)
+
+    async def get_user_by_email(self, email):
+        return await self.get_by_attribute('email', email)
+
+
+class AsyncAmenityRepository(AsyncSQLAlchemyRepository):
+    def __init__(self):
+        super().__init__(Amenity)
+
+    async def delete_by_id(self, obj_id):
+        """Supprime d'abord les liens place_amenity de l'amenity, puis l'amenity elle-même"""
+        async with async_db.session_scope() as session:
+            await session.execute(delete(place_amenity).where(place_amenity.c.amenity_id == obj_id))
+            return await super().delete_by_id(obj_id)
+
+
+class AsyncPlaceRepository(AsyncSQLAlchemyRepository):
+    def __init__(self):
+        # Place.to_dict() lit les avis et les amenities du lieu
+        super().__init__(Place, load_options=(selectinload(Place.reviews), selectinload(Place.amenities)))
+
+    def _values_validator(self):
+        return with_geohash(super()._values_validator())
+
+    async def add_amenity_links(self, links, chunk_size=BULK_CHUNK_SIZE):
+        """Insère en masse des couples (place_id, amenity_id) dans la table d'association"""
+        rows = [{'place_id': place_id, 'amenity_id': amenity_id} for place_id, amenity_id in links]
+        async with async_db.session_scope() as session:
+            for start in range(0, len(rows), chunk_size):
+                await session.execute(insert(place_amenity), rows[start:start + chunk_size])
+                await async_commit(session)
+        return len(rows)
+
+    async def adjust_ratings(self, place_id, count_delta, sum_delta):
+        """Met à jour review_count, rating_sum et rating_avg d'un lieu (voir PlaceRepository.adjust_ratings)"""
+        async with async_db.session_scope() as session:
+            result = await session.execute(rating_adjustment(place_id, count_delta, sum_delta))
+            if result.rowcount:
+                mark_written(self.model, [place_id], session=session.sync_session)
+            return result.rowcount
+
+
+class AsyncReviewRepository(AsyncSQLAlchemyRepository):
+    def __init__(self):
+        super().__init__(Review)
+
+    async def rating_totals_by_place(self, **filters):
+        """{place_id: (nombre d'avis, somme des notes)} des avis correspondant aux filtres"""
+        async with async_db.session_scope() as session:
+            rows = await session.execute(rating_totals(**filters))
+            return {place_id: (count, total) for place_id, count, total in rows}
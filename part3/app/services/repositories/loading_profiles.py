@@ -0,0 +1,33 @@
+"""
+Ce fichier définit les profils de chargement des relations, par modèle.
+
+Les relations des modèles sont déclarées en chargement à la demande
+(`lazy='select'`) : une lecture ne charge que ce que l'endpoint va afficher.
+Chaque profil nomme la liste d'options SQLAlchemy à appliquer à la requête
+(`selectinload`, `joinedload`, `raiseload`) pour qu'un endpoint émette un
+nombre fixe de requêtes, quel que soit le nombre d'objets retournés. La
+facade choisit le profil : `place_repo.get_page(..., profile='list')`.
+
+`raiseload(..., sql_only=True)` interdit le chargement d'une relation que le
+profil n'a pas prévu : l'accès lève une erreur au lieu d'émettre une requête
+par objet, sauf si l'objet lié est déjà dans la session.
+"""
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+
+from app.models.place import Place
+
+PLACE_PROFILES = {
+    # Liste de lieux (jeu de champs 'list') : les avis sont résumés par review_count / rating_avg,
+    # les amenities de toute la page lues en une requête, soit 2 requêtes quel que soit le nombre de lieux
+    'list': (
+        selectinload(Place.amenities),
+        raiseload(Place.reviews, sql_only=True),
+        raiseload(Place.owner, sql_only=True),
+    ),
+    # Détail d'un lieu (Place.to_dict) : amenities jointes à la requête du lieu, avis en une requête
+    'detail': (
+        joinedload(Place.amenities),
+        selectinload(Place.reviews),
+        raiseload(Place.owner, sql_only=True),
+    ),
+}
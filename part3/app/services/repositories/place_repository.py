@@ -6,13 +6,139 @@ Il fournit des méthodes simples pour gérer la persistance des objets Place
 en base de données via SQLAlchemy, notamment l’ajout et la sauvegarde
 des modifications, encapsulant ainsi la logique d’accès aux données.
 """
+from sqlalchemy import and_, bindparam, case, func, insert, or_, select, update
+from app.models.geohash import PREFIX_END, bounding_box, covering_cells, encode, haversine_km
 from app.models.place import Place
+from app.models.place_amenity import place_amenity
+from app.models.review import Review
 from app.extensions import db
-from app.persistence.repository import SQLAlchemyRepository
+from app.persistence.repository import BULK_CHUNK_SIZE, SQLAlchemyRepository, commit
+from app.services.repositories.loading_profiles import PLACE_PROFILES
+
+
+def rating_adjustment(place_id, count_delta, sum_delta):
+    """UPDATE qui ajoute count_delta avis et sum_delta points aux agrégats d'un lieu.
+
+    Le calcul est fait par la base à partir des valeurs en place : deux avis
+    ajoutés en même temps ne s'écrasent pas. rating_avg est assigné en premier
+    car MySQL évalue les SET de gauche à droite avec les valeurs déjà modifiées.
+    """
+    count = Place.review_count + count_delta
+    total = Place.rating_sum + sum_delta
+    return (update(Place).where(Place.id == place_id)
+            .ordered_values((Place.rating_avg, case((count > 0, total / count), else_=0.0)),
+                            (Place.review_count, count),
+                            (Place.rating_sum, total)))
+
+
+def rating_recompute():
+    """UPDATE qui recalcule les agrégats depuis la table reviews, pour les seuls lieux qui ont dérivé"""
+    count = (select(func.count()).where(Review.place_id == Place.id)).scalar_subquery()
+    total = (select(func.coalesce(func.sum(Review.rating), 0.0)).where(Review.place_id == Place.id)).scalar_subquery()
+    average = case((count > 0, total / count), else_=0.0)
+    return (update(Place)
+            .where(or_(Place.review_count != count, func.abs(Place.rating_sum - total) > 1e-6,
+                       func.abs(Place.rating_avg - average) > 1e-6))
+            .ordered_values((Place.rating_avg, average),
+                            (Place.review_count, count),
+                            (Place.rating_sum, total))
+            .execution_options(synchronize_session=False))
+
+def with_geohash(validate):
+    """Ajoute à une fonction de validation de valeurs (values_validator) le geohash des lignes
+    insérées ou modifiées sans objet ORM, que les validateurs de Place ne peuvent pas calculer"""
+    def validate_place(data):
+        values = validate(data)
+        values.pop('geohash', None)
+        if 'latitude' in values or 'longitude' in values:
+            if 'latitude' not in values or 'longitude' not in values:
+                raise ValueError("Latitude and longitude must be set together")
+            values['geohash'] = encode(values['latitude'], values['longitude'])
+        return values
+    return validate_place
+
+
+def nearby_candidates(latitude, longitude, radius_km):
+    """SELECT id, latitude, longitude des lieux du rectangle englobant le cercle.
+
+    Chaque cellule geohash couvrant le cercle devient un intervalle de l'index
+    de geohash ; latitude et longitude écartent ensuite les lieux des cellules
+    qui sortent du rectangle.
+    """
+    south, north, west, east = bounding_box(latitude, longitude, radius_km)
+    conditions = [Place.latitude.between(south, north)]
+    if -180.0 <= west and east <= 180.0:
+        conditions.append(Place.longitude.between(west, east))
+    cells = covering_cells(latitude, longitude, radius_km)
+    if cells != ['']:
+        conditions.append(or_(*(and_(Place.geohash >= cell, Place.geohash < cell + PREFIX_END) for cell in cells)))
+    return select(Place.id, Place.latitude, Place.longitude).where(*conditions)
+
 
 class PlaceRepository(SQLAlchemyRepository):
     def __init__(self):
-        super().__init__(Place)
+        super().__init__(Place, loading_profiles=PLACE_PROFILES)
+
+    def _values_validator(self):
+        return with_geohash(super()._values_validator())
+
+    def nearby(self, latitude, longitude, radius_km, limit=50, profile=None):
+        """Lieux à moins de radius_km du point, du plus proche au plus lointain : liste de (lieu, distance en km).
+
+        Seuls id et coordonnées des candidats sont lus ; la distance exacte
+        (haversine) les filtre et les trie, puis les `limit` plus proches sont
+        chargés en une requête.
+        """
+        rows = db.session.execute(nearby_candidates(latitude, longitude, radius_km))
+        distances = {}
+        for place_id, place_latitude, place_longitude in rows:
+            distance = haversine_km(latitude, longitude, place_latitude, place_longitude)
+            if distance <= radius_km:
+                distances[place_id] = distance
+        nearest = sorted(distances, key=distances.get)[:limit]
+        return [(place, distances[place.id]) for place in self.get_many(nearest, profile=profile)]
+
+    def backfill_geohash(self, batch_size=BULK_CHUNK_SIZE):
+        """Calcule le geohash des lieux qui n'en ont pas (lignes antérieures à la colonne) ;
+        retourne le nombre de lieux mis à jour"""
+        stmt = (update(Place.__table__).where(Place.__table__.c.id == bindparam('place_id'))
+                .values(geohash=bindparam('geohash')))
+        updated = 0
+        while True:
+            rows = db.session.execute(select(Place.id, Place.latitude, Place.longitude)
+                                      .where(Place.geohash.is_(None)).limit(batch_size)).all()
+            if not rows:
+                break
+            db.session.execute(stmt, [{'place_id': place_id, 'geohash': encode(latitude, longitude)}
+                                      for place_id, latitude, longitude in rows])
+            commit()
+            updated += len(rows)
+        if self.cache is not None:
+            self.cache.clear()
+        return updated
+
+    def add_amenity_links(self, links, chunk_size=BULK_CHUNK_SIZE):
+        """Insère en masse des couples (place_id, amenity_id) dans la table d'association"""
+        rows = [{'place_id': place_id, 'amenity_id': amenity_id} for place_id, amenity_id in links]
+        for start in range(0, len(rows), chunk_size):
+            db.session.execute(insert(place_amenity), rows[start:start + chunk_size])
+            commit()
+        return len(rows)
+
+    def adjust_ratings(self, place_id, count_delta, sum_delta):
+        """Met à jour review_count, rating_sum et rating_avg d'un lieu dans la transaction courante"""
+        result = db.session.execute(rating_adjustment(place_id, count_delta, sum_delta))
+        if result.rowcount:
+            self.invalidate(place_id)
+        return result.rowcount
+
+    def recompute_ratings(self):
+        """Recalcule les agrégats de note de tous les lieux ; retourne le nombre de lieux corrigés"""
+        result = db.session.execute(rating_recompute())
+        if self.cache is not None:
+            self.cache.clear()
+        commit()
+        return result.rowcount
 
         def save(self, place):
             """Sauvegarde les modifications d'un Place en base de données."""
@@ -6,14 +6,26 @@ Il contient des méthodes pour gérer l'ajout, la sauvegarde et la récupératio
 d'objets Review en base de données via SQLAlchemy,
 fournissant ainsi une couche d'abstraction facilitant la gestion des données.
 """
+from sqlalchemy import func, select
 from app.models.review import Review
 from app.extensions import db
 from app.persistence.repository import SQLAlchemyRepository
 
+
+def rating_totals(**filters):
+    """SELECT place_id, nombre d'avis, somme des notes des avis correspondant aux filtres, par lieu"""
+    return (select(Review.place_id, func.count(), func.sum(Review.rating))
+            .filter_by(**filters).group_by(Review.place_id))
+
+
 class ReviewRepository(SQLAlchemyRepository):
     def __init__(self):
         super().__init__(Review)
 
+    def rating_totals_by_place(self, **filters):
+        """{place_id: (nombre d'avis, somme des notes)} des avis correspondant aux filtres"""
+        return {place_id: (count, total) for place_id, count, total in db.session.execute(rating_totals(**filters))}
+
 class BaseRepository:
     def add(self, obj):
         db.session.add(obj)
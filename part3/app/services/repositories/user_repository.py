@@ -15,7 +15,7 @@ class UserRepository(SQLAlchemyRepository):
         super().__init__(User)
 
     def get_user_by_email(self, email):
-        return self.model.query.filter_by(email=email).first()
+        return self.get_by_attribute('email', email)
 
 class BaseRepository:
     def add(self, obj):
@@ -0,0 +1,113 @@
+from app import create_app
+from app.extensions import async_db, db
+from app.models.amenity import Amenity
+from app.persistence.async_repository import async_unit_of_work
+from app.services import async_facade
+from config import TestingConfig
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class TestAsyncRepository(unittest.TestCase):
+    """Repositories et facade asynchrones, exécutés avec asyncio.run"""
+
+    def setUp(self):
+        # Base fichier : chaque session aiosqlite ouvre sa propre connexion (NullPool)
+        self.directory = tempfile.mkdtemp()
+        directory = self.directory
+
+        class AsyncConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(directory, 'async.db')
+
+        self.app = create_app(AsyncConfig)
+        self.repo = async_facade.amenity_repo
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.engine.dispose()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def run_async(self, coroutine_function):
+        async def run():
+            try:
+                return await coroutine_function()
+            finally:
+                # Le moteur asynchrone est lié à la boucle de asyncio.run
+                await async_db.dispose()
+        return asyncio.run(run())
+
+    def test_add_get(self):
+        async def scenario():
+            amenity = Amenity(name="Wi-Fi")
+            await self.repo.add(amenity)
+            found = await self.repo.get(amenity.id)
+            missing = await self.repo.get("unknown")
+            return amenity.id, found, missing
+        amenity_id, found, missing = self.run_async(scenario)
+        self.assertEqual((found.id, found.name), (amenity_id, "Wi-Fi"))
+        self.assertIsNone(missing)
+
+    def test_get_page(self):
+        async def scenario():
+            await self.repo.add_rows([{'name': f"Amenity {i}"} for i in range(5)])
+            names, after = [], None
+            while True:
+                items, after = await self.repo.get_page(after=after, limit=2, order_by='-name')
+                names += [amenity.name for amenity in items]
+                if after is None:
+                    return names
+        self.assertEqual(self.run_async(scenario), [f"Amenity {i}" for i in reversed(range(5))])
+
+    def test_unit_of_work_rollback(self):
+        async def scenario():
+            with self.assertRaises(RuntimeError):
+                async with async_unit_of_work():
+                    await self.repo.add(Amenity(name="Wi-Fi"))
+                    async with async_unit_of_work():
+                        await self.repo.add(Amenity(name="Pool"))
+                    # Unité interne fermée : rien n'est encore committé
+                    raise RuntimeError("rollback")
+            return await self.repo.count()
+        self.assertEqual(self.run_async(scenario), 0)
+
+    def test_unit_of_work_commit(self):
+        async def scenario():
+            async with async_unit_of_work():
+                await self.repo.add(Amenity(name="Wi-Fi"))
+                await self.repo.add(Amenity(name="Pool"))
+            return await self.repo.count()
+        self.assertEqual(self.run_async(scenario), 2)
+
+    def test_review_aggregates(self):
+        async def ratings(place_id):
+            place = await async_facade.place_repo.get(place_id)
+            return place.review_count, place.rating_sum, place.rating_avg
+
+        async def scenario():
+            owner = await async_facade.create_user({'first_name': "Alice", 'last_name': "Smith",
+                                                    'email': "alice@example.com", 'password': "secret"})
+            guests = [await async_facade.create_user({'first_name': "Bob", 'last_name': "Martin",
+                                                      'email': f"bob{i}@example.com", 'password': "secret"})
+                      for i in range(2)]
+            place = await async_facade.create_place({'title': "Louvre", 'price': 10, 'latitude': 48.86,
+                                                     'longitude': 2.34, 'owner_id': owner.id})
+            steps = [await ratings(place.id)]
+            reviews = []
+            for guest, rating in zip(guests, (5, 2)):
+                reviews.append(await async_facade.create_review({'text': "Nice", 'rating': rating,
+                                                                 'place_id': place.id, 'user_id': guest.id}))
+                steps.append(await ratings(place.id))
+            await async_facade.delete_review(reviews[0].id)
+            steps.append(await ratings(place.id))
+            await async_facade.delete_review(reviews[1].id)
+            steps.append(await ratings(place.id))
+            return steps
+        self.assertEqual(self.run_async(scenario), [(0, 0.0, 0.0), (1, 5.0, 5.0), (2, 7.0, 3.5),
+                                                    (1, 2.0, 2.0), (0, 0.0, 0.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+from app import create_app
+from app.models.geohash import covering_cells, decode, encode, haversine_km
+from app.models.place import Place
+import unittest
+
+
+class TestGeohash(unittest.TestCase):
+    def test_encode(self):
+        self.assertEqual(encode(57.64911, 10.40744, 11), "u4pruydqqvj")
+        self.assertEqual(encode(42.6, -5.6, 5), "ezs42")
+        south, north, west, east = decode("ezs42")
+        self.assertTrue(south <= 42.6 <= north and west <= -5.6 <= east)
+
+    def test_covering_cells(self):
+        # Le cercle traverse l'antiméridien : cellules des deux côtés
+        cells = covering_cells(0.0, 179.99, 10)
+        self.assertTrue(any(encode(0.01, 179.995).startswith(cell) for cell in cells))
+        self.assertTrue(any(encode(-0.01, -179.995).startswith(cell) for cell in cells))
+        self.assertLessEqual(len(covering_cells(48.8566, 2.3522, 5)), 9)
+
+    def test_haversine(self):
+        # Paris - Lyon : environ 392 km
+        self.assertAlmostEqual(haversine_km(48.8566, 2.3522, 45.764, 4.8357), 392, delta=2)
+
+    def test_place_geohash_follows_coordinates(self):
+        place = Place(title="Louvre", price=10, latitude=48.8606, longitude=2.3376)
+        self.assertEqual(place.geohash, encode(48.8606, 2.3376))
+        place.latitude = 45.764
+        self.assertEqual(place.geohash, encode(45.764, 2.3376))
+
+
+class TestNearbyEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.client.post('/api/v1/users/', json={
+            'first_name': "Alice", 'last_name': "Smith", 'email': "alice@example.com", 'password': "secret"})
+        token = self.client.post('/api/v1/auth/login', json={
+            'email': "alice@example.com", 'password': "secret"}).get_json()['access_token']
+        for title, latitude, longitude in (("Louvre", 48.8606, 2.3376), ("Eiffel", 48.8584, 2.2945),
+                                           ("Versailles", 48.8049, 2.1204), ("Lyon", 45.764, 4.8357)):
+            self.client.post('/api/v1/places/', headers={'Authorization': f"Bearer {token}"}, json={
+                'title': title, 'price': 100, 'latitude': latitude, 'longitude': longitude})
+
+    def test_sorted_by_distance(self):
+        response = self.client.get('/api/v1/places/nearby?lat=48.8566&lon=2.3522&radius_km=20')
+        self.assertEqual(response.status_code, 200)
+        places = response.get_json()['items']
+        self.assertEqual([place['title'] for place in places], ["Louvre", "Eiffel", "Versailles"])
+        self.assertAlmostEqual(places[0]['distance_km'], 1.16, delta=0.01)
+        response = self.client.get('/api/v1/places/nearby?lat=48.8566&lon=2.3522&radius_km=20&limit=1')
+        self.assertEqual([place['title'] for place in response.get_json()['items']], ["Louvre"])
+
+    def test_paging_parameters_ignored(self):
+        # Aucune pagination : un curseur ou un tri d'une autre liste ne fait pas échouer la recherche
+        response = self.client.get('/api/v1/places/nearby?lat=48.8566&lon=2.3522&radius_km=20'
+                                   '&cursor=garbage&order_by=title&limit=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([place['title'] for place in response.get_json()['items']], ["Louvre", "Eiffel"])
+        self.assertEqual(self.client.get('/api/v1/places/nearby?lat=48.8&lon=2.35&limit=abc').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/nearby?lat=48.8&lon=2.35&limit=0').status_code, 400)
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get('/api/v1/places/nearby?lon=2.35').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/nearby?lat=95&lon=2.35').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/nearby?lat=48.8&lon=2.35&radius_km=0').status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
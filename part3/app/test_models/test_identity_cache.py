@@ -0,0 +1,106 @@
+from app import create_app
+from app.extensions import db
+from app.persistence.repository import unit_of_work
+from app.services import facade
+from config import TestingConfig
+from unittest import mock
+import unittest
+
+
+class CacheConfig(TestingConfig):
+    IDENTITY_CACHE = {'Amenity': {'maxsize': 2, 'ttl': 30}}
+
+
+class TestIdentityCache(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(CacheConfig)
+        self.context = self.app.app_context()
+        self.context.push()
+        self.repo = facade.amenity_repo
+        self.ids = [facade.create_amenity({'name': name}).id for name in ("Wi-Fi", "Pool", "Parking")]
+        self.new_session()
+
+    def tearDown(self):
+        db.session.remove()
+        self.context.pop()
+        # Le cache d'identité est global au processus : les tests suivants n'en veulent pas
+        facade.configure_identity_cache({})
+
+    def new_session(self):
+        """Termine la requête courante : les objets ne sont plus dans la session"""
+        db.session.remove()
+
+    def get_name(self, amenity_id):
+        amenity = self.repo.get(amenity_id)
+        name = amenity.name if amenity is not None else None
+        self.new_session()
+        return name
+
+    def test_hit_after_miss(self):
+        self.assertEqual(self.get_name(self.ids[0]), "Wi-Fi")
+        self.assertEqual((self.repo.cache.misses, self.repo.cache.hits), (1, 0))
+        with mock.patch.object(self.repo, '_load', side_effect=AssertionError("SELECT emitted")):
+            self.assertEqual(self.get_name(self.ids[0]), "Wi-Fi")
+        self.assertEqual((self.repo.cache.misses, self.repo.cache.hits), (1, 1))
+
+    def test_invalidated_by_update_by_id(self):
+        self.get_name(self.ids[0])
+        self.repo.update_by_id(self.ids[0], {'name': "Fiber"})
+        self.assertIsNone(self.repo.cache.get(self.ids[0]))
+        self.new_session()
+        self.assertEqual(self.get_name(self.ids[0]), "Fiber")
+
+    def test_invalidated_by_update(self):
+        self.get_name(self.ids[0])
+        self.repo.update(self.ids[0], {'name': "Fiber"})
+        self.new_session()
+        self.assertEqual(self.get_name(self.ids[0]), "Fiber")
+
+    def test_invalidated_by_delete_by_id(self):
+        self.get_name(self.ids[0])
+        self.repo.delete_by_id(self.ids[0])
+        self.new_session()
+        self.assertIsNone(self.get_name(self.ids[0]))
+
+    def test_rollback(self):
+        self.get_name(self.ids[0])
+        # Un rollback sans écriture garde l'entrée
+        db.session.rollback()
+        self.assertEqual(self.repo.cache.get(self.ids[0])['name'], "Wi-Fi")
+        # Une écriture annulée ne laisse jamais sa valeur dans le cache
+        with self.assertRaises(RuntimeError):
+            with unit_of_work():
+                self.repo.update_by_id(self.ids[0], {'name': "Fiber"})
+                self.assertEqual(self.repo.get(self.ids[0]).name, "Fiber")
+                raise RuntimeError("rollback")
+        self.new_session()
+        self.assertEqual(self.get_name(self.ids[0]), "Wi-Fi")
+        self.assertEqual(self.repo.cache.get(self.ids[0])['name'], "Wi-Fi")
+
+    def test_ttl_expiry(self):
+        clock = mock.Mock()
+        with mock.patch('app.persistence.cache.time', clock):
+            clock.monotonic.return_value = 1000.0
+            self.get_name(self.ids[0])
+            clock.monotonic.return_value = 1029.0
+            self.get_name(self.ids[0])
+            self.assertEqual(self.repo.cache.hits, 1)
+            clock.monotonic.return_value = 1031.0
+            self.get_name(self.ids[0])
+        self.assertEqual((self.repo.cache.hits, self.repo.cache.expirations), (1, 1))
+
+    def test_lru_eviction(self):
+        first, second, third = self.ids
+        self.get_name(first)
+        self.get_name(second)
+        # first redevient le plus récent : second est évincé par third (maxsize = 2)
+        self.get_name(first)
+        self.get_name(third)
+        self.assertEqual(len(self.repo.cache), 2)
+        self.assertEqual(self.repo.cache.evictions, 1)
+        self.assertIsNotNone(self.repo.cache.get(first))
+        self.assertIsNone(self.repo.cache.get(second))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+from app import create_app
+from app.models import ids
+from app.models.ids import new_id, set_id_generator, uuid7_id
+from app.services import facade
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+import time
+import unittest
+import uuid
+
+
+class TestUuid7(unittest.TestCase):
+    def tearDown(self):
+        set_id_generator('uuid7')
+
+    def test_format(self):
+        before = time.time_ns() // 1_000_000
+        value = uuid.UUID(uuid7_id())
+        after = time.time_ns() // 1_000_000
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+        self.assertTrue(before <= value.int >> 80 <= after)
+
+    def test_increasing_and_unique(self):
+        generated = [uuid7_id() for _ in range(10_000)]
+        self.assertEqual(generated, sorted(generated))
+        self.assertEqual(len(set(generated)), len(generated))
+
+    def test_same_millisecond_overflow(self):
+        # Plus d'ids que le compteur de 12 bits n'en permet dans une milliseconde figée
+        with mock.patch.object(ids.time, 'time_ns', return_value=(ids._last_ms + 1000) * 1_000_000):
+            generated = [uuid7_id() for _ in range(2 * (ids._COUNTER_MAX + 1))]
+        self.assertEqual(generated, sorted(generated))
+        self.assertEqual(len(set(generated)), len(generated))
+
+    def test_clock_going_backwards(self):
+        first = uuid7_id()
+        with mock.patch.object(ids.time, 'time_ns', return_value=(ids._last_ms - 60_000) * 1_000_000):
+            second = uuid7_id()
+        self.assertLess(first, second)
+
+    def test_threads(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            batches = list(executor.map(lambda _: [uuid7_id() for _ in range(2_000)], range(8)))
+        generated = [value for batch in batches for value in batch]
+        self.assertEqual(len(set(generated)), len(generated))
+        for batch in batches:
+            self.assertEqual(batch, sorted(batch))
+
+    def test_generator_choice(self):
+        set_id_generator('uuid4')
+        self.assertEqual(uuid.UUID(new_id()).version, 4)
+        set_id_generator(lambda: "fixed")
+        self.assertEqual(new_id(), "fixed")
+        with self.assertRaises(ValueError):
+            set_id_generator('uuid1')
+        set_id_generator('uuid7')
+        self.assertEqual(uuid.UUID(new_id()).version, 7)
+
+
+    def test_database_order(self):
+        # Ids binaires comparés octet par octet : trier par id revient à trier par date de création
+        app = create_app("config.TestingConfig")
+        with app.app_context():
+            created = facade.amenity_repo.add_rows([{'name': f"Amenity {i}"} for i in range(50)])
+            amenities, _ = facade.amenity_repo.get_page(limit=50, order_by='id')
+            self.assertEqual([amenity.id for amenity in amenities], created)
+            self.assertEqual([amenity.name for amenity in amenities], [f"Amenity {i}" for i in range(50)])
+
+
+if __name__ == "__main__":
+    unittest.main()
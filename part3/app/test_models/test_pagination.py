@@ -0,0 +1,93 @@
+from app import create_app
+from app.api.v1.pagination import InvalidCursor, decode_cursor, encode_cursor
+import base64
+import json
+import unittest
+import uuid
+
+
+def raw_cursor(token):
+    """Jeton forgé à la main, comme pourrait l'envoyer un client"""
+    return base64.urlsafe_b64encode(json.dumps(token).encode()).decode().rstrip('=')
+
+
+class TestCursor(unittest.TestCase):
+    def test_round_trip(self):
+        last_id = str(uuid.uuid4())
+        self.assertEqual(decode_cursor(encode_cursor((12.5, last_id), 'price'), 'price'), (12.5, last_id))
+        self.assertIsNone(encode_cursor(None))
+        self.assertIsNone(decode_cursor(None))
+
+    def test_invalid_cursors(self):
+        last_id = str(uuid.uuid4())
+        for cursor in ("not base64 !", raw_cursor({'a': 1}), raw_cursor([1, last_id]),
+                       raw_cursor(['id', {'a': 1}, 'x']), raw_cursor(['id', [1], last_id]),
+                       raw_cursor(['id', 'x', 'not-a-uuid']), raw_cursor(['id', 'x', 42])):
+            with self.assertRaises(InvalidCursor, msg=cursor):
+                decode_cursor(cursor)
+
+    def test_order_by_mismatch(self):
+        cursor = encode_cursor((str(uuid.uuid4()), str(uuid.uuid4())), 'id')
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(cursor, 'price')
+
+
+class TestPlacesPagination(unittest.TestCase):
+    PRICES = (10, 10, 10, 20, 20, 30, 40)
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.client.post('/api/v1/users/', json={
+            'first_name': "Alice", 'last_name': "Smith", 'email': "alice@example.com", 'password': "secret"})
+        token = self.client.post('/api/v1/auth/login', json={
+            'email': "alice@example.com", 'password': "secret"}).get_json()['access_token']
+        self.places = []
+        for i, price in enumerate(self.PRICES):
+            response = self.client.post('/api/v1/places/', headers={'Authorization': f"Bearer {token}"}, json={
+                'title': f"Place {i}", 'price': price, 'latitude': 45.0, 'longitude': 3.0})
+            self.places.append((float(price), response.get_json()['id']))
+
+    def traverse(self, order_by, limit=2):
+        """Parcourt toutes les pages ; retourne les ids dans l'ordre et le nombre de pages"""
+        ids, cursor, pages = [], None, 0
+        while True:
+            url = f'/api/v1/places/?order_by={order_by}&limit={limit}'
+            response = self.client.get(url + (f'&cursor={cursor}' if cursor else ''))
+            self.assertEqual(response.status_code, 200, response.get_json())
+            page = response.get_json()
+            ids += [place['id'] for place in page['items']]
+            pages += 1
+            cursor = page['next_cursor']
+            if cursor is None:
+                return ids, pages
+
+    def test_ascending_with_ties(self):
+        ids, pages = self.traverse('price')
+        self.assertEqual(ids, [place_id for _, place_id in sorted(self.places)])
+        self.assertEqual(pages, 4)
+
+    def test_descending_with_ties(self):
+        ids, _ = self.traverse('-price', limit=3)
+        self.assertEqual(ids, [place_id for _, place_id in sorted(self.places, reverse=True)])
+
+    def test_last_page(self):
+        page = self.client.get(f'/api/v1/places/?limit={len(self.PRICES)}').get_json()
+        self.assertEqual(len(page['items']), len(self.PRICES))
+        self.assertIsNone(page['next_cursor'])
+
+    def test_invalid_parameters(self):
+        for query in ('limit=abc', 'limit=0', 'limit=-3', 'order_by=title', 'cursor=garbage',
+                      'cursor=' + raw_cursor(['id', {'a': 1}, 'x'])):
+            response = self.client.get(f'/api/v1/places/?{query}')
+            self.assertEqual(response.status_code, 400, query)
+            self.assertIn('error', response.get_json())
+
+    def test_cursor_replayed_with_other_order(self):
+        cursor = self.client.get('/api/v1/places/?limit=2').get_json()['next_cursor']
+        response = self.client.get(f'/api/v1/places/?limit=2&order_by=price&cursor={cursor}')
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
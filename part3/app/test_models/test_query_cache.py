@@ -0,0 +1,116 @@
+from app import create_app
+from app.extensions import db
+from app.persistence.cache import TaggedCache
+from app.persistence.repository import get_query_cache, unit_of_work
+from app.services import facade
+from config import TestingConfig
+import unittest
+
+
+class TestTaggedCache(unittest.TestCase):
+    def test_get_or_load(self):
+        cache = TaggedCache()
+        calls = []
+        loader = lambda: calls.append(1) or len(calls)
+        self.assertEqual(cache.get_or_load('key', ('places',), loader), 1)
+        self.assertEqual(cache.get_or_load('key', ('places',), loader), 1)
+        self.assertEqual(len(calls), 1)
+
+    def test_invalidate_tags(self):
+        cache = TaggedCache()
+        cache.get_or_load('place', ('places', 'reviews'), lambda: "place")
+        cache.get_or_load('users', ('users',), lambda: "users")
+        cache.invalidate_tags(['reviews'])
+        self.assertIsNone(cache.get('place'))
+        self.assertEqual(cache.get('users'), "users")
+        self.assertEqual(cache.stats()['invalidations'], 1)
+
+    def test_write_during_load(self):
+        # Une table lue est modifiée pendant le chargement : le résultat n'est pas mis en cache
+        cache = TaggedCache()
+
+        def loader():
+            cache.invalidate_tags(['places'])
+            return "stale"
+        self.assertEqual(cache.get_or_load('key', ('places',), loader), "stale")
+        self.assertIsNone(cache.get('key'))
+
+    def test_eviction_releases_tags(self):
+        cache = TaggedCache(maxsize=1)
+        cache.get_or_load('first', ('places',), lambda: 1)
+        cache.get_or_load('second', ('users',), lambda: 2)
+        self.assertIsNone(cache.get('first'))
+        self.assertEqual(cache._keys_by_tag, {'users': {'second'}})
+
+
+class QueryCacheConfig(TestingConfig):
+    QUERY_CACHE = {'maxsize': 100, 'ttl': 60}
+
+
+class TestCachedQuery(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(QueryCacheConfig)
+        self.context = self.app.app_context()
+        self.context.push()
+        owner = facade.create_user({'first_name': "Alice", 'last_name': "Smith",
+                                    'email': "alice@example.com", 'password': "secret"})
+        self.amenity_id = facade.create_amenity({'name': "Wi-Fi"}).id
+        self.place_id = facade.create_place({'title': "Louvre", 'price': 10, 'latitude': 48.86,
+                                             'longitude': 2.34, 'owner_id': owner.id}).id
+        self.new_session()
+
+    def tearDown(self):
+        db.session.remove()
+        self.context.pop()
+        # Le cache de requêtes est global au processus
+        facade.configure_query_cache({})
+
+    def new_session(self):
+        db.session.remove()
+
+    def amenity_names(self):
+        amenities, _ = facade.get_amenities_page_data()
+        names = [amenity['name'] for amenity in amenities]
+        self.new_session()
+        return names
+
+    def test_served_from_cache(self):
+        self.amenity_names()
+        hits = get_query_cache().hits
+        self.assertEqual(self.amenity_names(), ["Wi-Fi"])
+        self.assertEqual(get_query_cache().hits, hits + 1)
+
+    def test_invalidated_by_flush(self):
+        self.amenity_names()
+        facade.create_amenity({'name': "Pool"})
+        self.new_session()
+        self.assertEqual(sorted(self.amenity_names()), ["Pool", "Wi-Fi"])
+
+    def test_invalidated_by_core_update(self):
+        self.amenity_names()
+        facade.update_amenity(self.amenity_id, {'name': "Fiber"})
+        self.new_session()
+        self.assertEqual(self.amenity_names(), ["Fiber"])
+
+    def test_invalidated_by_association_table(self):
+        # Le détail d'un lieu lit aussi la table place_amenity
+        self.assertEqual(facade.get_place_data(self.place_id)['amenities'], [])
+        self.new_session()
+        facade.update_place(self.place_id, {'amenities': [self.amenity_id]})
+        self.new_session()
+        self.assertEqual([amenity['name'] for amenity in facade.get_place_data(self.place_id)['amenities']],
+                         ["Wi-Fi"])
+
+    def test_bypassed_after_write(self):
+        # Lecture de ses propres écritures : une session qui a écrit ne lit ni ne remplit le cache
+        self.amenity_names()
+        with unit_of_work():
+            facade.amenity_repo.add_rows([{'name': "Pool"}])
+            self.assertEqual(len(get_query_cache()), 0)
+            amenities, _ = facade.get_amenities_page_data()
+            self.assertEqual(sorted(amenity['name'] for amenity in amenities), ["Pool", "Wi-Fi"])
+            self.assertEqual(len(get_query_cache()), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
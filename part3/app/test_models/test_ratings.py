@@ -0,0 +1,94 @@
+from app import create_app
+from app.extensions import db
+from app.models.place import Place
+from app.services import facade
+from sqlalchemy import update
+import unittest
+
+
+class TestRatingAggregates(unittest.TestCase):
+    """review_count, rating_sum et rating_avg des lieux suivent les écritures d'avis"""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.context = self.app.app_context()
+        self.context.push()
+        owner = self.create_user("owner")
+        self.guest_ids = [self.create_user(f"guest{i}").id for i in range(3)]
+        self.place_ids = [facade.create_place({'title': f"Place {i}", 'price': 10, 'latitude': 48.86,
+                                               'longitude': 2.34, 'owner_id': owner.id}).id for i in range(2)]
+
+    def tearDown(self):
+        db.session.remove()
+        self.context.pop()
+
+    def create_user(self, name):
+        return facade.create_user({'first_name': "Alice", 'last_name': "Smith",
+                                   'email': f"{name}@example.com", 'password': "secret"})
+
+    def review(self, guest, place, rating):
+        return facade.create_review({'text': "Nice", 'rating': rating, 'place_id': self.place_ids[place],
+                                     'user_id': self.guest_ids[guest]}).id
+
+    def ratings(self, place):
+        """(review_count, rating_sum, rating_avg) relus en base"""
+        db.session.expire_all()
+        place = facade.get_place(self.place_ids[place])
+        return place.review_count, place.rating_sum, place.rating_avg
+
+    def test_create(self):
+        self.assertEqual(self.ratings(0), (0, 0.0, 0.0))
+        self.review(0, 0, 5)
+        self.review(1, 0, 2)
+        self.assertEqual(self.ratings(0), (2, 7.0, 3.5))
+        self.assertEqual(self.ratings(1), (0, 0.0, 0.0))
+
+    def test_rating_change(self):
+        review_id = self.review(0, 0, 5)
+        self.review(1, 0, 3)
+        facade.update_review(review_id, {'rating': 1})
+        self.assertEqual(self.ratings(0), (2, 4.0, 2.0))
+        # Texte modifié seul : agrégats inchangés
+        facade.update_review(review_id, {'text': "Changed my mind"})
+        self.assertEqual(self.ratings(0), (2, 4.0, 2.0))
+
+    def test_move_to_another_place(self):
+        review_id = self.review(0, 0, 5)
+        self.review(1, 0, 3)
+        facade.update_review(review_id, {'place_id': self.place_ids[1], 'rating': 4})
+        self.assertEqual(self.ratings(0), (1, 3.0, 3.0))
+        self.assertEqual(self.ratings(1), (1, 4.0, 4.0))
+
+    def test_delete_review(self):
+        review_id = self.review(0, 0, 5)
+        self.review(1, 0, 3)
+        facade.delete_review(review_id)
+        self.assertEqual(self.ratings(0), (1, 3.0, 3.0))
+        facade.delete_review(self.review(2, 0, 4))
+        self.assertEqual(self.ratings(0), (1, 3.0, 3.0))
+
+    def test_delete_user(self):
+        # Les avis de l'utilisateur supprimés en cascade sont retirés de chaque lieu noté
+        self.review(0, 0, 5)
+        self.review(0, 1, 1)
+        self.review(1, 0, 3)
+        facade.delete_user(self.guest_ids[0])
+        self.assertEqual(self.ratings(0), (1, 3.0, 3.0))
+        self.assertEqual(self.ratings(1), (0, 0.0, 0.0))
+
+    def test_recompute_fixes_drift(self):
+        self.review(0, 0, 5)
+        self.review(1, 0, 2)
+        # Dérive simulée : agrégats écrits hors de la facade
+        db.session.execute(update(Place).where(Place.id == self.place_ids[0])
+                           .values(review_count=7, rating_sum=1.0, rating_avg=0.1))
+        db.session.execute(update(Place).where(Place.id == self.place_ids[1]).values(review_count=2))
+        db.session.commit()
+        self.assertEqual(facade.recompute_place_ratings(), 2)
+        self.assertEqual(self.ratings(0), (2, 7.0, 3.5))
+        self.assertEqual(self.ratings(1), (0, 0.0, 0.0))
+        self.assertEqual(facade.recompute_place_ratings(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.services import facade
+from config import TestingConfig
+from sqlalchemy import event
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+
+class TestReadReplicas(unittest.TestCase):
+    """Lectures des requêtes GET sur la réplique, écritures et lectures qui les suivent sur la primaire"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        directory = self.directory
+
+        class ReplicaConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(directory, 'primary.db')
+            SQLALCHEMY_BINDS = {'replica_1': 'sqlite:///' + os.path.join(directory, 'replica.db')}
+            READ_REPLICAS = ['replica_1']
+
+        self.app = create_app(ReplicaConfig)
+        self.client = self.app.test_client()
+        self.create_user("alice@example.com")
+        self.replicate()
+        with self.app.app_context():
+            self.engines = {'primary': db.engines[None], 'replica': db.engines['replica_1']}
+        self.statements = []
+        for name, engine in self.engines.items():
+            event.listen(engine, 'before_cursor_execute', self.recorder(name))
+
+    def tearDown(self):
+        for engine in self.engines.values():
+            engine.dispose()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def recorder(self, name):
+        def record(conn, cursor, statement, *args):
+            self.statements.append((name, statement.split()[0]))
+        return record
+
+    def create_user(self, email):
+        response = self.client.post('/api/v1/users/', json={
+            'first_name': "Alice", 'last_name': "Smith", 'email': email, 'password': "secret"})
+        self.assertEqual(response.status_code, 201)
+
+    def replicate(self):
+        """Copie la base primaire sur la réplique (réplication simulée)"""
+        primary = sqlite3.connect(os.path.join(self.directory, 'primary.db'))
+        replica = sqlite3.connect(os.path.join(self.directory, 'replica.db'))
+        primary.backup(replica)
+        replica.close()
+        primary.close()
+
+    def test_get_reads_replica(self):
+        response = self.client.get('/api/v1/users/')
+        self.assertEqual(len(response.get_json()['items']), 1)
+        self.assertEqual({name for name, _ in self.statements}, {'replica'})
+
+    def test_writes_go_to_primary(self):
+        self.create_user("bob@example.com")
+        self.assertIn(('primary', 'INSERT'), self.statements)
+        self.assertNotIn('replica', {name for name, _ in self.statements})
+        # La réplique n'a pas encore reçu l'écriture : le GET ne la voit pas
+        self.assertEqual(len(self.client.get('/api/v1/users/').get_json()['items']), 1)
+        self.replicate()
+        self.assertEqual(len(self.client.get('/api/v1/users/').get_json()['items']), 2)
+
+    def test_reads_after_write_stay_on_primary(self):
+        with self.app.test_request_context('/', method='GET'):
+            self.app.preprocess_request()
+            self.assertEqual(facade.user_repo.count(), 1)
+            self.assertEqual(self.statements, [('replica', 'SELECT')])
+            facade.user_repo.add(User(first_name="Bob", last_name="Martin", email="bob@example.com",
+                                      password="secret"))
+            del self.statements[:]
+            # Lecture de ses propres écritures : la primaire voit le nouvel utilisateur
+            self.assertEqual(facade.user_repo.count(), 2)
+            self.assertEqual({name for name, _ in self.statements}, {'primary'})
+            db.session.rollback()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,265 @@
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.services import facade
+from flask_jwt_extended import create_access_token
+from sqlalchemy import bindparam, event, inspect, select
+from unittest import mock
+import json
+import unittest
+import uuid
+
+
+class RepositoryTestCase(unittest.TestCase):
+    """Application de test avec un contexte ouvert pendant tout le test"""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.context = self.app.app_context()
+        self.context.push()
+        self.repo = facade.amenity_repo
+
+    def tearDown(self):
+        db.session.remove()
+        self.context.pop()
+
+    def statements(self, function, *args, **kwargs):
+        """Appelle function ; retourne (résultat, requêtes SQL émises)"""
+        statements = []
+        listener = lambda *listener_args, **listener_kwargs: statements.append(listener_args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        return result, statements
+
+
+class TestGetMany(RepositoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ids = [facade.create_amenity({'name': f"Amenity {i}"}).id for i in range(7)]
+        db.session.expunge_all()
+
+    def test_order_and_unknown_ids(self):
+        wanted = [self.ids[3], str(uuid.uuid4()), self.ids[0], self.ids[3], self.ids[6]]
+        amenities, statements = self.statements(self.repo.get_many, wanted)
+        self.assertEqual([amenity.id for amenity in amenities], [self.ids[3], self.ids[0], self.ids[6]])
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(self.repo.get_many([]), [])
+
+    def test_chunks(self):
+        # 7 ids par lots de 3 : trois requêtes IN, résultat dans l'ordre demandé
+        with mock.patch('app.persistence.repository.IN_CLAUSE_CHUNK_SIZE', 3):
+            amenities, statements = self.statements(self.repo.get_many, self.ids[::-1])
+        self.assertEqual([amenity.id for amenity in amenities], self.ids[::-1])
+        self.assertTrue(all(isinstance(amenity, Amenity) for amenity in amenities))
+        self.assertEqual(len(statements), 3)
+
+
+class TestBulkInsert(RepositoryTestCase):
+    def inserts(self, statements):
+        return [statement for statement in statements if statement.startswith('INSERT')]
+
+    def test_add_many(self):
+        amenities = [Amenity(name=f"Amenity {i}") for i in range(5)]
+        inserted, statements = self.statements(self.repo.add_many, amenities, chunk_size=2)
+        self.assertEqual(inserted, 5)
+        # Un INSERT executemany par lot de 2
+        self.assertEqual(len(self.inserts(statements)), 3)
+        # Objets restés transients, mais avec les valeurs par défaut générées
+        self.assertTrue(all(inspect(amenity).transient for amenity in amenities))
+        self.assertTrue(all(amenity.id and amenity.created_at for amenity in amenities))
+        self.assertEqual([amenity.name for amenity in self.repo.get_many([amenity.id for amenity in amenities])],
+                         [f"Amenity {i}" for i in range(5)])
+
+    def test_add_rows(self):
+        ids, statements = self.statements(self.repo.add_rows, [{'name': "Wi-Fi"}, {'name': "Pool"}])
+        self.assertEqual(len(self.inserts(statements)), 1)
+        amenities = self.repo.get_many(ids)
+        self.assertEqual([amenity.name for amenity in amenities], ["Wi-Fi", "Pool"])
+        self.assertIsNotNone(amenities[0].created_at)
+
+    def test_add_rows_validates_before_inserting(self):
+        with self.assertRaises(ValueError):
+            self.repo.add_rows([{'name': "Wi-Fi"}, {'name': ""}])
+        with self.assertRaises(TypeError):
+            self.repo.add_rows([{'name': 42}])
+        self.assertEqual(self.repo.count(), 0)
+
+    def test_values_validator(self):
+        validate = facade.place_repo.validate_values
+        values = validate({'title': "Louvre", 'price': 10, 'latitude': 48.86, 'longitude': 2.34})
+        # Les validateurs peuvent normaliser les valeurs (prix en float)
+        self.assertEqual(values['price'], 10.0)
+        self.assertEqual(values['geohash'], Place(title="Louvre", price=10, latitude=48.86, longitude=2.34).geohash)
+        # Les clés absentes ne sont pas validées
+        self.assertEqual(validate({'title': "Louvre"}), {'title': "Louvre"})
+        with self.assertRaises(ValueError):
+            validate({'price': -1})
+
+
+class TestWriteById(RepositoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.amenity = facade.create_amenity({'name': "Wi-Fi"})
+        self.amenity_id = self.amenity.id
+
+    def test_update_by_id(self):
+        updated_at = self.amenity.updated_at
+        updated, statements = self.statements(self.repo.update_by_id, self.amenity_id, {'name': "Fiber"})
+        self.assertEqual(updated, 1)
+        # Pas de SELECT : un seul UPDATE
+        self.assertEqual([statement.split()[0] for statement in statements], ['UPDATE'])
+        # L'objet déjà présent dans la session est synchronisé
+        self.assertEqual(self.amenity.name, "Fiber")
+        db.session.expunge_all()
+        amenity = self.repo.get(self.amenity_id)
+        self.assertEqual(amenity.name, "Fiber")
+        self.assertGreaterEqual(amenity.updated_at, updated_at)
+
+    def test_update_by_id_ignored_keys(self):
+        created_at = self.amenity.created_at
+        # Colonnes protégées et clés inconnues ignorées : rien à mettre à jour
+        self.assertEqual(self.repo.update_by_id(self.amenity_id, {'id': "x", 'created_at': None, 'foo': 1}), 0)
+        self.assertEqual(self.repo.update_by_id(str(uuid.uuid4()), {'name': "Fiber"}), 0)
+        db.session.expunge_all()
+        self.assertEqual(self.repo.get(self.amenity_id).created_at, created_at)
+
+    def test_update_by_id_validates(self):
+        with self.assertRaises(ValueError):
+            self.repo.update_by_id(self.amenity_id, {'name': ""})
+        db.session.expunge_all()
+        self.assertEqual(self.repo.get(self.amenity_id).name, "Wi-Fi")
+
+    def test_delete_by_id(self):
+        deleted, statements = self.statements(self.repo.delete_by_id, self.amenity_id)
+        self.assertEqual(deleted, 1)
+        # Pas de SELECT : la ligne d'association puis l'amenity (AmenityRepository.delete_by_id)
+        self.assertEqual([statement.split()[0] for statement in statements], ['DELETE', 'DELETE'])
+        self.assertEqual(self.repo.delete_by_id(self.amenity_id), 0)
+        db.session.expunge_all()
+        self.assertIsNone(self.repo.get(self.amenity_id))
+
+
+class TestIterAll(RepositoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.repo.add_rows([{'name': f"Amenity {i}"} for i in range(5)])
+        db.session.expunge_all()
+
+    def test_batches_are_detached(self):
+        seen = []
+        for amenity in self.repo.iter_all(batch_size=2):
+            if len(seen) == 2:
+                # Premier objet du deuxième lot : le premier lot a quitté la session
+                self.assertTrue(all(obj not in db.session for obj in seen))
+                self.assertIn(amenity, db.session)
+            seen.append(amenity)
+        self.assertEqual(sorted(amenity.name for amenity in seen), [f"Amenity {i}" for i in range(5)])
+        self.assertEqual(len(db.session.identity_map), 0)
+
+    def test_modified_objects_stay_in_session(self):
+        modified = []
+        for amenity in self.repo.iter_all(batch_size=2):
+            if amenity.name == "Amenity 1":
+                amenity.name = "Renamed"
+                modified.append(amenity)
+        self.assertIn(modified[0], db.session)
+        db.session.commit()
+        self.assertTrue(self.repo.exists(name="Renamed"))
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            facade.amenity_repo.add_rows([{'name': f"Amenity {i}"} for i in range(5)])
+            self.headers = {'Authorization': f"Bearer {create_access_token('admin', additional_claims={'is_admin': True})}"}
+            self.user_headers = {'Authorization': f"Bearer {create_access_token('user', additional_claims={'is_admin': False})}"}
+
+    def test_ndjson_export(self):
+        response = self.client.get('/api/v1/admin/export/amenities?batch_size=2', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        lines = response.get_data(as_text=True).splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(sorted(row['name'] for row in rows), [f"Amenity {i}" for i in range(5)])
+        self.assertEqual(set(rows[0]), {'id', 'name'})
+
+    def test_export_errors(self):
+        self.assertEqual(self.client.get('/api/v1/admin/export/amenities', headers=self.user_headers).status_code, 403)
+        self.assertEqual(self.client.get('/api/v1/admin/export/unknown', headers=self.headers).status_code, 404)
+        self.assertEqual(self.client.get('/api/v1/admin/export/amenities?batch_size=0',
+                                         headers=self.headers).status_code, 400)
+
+
+class TestExistsCount(RepositoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.repo.add_rows([{'name': name} for name in ("Wi-Fi", "Pool", "Parking")])
+
+    def test_exists(self):
+        found, statements = self.statements(self.repo.exists, name="Pool")
+        self.assertTrue(found)
+        self.assertFalse(self.repo.exists(name="Sauna"))
+        # Une seule requête, sans lire les colonnes du modèle
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(" ".join(statements[0].split()),
+                         "SELECT ? AS anon_1 FROM amenities WHERE amenities.name = ? LIMIT ? OFFSET ?")
+
+    def test_count(self):
+        self.assertEqual(self.repo.count(), 3)
+        total, statements = self.statements(self.repo.count, name="Pool")
+        self.assertEqual(total, 1)
+        self.assertEqual(self.repo.count(name="Sauna"), 0)
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(" ".join(statements[0].split()),
+                         "SELECT count(*) AS count_1 FROM amenities WHERE amenities.name = ?")
+
+    def test_statements_are_prepared(self):
+        # Une requête par combinaison de filtres, quel que soit l'ordre des arguments
+        self.repo.count(name="Pool", id="x")
+        self.repo.exists(name="Pool")
+        statement = self.repo._statements[('count', ('id', 'name'))]
+        self.repo.count(id="y", name="Wi-Fi")
+        self.assertIs(self.repo._statements[('count', ('id', 'name'))], statement)
+        self.assertIn(('exists', ('name',)), self.repo._statements)
+
+
+class TestPrepared(RepositoryTestCase):
+    def test_built_once_per_name(self):
+        builds = []
+
+        def build():
+            builds.append(1)
+            return select(Amenity).where(Amenity.name == bindparam('value'))
+        first = self.repo.prepared('by_name', build)
+        self.assertIs(self.repo.prepared('by_name', build), first)
+        self.assertIsNot(self.repo.prepared('other', build), first)
+        self.assertEqual(len(builds), 2)
+
+    def test_lookups_reuse_statements(self):
+        amenity_id = facade.create_amenity({'name': "Wi-Fi"}).id
+        db.session.expunge_all()
+        self.assertEqual(self.repo.get_by_attribute('name', "Wi-Fi").id, amenity_id)
+        statement = self.repo._statements[('lookup', 'name', None)]
+        db.session.expunge_all()
+        self.assertIsNone(self.repo.get_by_attribute('name', "Pool"))
+        self.assertIs(self.repo._statements[('lookup', 'name', None)], statement)
+        # Les valeurs passent en paramètres : même SQL, donc même entrée du cache de compilation
+        _, statements = self.statements(self.repo.get_by_attribute, 'name', "Parking")
+        _, others = self.statements(self.repo.get_by_attribute, 'name', "Sauna")
+        self.assertEqual(statements, others)
+
+    def test_profiles_are_distinct(self):
+        place_repo = facade.place_repo
+        self.assertIsNot(place_repo._lookup_statement('id', 'detail'), place_repo._lookup_statement('id'))
+        with self.assertRaises(ValueError):
+            place_repo._lookup_statement('id', 'unknown')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+from app import create_app
+from app.extensions import db
+from app.models.serializers import FIELD_SETS, serialize, serialize_all, serializer
+from app.services import facade
+import unittest
+
+
+class TestSerializers(unittest.TestCase):
+    """Les fonctions générées produisent exactement le dict de to_dict()"""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            owner = facade.create_user({'first_name': "Alice", 'last_name': "Smith",
+                                        'email': "alice@example.com", 'password': "secret"})
+            guest = facade.create_user({'first_name': "Bob", 'last_name': "Martin",
+                                        'email': "bob@example.com", 'password': "secret"})
+            amenity = facade.create_amenity({'name': "Wi-Fi"})
+            place = facade.create_place({'title': "Cozy Apartment", 'description': None, 'price': 100,
+                                         'latitude': 37.7749, 'longitude': -122.4194,
+                                         'owner_id': owner.id, 'amenities': [amenity.id]})
+            facade.create_place({'title': "Empty", 'price': 80, 'latitude': 1.0, 'longitude': 2.0,
+                                 'owner_id': owner.id})
+            facade.create_review({'text': "Great stay", 'rating': 5, 'place_id': place.id, 'user_id': guest.id})
+            db.session.commit()
+            self.place_id = place.id
+
+    def test_matches_to_dict(self):
+        with self.app.app_context():
+            for place in facade.place_repo.get_all(profile='detail'):
+                self.assertEqual(serialize(place), place.to_dict())
+                self.assertEqual(serialize(place, 'list'), place.to_dict(include_reviews=False))
+                self.assertEqual(serialize(place, 'summary'),
+                                 place.to_dict(include_reviews=False, include_amenities=False))
+                self.assertEqual(serialize_all(place.reviews), [review.to_dict() for review in place.reviews])
+            for user in facade.get_users():
+                self.assertEqual(serialize(user), user.to_dict())
+            for amenity in facade.get_all_amenities():
+                self.assertEqual(serialize(amenity), amenity.to_dict())
+
+    def test_expired_attributes_reload(self):
+        with self.app.app_context():
+            place = facade.get_place(self.place_id)
+            expected = place.to_dict()
+            db.session.expire(place)
+            self.assertEqual(serialize(place), expected)
+
+    def test_unknown_field_set(self):
+        model = next(iter(FIELD_SETS))
+        with self.assertRaises(ValueError):
+            serializer(model, 'missing')
+
+    def test_json_response(self):
+        response = self.client.get(f'/api/v1/places/{self.place_id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/json')
+        place = response.get_json()
+        self.assertEqual(place['rating_avg'], 5)
+        self.assertEqual(place['amenities'][0]['name'], "Wi-Fi")
+        self.assertTrue(response.data.endswith(b'\n'))
+        self.assertEqual(self.client.get('/swagger.json').status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
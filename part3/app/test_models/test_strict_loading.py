@@ -0,0 +1,96 @@
+from app import create_app
+from app.extensions import db
+from app.persistence.strict_loading import STRICT_LOADING_KEY
+from app.services import facade
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+import unittest
+
+
+class TestStrictLoading(unittest.TestCase):
+    """Les endpoints de lecture ne chargent aucune relation à la demande (STRICT_LOADING)"""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.owner_headers = self.register("owner@example.com")
+        self.guest_headers = self.register("guest@example.com")
+        self.amenity_ids = [self.client.post('/api/v1/amenities/', json={'name': name}).get_json()['id']
+                            for name in ("Wi-Fi", "Pool", "Parking")]
+        self.place_ids = []
+        for i in range(5):
+            response = self.client.post('/api/v1/places/', headers=self.owner_headers, json={
+                'title': f"Place {i}", 'price': 50 + i, 'latitude': 45.0, 'longitude': 3.0,
+                'amenities': self.amenity_ids})
+            self.place_ids.append(response.get_json()['id'])
+            response = self.client.post('/api/v1/reviews/', headers=self.guest_headers, json={
+                'text': "Great stay", 'rating': 4, 'place_id': self.place_ids[-1]})
+            self.assertEqual(response.status_code, 201)
+        self.review_id = response.get_json()['id']
+
+    def register(self, email):
+        self.client.post('/api/v1/users/', json={
+            'first_name': "Alice", 'last_name': "Smith", 'email': email, 'password': "secret"})
+        response = self.client.post('/api/v1/auth/login', json={'email': email, 'password': "secret"})
+        return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+    def get(self, url):
+        """GET url ; retourne (réponse, nombre de requêtes SQL émises)"""
+        statements = []
+        with self.app.app_context():
+            engine = db.engine
+        listener = lambda *args, **kwargs: statements.append(args[2])
+        event.listen(engine, 'before_cursor_execute', listener)
+        try:
+            response = self.client.get(url)
+        finally:
+            event.remove(engine, 'before_cursor_execute', listener)
+        self.assertEqual(response.status_code, 200, response.get_json())
+        return response, len(statements)
+
+    def test_read_endpoints(self):
+        place_id = self.place_ids[0]
+        for url in ('/api/v1/users/', '/api/v1/amenities/', '/api/v1/places/', f'/api/v1/places/{place_id}',
+                    f'/api/v1/places/{place_id}/reviews/', '/api/v1/reviews/', f'/api/v1/reviews/{self.review_id}'):
+            self.get(url)
+
+    def test_place_list_query_count(self):
+        response, queries = self.get('/api/v1/places/')
+        places = response.get_json()['items']
+        self.assertEqual(len(places), 5)
+        self.assertEqual(len(places[0]['amenities']), 3)
+        # Avis résumés par les agrégats du lieu, sans lire la table reviews
+        self.assertNotIn('reviews', places[0])
+        self.assertEqual((places[0]['review_count'], places[0]['rating_avg']), (1, 4))
+        # Lieux, puis amenities de toute la page : indépendant du nombre de lieux
+        self.assertEqual(queries, 2)
+
+    def test_duplicate_review(self):
+        response = self.client.post('/api/v1/reviews/', headers=self.guest_headers, json={
+            'text': "Again", 'rating': 5, 'place_id': self.place_ids[0]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json(), {'error': 'You have already reviewed this place'})
+
+    def test_lazy_load_raises(self):
+        with self.app.app_context():
+            db.session.info[STRICT_LOADING_KEY] = True
+            place = facade.get_place(self.place_ids[0])
+            with self.assertRaises(InvalidRequestError):
+                place.reviews
+            # Avis chargés par le profil : leurs propres relations restent interdites
+            review = facade.place_repo.get(self.place_ids[1], profile='detail').reviews[0]
+            self.assertEqual(review.user_id, facade.get_user_by_email("guest@example.com").id)
+            with self.assertRaises(InvalidRequestError):
+                review.place.owner
+
+    def test_list_profile_forbids_reviews(self):
+        # Même hors chargement strict : une liste de lieux ne doit jamais lire les avis un par un
+        with self.app.app_context():
+            places = facade.get_all_places()
+            self.assertEqual(len(places[0].amenities), 3)
+            with self.assertRaises(InvalidRequestError):
+                places[0].reviews
+
+
+if __name__ == "__main__":
+    unittest.main()
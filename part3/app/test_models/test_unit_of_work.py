@@ -0,0 +1,87 @@
+from app import create_app
+from app.extensions import db
+from app.persistence.repository import begin_unit_of_work, end_unit_of_work, in_unit_of_work, unit_of_work
+from app.services import facade
+from flask import jsonify
+from sqlalchemy import event
+import unittest
+
+
+class TestUnitOfWork(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.commits = 0
+
+        @self.app.route('/test/amenity/<name>/<int:status>', methods=['POST'])
+        def create_amenity(name, status):
+            facade.create_amenity({'name': name})
+            if status == 0:
+                raise RuntimeError("unhandled")
+            return jsonify({'name': name}), status
+
+    def count_commits(self, session):
+        self.commits += 1
+
+    def names(self):
+        with self.app.app_context():
+            names = sorted(amenity.name for amenity in facade.get_all_amenities())
+            db.session.remove()
+            return names
+
+    def test_nested_units_commit_once(self):
+        with self.app.app_context():
+            event.listen(db.session(), 'after_commit', self.count_commits)
+            begin_unit_of_work()
+            begin_unit_of_work()
+            facade.create_amenity({'name': "Wi-Fi"})
+            end_unit_of_work()
+            # Unité interne fermée : toujours dans l'externe, rien n'est committé
+            self.assertTrue(in_unit_of_work())
+            self.assertEqual(self.commits, 0)
+            facade.create_amenity({'name': "Pool"})
+            end_unit_of_work()
+            self.assertFalse(in_unit_of_work())
+            self.assertEqual(self.commits, 1)
+            db.session.remove()
+        self.assertEqual(self.names(), ["Pool", "Wi-Fi"])
+
+    def test_inner_failure_rolls_back_outer(self):
+        with self.app.app_context():
+            with self.assertRaises(ValueError):
+                with unit_of_work():
+                    facade.create_amenity({'name': "Wi-Fi"})
+                    with unit_of_work():
+                        facade.create_amenity({'name': "Pool"})
+                        raise ValueError("boom")
+            self.assertFalse(in_unit_of_work())
+            db.session.remove()
+        self.assertEqual(self.names(), [])
+
+    def test_failed_outer_after_successful_inner(self):
+        with self.app.app_context():
+            begin_unit_of_work()
+            with unit_of_work():
+                facade.create_amenity({'name': "Wi-Fi"})
+            end_unit_of_work(success=False)
+            db.session.remove()
+        self.assertEqual(self.names(), [])
+
+    def test_request_success_commits(self):
+        client = self.app.test_client()
+        self.assertEqual(client.post('/test/amenity/Wi-Fi/201').status_code, 201)
+        self.assertEqual(self.names(), ["Wi-Fi"])
+
+    def test_request_error_response_rolls_back(self):
+        client = self.app.test_client()
+        self.assertEqual(client.post('/test/amenity/Wi-Fi/400').status_code, 400)
+        self.assertEqual(self.names(), [])
+
+    def test_request_exception_rolls_back(self):
+        client = self.app.test_client()
+        with self.assertRaises(RuntimeError):
+            client.post('/test/amenity/Wi-Fi/0')
+        self.assertEqual(self.names(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
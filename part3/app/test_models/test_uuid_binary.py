@@ -0,0 +1,120 @@
+from app import create_app
+from app.extensions import db
+from app.models.geohash import encode
+from app.models.place import Place
+from app.models.types import UUIDBinary
+from app.services import facade
+from maintenance import migrate_uuids
+from sqlalchemy import Column, MetaData, String, Table, create_engine, insert, text
+import os
+import shutil
+import tempfile
+import unittest
+import uuid
+
+
+class TestUUIDBinary(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.context = self.app.app_context()
+        self.context.push()
+
+    def tearDown(self):
+        db.session.remove()
+        self.context.pop()
+
+    def test_bind_and_result(self):
+        column_type = UUIDBinary()
+        value = uuid.uuid4()
+        canonical = str(value)
+        for form in (canonical, canonical.upper(), value.hex, value, value.bytes):
+            self.assertEqual(column_type.process_bind_param(form, None), value.bytes, form)
+        self.assertEqual(column_type.process_result_value(value.bytes, None), canonical)
+        self.assertIsNone(column_type.process_bind_param(None, None))
+        self.assertIsNone(column_type.process_result_value(None, None))
+
+    def test_round_trip(self):
+        user = facade.create_user({'first_name': "Alice", 'last_name': "Smith",
+                                   'email': "alice@example.com", 'password': "secret"})
+        user_id = user.id
+        stored = db.session.execute(text("SELECT typeof(id), length(id) FROM users")).one()
+        self.assertEqual(tuple(stored), ('blob', 16))
+        db.session.expunge_all()
+        self.assertEqual(facade.get_user(user_id).id, user_id)
+        self.assertEqual(facade.get_user(user_id.upper()).id, user_id)
+        # Id mal formé : aucune ligne, pas d'erreur
+        self.assertIsNone(facade.get_user("nope"))
+
+
+class TestMigrateUuids(unittest.TestCase):
+    """migrate-uuids copie une base aux ids texte (36 caractères) au format binaire"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source_url = 'sqlite:///' + os.path.join(self.directory, 'legacy.db')
+        self.app = create_app("config.TestingConfig")
+        self.context = self.app.app_context()
+        self.context.push()
+        self.ids = {name: str(uuid.uuid4()) for name in ('owner', 'guest', 'place', 'amenity', 'review')}
+        self.create_legacy_database()
+
+    def tearDown(self):
+        db.session.remove()
+        self.context.pop()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def create_legacy_database(self):
+        """Mêmes tables que les modèles, ids en VARCHAR(36), sans les colonnes dérivées des lieux"""
+        legacy = MetaData()
+        for table in db.metadata.sorted_tables:
+            # Les anciennes bases n'ont ni les agrégats de note ni le geohash des lieux
+            derived = Place.DERIVED_COLUMNS if table.name == 'places' else ()
+            Table(table.name, legacy, *(Column(column.name, String(36) if isinstance(column.type, UUIDBinary)
+                                               else column.type, primary_key=column.primary_key)
+                                        for column in table.columns if column.name not in derived))
+        engine = create_engine(self.source_url)
+        legacy.create_all(engine)
+        ids = self.ids
+        now = text("CURRENT_TIMESTAMP")
+        with engine.begin() as conn:
+            for name in ('owner', 'guest'):
+                conn.execute(insert(legacy.tables['users']).values(
+                    id=ids[name], first_name="Alice", last_name="Smith", email=f"{name}@example.com",
+                    password="x", is_admin=False, created_at=now, updated_at=now))
+            conn.execute(insert(legacy.tables['amenities']).values(
+                id=ids['amenity'], name="Wi-Fi", created_at=now, updated_at=now))
+            conn.execute(insert(legacy.tables['places']).values(
+                id=ids['place'], title="Louvre", description=None, price=10.0, latitude=48.86, longitude=2.34,
+                owner_id=ids['owner'], created_at=now, updated_at=now))
+            conn.execute(insert(legacy.tables['place_amenity']).values(place_id=ids['place'],
+                                                                      amenity_id=ids['amenity']))
+            conn.execute(insert(legacy.tables['reviews']).values(
+                id=ids['review'], text="Great", rating=4, place_id=ids['place'], user_id=ids['guest'],
+                created_at=now, updated_at=now))
+            self.assertEqual(conn.execute(text("SELECT typeof(id), length(id) FROM places")).one(), ('text', 36))
+        engine.dispose()
+
+    def test_migrate(self):
+        copied, rated, geocoded = migrate_uuids(self.source_url, batch_size=1)
+        self.assertEqual(copied, {'users': 2, 'amenities': 1, 'places': 1, 'place_amenity': 1, 'reviews': 1})
+        self.assertEqual((rated, geocoded), (1, 1))
+        self.assertEqual(tuple(db.session.execute(text("SELECT typeof(id), length(id) FROM places")).one()),
+                         ('blob', 16))
+        place = facade.get_place(self.ids['place'])
+        self.assertEqual(place.owner_id, self.ids['owner'])
+        self.assertEqual([amenity.id for amenity in place.amenities], [self.ids['amenity']])
+        self.assertEqual([(review.id, review.user_id) for review in place.reviews],
+                         [(self.ids['review'], self.ids['guest'])])
+        # Colonnes dérivées recalculées : le lieu a sa note et apparaît dans la recherche de proximité
+        self.assertEqual((place.review_count, place.rating_sum, place.rating_avg), (1, 4.0, 4.0))
+        self.assertEqual(place.geohash, encode(48.86, 2.34))
+        self.assertEqual([found.id for found, _ in facade.get_places_nearby(48.86, 2.34, 1)], [self.ids['place']])
+
+    def test_target_not_empty(self):
+        facade.create_amenity({'name': "Pool"})
+        with self.assertRaises(ValueError):
+            migrate_uuids(self.source_url)
+
+
+if __name__ == "__main__":
+    unittest.main()
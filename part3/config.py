@@ -5,20 +5,90 @@ import os
 # (development, production, testing) et expose un dictionnaire `config`
 # permettant de sélectionner la configuration souhaitée.
 
+# Profil SQLite pour un serveur multi-workers : WAL (lecteurs et écrivain ne se bloquent plus),
+# synchronous=NORMAL (fsync au checkpoint plutôt qu'à chaque commit, sûr en mode WAL),
+# mmap de 256 Mo, cache de 64 Mo par connexion et attente de 5 s au lieu d'un `database is locked` immédiat.
+SQLITE_TUNED_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 268435456,
+    'cache_size': -65536,
+    'busy_timeout': 5000,
+    'temp_store': 'MEMORY',
+}
+
+# Options du pool de connexions SQLAlchemy pour les bases fichiers
+TUNED_ENGINE_OPTIONS = {
+    'pool_size': 10,
+    'max_overflow': 20,
+    'pool_timeout': 30,
+    'pool_pre_ping': True,
+    'pool_recycle': 3600,
+}
+
+# Répliques en lecture : URLs séparées par des virgules dans READ_REPLICA_URLS,
+# déclarées comme binds `replica_1`, `replica_2`... (voir app/persistence/routing.py)
+READ_REPLICA_BINDS = {f'replica_{i}': url.strip()
+                      for i, url in enumerate(os.getenv('READ_REPLICA_URLS', '').split(','), start=1)
+                      if url.strip()}
+
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', SECRET_KEY)
     DEBUG = False
+    # Pagination des endpoints de liste (taille par défaut et taille maximale d'une page)
+    PAGE_SIZE_DEFAULT = 50
+    PAGE_SIZE_MAX = 200
+    # Recherche de proximité (/places/nearby) : rayon par défaut et rayon maximal, en km
+    NEARBY_RADIUS_DEFAULT_KM = 5
+    NEARBY_RADIUS_MAX_KM = 100
+    # Un seul commit par requête HTTP (voir app/persistence/repository.py : unit_of_work)
+    UNIT_OF_WORK_PER_REQUEST = True
+    # Générateur des ids des nouveaux objets : 'uuid7' (croissants dans le temps) ou 'uuid4' (aléatoires)
+    ID_GENERATOR = 'uuid7'
+    # Cache d'identité de get() par modèle, désactivé par défaut. Propre à chaque processus : une écriture
+    # n'invalide que le cache du worker qui l'a faite, à n'activer qu'avec un seul worker.
+    # Exemple : {'Place': {'maxsize': 10000, 'ttl': 30}} (ttl en secondes)
+    IDENTITY_CACHE = {}
+    # Cache des résultats de lecture (détail d'un lieu, listes d'amenities, avis d'un lieu), désactivé par défaut.
+    # Invalidé par table à chaque écriture, mais seulement dans le processus qui a écrit : à n'activer
+    # qu'avec un seul worker (les autres serviraient des résultats périmés jusqu'au ttl).
+    # Exemple : {'maxsize': 10000, 'ttl': 60}
+    QUERY_CACHE = {}
+    # Interdit le chargement à la demande des relations pendant les requêtes GET / HEAD
+    # (voir app/persistence/strict_loading.py) ; activé pour les tests
+    STRICT_LOADING = False
+    # PRAGMA appliqués à chaque connexion SQLite (voir app/persistence/engine.py)
+    SQLITE_PRAGMAS = {}
+    # Bases secondaires ; les clés listées dans READ_REPLICAS servent les lectures des requêtes GET
+    SQLALCHEMY_BINDS = {}
+    READ_REPLICAS = []
+    # Choix de la réplique : 'round_robin' ou 'least_latency'
+    REPLICA_SELECTION = 'round_robin'
+    # Base du code asynchrone (AsyncSession) : par défaut SQLALCHEMY_DATABASE_URI avec un pilote async.
+    # Sans option, aiosqlite ouvre une connexion par session (NullPool) : une connexion en pool
+    # resterait liée à la boucle d'événements qui l'a ouverte, or Flask en crée une par vue async.
+    ASYNC_DATABASE_URI = None
+    ASYNC_ENGINE_OPTIONS = {}
 
 class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///development.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = TUNED_ENGINE_OPTIONS
+    SQLITE_PRAGMAS = SQLITE_TUNED_PRAGMAS
+    SQLALCHEMY_BINDS = READ_REPLICA_BINDS
+    READ_REPLICAS = list(READ_REPLICA_BINDS)
 
 class ProductionConfig(Config):
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///production.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = TUNED_ENGINE_OPTIONS
+    SQLITE_PRAGMAS = SQLITE_TUNED_PRAGMAS
+    SQLALCHEMY_BINDS = READ_REPLICA_BINDS
+    READ_REPLICAS = list(READ_REPLICA_BINDS)
+    REPLICA_SELECTION = os.getenv('REPLICA_SELECTION', 'least_latency')
     SECRET_KEY = os.getenv('SECRET_KEY')
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
 
@@ -27,6 +97,7 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    STRICT_LOADING = True
 
 config = {
     'development': DevelopmentConfig,
@@ -0,0 +1,130 @@
+"""
+Commandes de maintenance de la base de données, hors du serveur.
+
+    python3 maintenance.py [--config config.ProductionConfig] COMMANDE
+
+upgrade-schema : ajoute aux tables existantes les colonnes et index déclarés
+par les modèles qui leur manquent (db.create_all ne crée que les tables
+absentes). Les nouvelles colonnes reçoivent leur valeur par défaut.
+
+recompute-ratings : recalcule review_count, rating_sum et rating_avg de
+chaque lieu depuis la table reviews et corrige ceux qui ont dérivé (à lancer
+après upgrade-schema, ou après des écritures faites hors de la facade).
+
+backfill-geohash : calcule le geohash (recherche de proximité) des lieux qui
+n'en ont pas, créés avant la colonne (à lancer après upgrade-schema).
+
+migrate-uuids : copie une base créée avant le passage des ids en binaire
+(colonnes VARCHAR(36)) dans la base de l'application, créée au nouveau format
+(UUIDBinary, 16 octets), puis calcule les colonnes dérivées absentes de la
+source (agrégats de note et geohash, comme recompute-ratings et
+backfill-geohash). La base source n'est pas modifiée. Exemple en
+développement :
+
+    mv instance/development.db instance/development_v1.db
+    python3 maintenance.py migrate-uuids sqlite:///instance/development_v1.db
+"""
+import argparse
+import sys
+
+from sqlalchemy import MetaData, create_engine, func, insert, inspect, select, text
+from sqlalchemy.schema import CreateColumn
+
+from app import create_app, db
+from app.services import facade
+
+# Nombre de lignes lues puis insérées à la fois
+MIGRATION_BATCH_SIZE = 5_000
+
+
+def migrate_uuids(source_url, batch_size=MIGRATION_BATCH_SIZE):
+    """Copie toutes les tables de source_url dans la base courante ; les ids texte y sont
+    convertis en 16 octets par UUIDBinary. Les colonnes dérivées des lieux, copiées telles
+    quelles ou laissées à leur valeur par défaut, sont ensuite recalculées (agrégats de note,
+    geohash). Retourne ({table: nombre de lignes copiées}, nombre de lieux aux agrégats
+    corrigés, nombre de lieux géocodés)."""
+    source = create_engine(source_url)
+    legacy = MetaData()
+    legacy.reflect(source)
+    copied = {}
+    try:
+        with source.connect() as src, db.engine.begin() as dst:
+            for table in db.metadata.sorted_tables:
+                if dst.execute(select(func.count()).select_from(table)).scalar_one():
+                    raise ValueError(f"Target table {table.name} is not empty")
+            # Tables parentes d'abord, pour respecter les clés étrangères
+            for table in db.metadata.sorted_tables:
+                if table.name not in legacy.tables:
+                    continue
+                old = legacy.tables[table.name]
+                names = [column.name for column in table.columns if column.name in old.columns]
+                result = src.execution_options(yield_per=batch_size).execute(
+                    select(*(old.columns[name] for name in names)))
+                copied[table.name] = 0
+                for rows in result.partitions():
+                    dst.execute(insert(table), [dict(zip(names, row)) for row in rows])
+                    copied[table.name] += len(rows)
+    finally:
+        source.dispose()
+    # Les INSERT Core ne passent ni par la facade ni par les validateurs du modèle
+    return copied, facade.recompute_place_ratings(), facade.backfill_place_geohashes()
+
+
+def upgrade_schema():
+    """Ajoute les colonnes et index manquants des tables existantes ; retourne la liste des ajouts"""
+    added = []
+    with db.engine.begin() as conn:
+        inspector = inspect(conn)
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    ddl = CreateColumn(column).compile(dialect=conn.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {ddl}'))
+                    added.append(f'{table.name}.{column.name}')
+            indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(conn)
+                    added.append(index.name)
+    return added
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Commandes de maintenance de la base HBnB")
+    parser.add_argument('--config', default='config.DevelopmentConfig',
+                        help="classe de configuration de l'application (base cible)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    migrate = commands.add_parser('migrate-uuids', help="copie une base aux ids VARCHAR(36) au format binaire")
+    migrate.add_argument('source_url', help="URL SQLAlchemy de l'ancienne base")
+    migrate.add_argument('--batch-size', type=int, default=MIGRATION_BATCH_SIZE)
+    commands.add_parser('upgrade-schema', help="ajoute les colonnes et index manquants aux tables existantes")
+    commands.add_parser('recompute-ratings', help="recalcule les agrégats de note des lieux depuis les avis")
+    commands.add_parser('backfill-geohash', help="calcule le geohash des lieux qui n'en ont pas")
+    args = parser.parse_args(argv)
+
+    app = create_app(args.config)
+    with app.app_context():
+        if args.command == 'migrate-uuids':
+            try:
+                copied, rated, geocoded = migrate_uuids(args.source_url, args.batch_size)
+            except ValueError as e:
+                print(f"❌ {e}")
+                return 1
+            for name, count in copied.items():
+                print(f"✅ {name} : {count} lignes copiées")
+            print(f"✅ {rated} lieu(x) aux agrégats de note recalculés, {geocoded} lieu(x) géocodé(s)")
+        elif args.command == 'upgrade-schema':
+            added = upgrade_schema()
+            print(f"✅ Ajouts : {', '.join(added)}" if added else "✅ Schéma déjà à jour")
+        elif args.command == 'recompute-ratings':
+            print(f"✅ {facade.recompute_place_ratings()} lieu(x) corrigé(s)")
+        elif args.command == 'backfill-geohash':
+            print(f"✅ {facade.backfill_place_geohashes()} lieu(x) géocodé(s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())